@@ -0,0 +1,185 @@
+import tempfile
+from argparse import ArgumentParser, Namespace
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP
+from kspl.git_revision import GitRevisionReader, load_model_at_revision
+from kspl.kconfig import ConfigElementType, KConfig, SymbolChange
+from kspl.variant_workers import load_variant_data, map_variants
+
+#: values of the compared symbols, by symbol name
+SymbolValues = dict[str, tuple[ConfigElementType, Any]]
+
+
+@dataclass
+class AffectedVariant:
+    name: str
+    #: why the variant has to be rebuilt
+    reasons: list[str] = field(default_factory=list)
+    #: symbols whose value changed because of the changed model files
+    changes: list[SymbolChange] = field(default_factory=list)
+
+
+@dataclass
+class AffectedReport:
+    #: the affected variants, in the variants order
+    variants: list[AffectedVariant]
+    #: changed files which are neither part of the model nor a variant configuration
+    ignored_files: list[Path] = field(default_factory=list)
+    #: symbols defined in the changed model files, at the base revision or now
+    model_symbols: list[str] = field(default_factory=list)
+
+
+def symbol_values(job: tuple[Path, Optional[frozenset[str]]]) -> SymbolValues:
+    """Effective values of the given symbols (all if None) in the variant, in a worker of map_variants()."""
+    config_file, names = job
+    return {
+        element.name: (element.type, element.value)
+        for element in load_variant_data(config_file).elements
+        if element.type != ConfigElementType.MENU and (names is None or element.name in names)
+    }
+
+
+def compare_values(old_values: SymbolValues, new_values: SymbolValues) -> list[SymbolChange]:
+    changes = []
+    for name in sorted(old_values.keys() | new_values.keys()):
+        old = old_values.get(name)
+        new = new_values.get(name)
+        if old != new:
+            # A symbol without value (None) is in only one of them
+            changes.append(SymbolChange(name, (new or old_values[name])[0], old[1] if old else None, new[1] if new else None))
+    return changes
+
+
+def find_affected_variants(
+    project_dir: Path,
+    changed_files: list[Path],
+    base_revision: str = "HEAD",
+    jobs: Optional[int] = None,
+    ignore_patterns: Sequence[str] = (),
+    max_depth: Optional[int] = None,
+) -> AffectedReport:
+    """
+    Finds the variants whose generated outputs can change because of the changed files.
+
+    A changed variant configuration file affects only its variant. For changed model files, the model at the
+    base revision is read from git and both models are evaluated for all other variants. Only the symbols
+    defined in the changed files (see KConfig.defining_file_index), the symbols depending on them and the
+    string symbols (they might reference any symbol) are compared.
+    """
+    project_dir = project_dir.absolute()
+    kconfig_model_file = project_dir / "KConfig"
+    if not kconfig_model_file.is_file():
+        raise UserNotificationException(f"File {kconfig_model_file} does not exist.")
+    config_files = SPLKConfigData.find_variants(project_dir, ignore_patterns, max_depth)
+    variants = {name: AffectedVariant(name) for name in config_files}
+    variant_names_by_file = {config_file.resolve(): name for name, config_file in config_files.items()}
+    model = KConfig(kconfig_model_file)
+    model_files = {file.resolve() for file in model.get_parsed_files()}
+    report = AffectedReport([])
+    changed_model_files = []
+    for changed_file in changed_files:
+        file = changed_file.resolve()
+        if file in variant_names_by_file:
+            variants[variant_names_by_file[file]].reasons.append(f"configuration file {changed_file} changed")
+        elif file in model_files:
+            changed_model_files.append(file)
+        else:
+            report.ignored_files.append(changed_file)
+    if changed_model_files:
+        remaining = [name for name, variant in variants.items() if not variant.reasons]
+        _compare_models(model, kconfig_model_file, changed_model_files, base_revision, {name: config_files[name] for name in remaining}, variants, report, jobs)
+    report.variants = [variant for variant in variants.values() if variant.reasons]
+    return report
+
+
+def _compare_models(
+    model: KConfig,
+    kconfig_model_file: Path,
+    changed_model_files: list[Path],
+    base_revision: str,
+    config_files: dict[str, Path],
+    variants: dict[str, AffectedVariant],
+    report: AffectedReport,
+    jobs: Optional[int],
+) -> None:
+    with GitRevisionReader(kconfig_model_file.parent, base_revision) as reader, tempfile.TemporaryDirectory() as base_dir:
+        base_root = Path(base_dir)
+        try:
+            base_model = load_model_at_revision(reader, kconfig_model_file, model.get_parsed_files(), base_root)
+        except Exception as e:
+            # E.g. the model did not exist or sourced files which do not exist anymore
+            for name in config_files:
+                variants[name].reasons.append(f"model at {base_revision} could not be evaluated ({e})")
+            return
+        symbols = set()
+        for file in changed_model_files:
+            symbols |= model.defining_file_index.defined_in(file) | base_model.defining_file_index.defined_in(base_root / file.relative_to(reader.toplevel))
+        report.model_symbols = sorted(symbols)
+        compared = {name for symbol in symbols for name in [*model.dependency_index.affected(symbol), *base_model.dependency_index.affected(symbol)]}
+        compared |= {element.name for element in [*model.elements, *base_model.elements] if element.type == ConfigElementType.STRING}
+        value_jobs = [(config_file, frozenset(compared)) for config_file in config_files.values()]
+        new_values = map_variants(kconfig_model_file, symbol_values, value_jobs, jobs)
+        base_values = map_variants(base_root / kconfig_model_file.resolve().relative_to(reader.toplevel), symbol_values, value_jobs, jobs)
+    for name, old, new in zip(config_files, base_values, new_values):
+        changes = compare_values(old, new)
+        if changes:
+            variants[name].reasons.append(f"{len(changes)} symbols changed since {base_revision}")
+            variants[name].changes = changes
+
+
+@dataclass
+class AffectedCommandConfig(DataClassDictMixin):
+    changed: list[str] = field(metadata={"help": "Changed files, e.g. the output of 'git diff --name-only'. Relative paths are relative to the current directory."})
+    project_dir: Path = field(
+        default=Path(".").absolute(),
+        metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
+    )
+    base_rev: str = field(default="HEAD", metadata={"help": "Git revision to compare the changed model files with. Default: HEAD"})
+    jobs: Optional[int] = field(default=None, metadata={"help": "Number of parallel worker processes. Default: number of CPUs."})
+    output_file: Optional[Path] = field(default=None, metadata={"help": "File to write the affected variant names to, one per line."})
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "AffectedCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class AffectedCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("affected", "Find the variants affected by changed model or configuration files.")
+        self.logger = logger.bind()
+
+    @time_it("Affected")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = AffectedCommandConfig.from_namespace(args)
+        report = find_affected_variants(
+            cmd_config.project_dir, [Path(file) for file in cmd_config.changed], cmd_config.base_rev, cmd_config.jobs, cmd_config.ignore_patterns, cmd_config.max_depth
+        )
+        for file in report.ignored_files:
+            self.logger.info(f"{file} is neither part of the model nor a variant configuration")
+        for variant in report.variants:
+            self.logger.info(f"{variant.name}: {', '.join(variant.reasons)}")
+            for change in variant.changes:
+                self.logger.info(f"  {change}")
+        # Only the names, such that the output can be used in the pipeline
+        for variant in report.variants:
+            print(variant.name)
+        if cmd_config.output_file:
+            cmd_config.output_file.parent.mkdir(parents=True, exist_ok=True)
+            cmd_config.output_file.write_text("".join(f"{variant.name}\n" for variant in report.variants))
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, AffectedCommandConfig)
@@ -0,0 +1,128 @@
+import os
+from argparse import ArgumentParser, Namespace
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import kconfiglib
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP
+from kspl.variant_workers import init_worker, load_variant, map_variants, model_warnings, worker_config
+
+
+@dataclass
+class VariantCheckResult:
+    variant: str
+    #: kconfiglib warnings, e.g. undefined symbols or values assigned more than once
+    warnings: list[str] = field(default_factory=list)
+    #: symbols whose value differs from the value assigned in the configuration file
+    ignored_assignments: list[str] = field(default_factory=list)
+
+    @property
+    def problems(self) -> list[str]:
+        return self.ignored_assignments + self.warnings
+
+
+@dataclass
+class CheckJob:
+    variant: str
+    config_file: Path
+    #: the file paths in the warnings are made relative to this directory
+    project_dir: Path
+
+
+def _assigned_value(sym: kconfiglib.Symbol) -> str:
+    if sym.orig_type in (kconfiglib.BOOL, kconfiglib.TRISTATE):
+        return kconfiglib.TRI_TO_STR[sym.user_value]
+    return str(sym.user_value)
+
+
+def _ignore_reason(sym: kconfiglib.Symbol) -> str:
+    if sym.visibility == 0:
+        return "unmet dependencies"
+    if sym.orig_type in (kconfiglib.BOOL, kconfiglib.TRISTATE) and sym.tri_value > sym.user_value:
+        return "selected by another symbol"
+    if sym.orig_type in (kconfiglib.INT, kconfiglib.HEX) and sym.ranges:
+        return "outside the active range"
+    return "overridden"
+
+
+def check_variant(job: CheckJob) -> VariantCheckResult:
+    """Loads one variant and collects its problems, in a worker of map_variants()."""
+    # Report the assignments of symbols which do not exist in the model
+    worker_config().warn_assign_undef = True
+    config = load_variant(job.config_file)
+    result = VariantCheckResult(job.variant)
+    for sym in config.unique_defined_syms:
+        # Evaluating the value also collects the warnings about values outside of the range
+        value = sym.str_value
+        if sym.user_value is not None and not sym.choice and _assigned_value(sym) != value:
+            result.ignored_assignments.append(f"{sym.name} is assigned '{_assigned_value(sym)}' but has the value '{value}' ({_ignore_reason(sym)})")
+    result.warnings = [warning.replace(f"{job.project_dir}{os.sep}", "") for warning in config.warnings]
+    return result
+
+
+def check_variants(
+    project_dir: Path, jobs: Optional[int] = None, ignore_patterns: Sequence[str] = (), max_depth: Optional[int] = None
+) -> tuple[list[str], list[VariantCheckResult]]:
+    """
+    Evaluates all variants in parallel, every worker parses the model only once.
+
+    :return: the warnings of the model and the results of all variants
+    """
+    project_dir = project_dir.absolute()
+    kconfig_model_file = project_dir / "KConfig"
+    if not kconfig_model_file.is_file():
+        raise UserNotificationException(f"File {kconfig_model_file} does not exist.")
+    # The warnings of the model are the same for all variants, they are collected once in this process
+    init_worker(kconfig_model_file)
+    model_problems = [warning.replace(f"{project_dir}{os.sep}", "") for warning in model_warnings()]
+    check_jobs = [CheckJob(name, config_file, project_dir) for name, config_file in SPLKConfigData.find_variants(project_dir, ignore_patterns, max_depth).items()]
+    return model_problems, map_variants(kconfig_model_file, check_variant, check_jobs, jobs, model_loaded=True)
+
+
+@dataclass
+class CheckCommandConfig(DataClassDictMixin):
+    project_dir: Path = field(
+        default=Path(".").absolute(),
+        metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
+    )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+    jobs: Optional[int] = field(default=None, metadata={"help": "Number of parallel worker processes. Default: number of CPUs."})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "CheckCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class CheckCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("check", "Check that the configurations of all variants are consistent with the KConfig model.")
+        self.logger = logger.bind()
+
+    @time_it("Check")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = CheckCommandConfig.from_namespace(args)
+        model_problems, results = check_variants(cmd_config.project_dir, cmd_config.jobs, cmd_config.ignore_patterns, cmd_config.max_depth)
+        failed = [result for result in results if result.problems]
+        for problem in model_problems:
+            print(f"KConfig: {problem}")
+        for result in failed:
+            print(f"{result.variant}:")
+            for problem in result.problems:
+                print(f"  {problem}")
+        print(f"Checked {len(results)} variants, {len(failed)} with problems.")
+        if failed or model_problems:
+            raise UserNotificationException(f"Check failed for {len(failed)} of {len(results)} variants.")
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, CheckCommandConfig)
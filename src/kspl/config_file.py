@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import queue
+import re
+import shutil
+import tempfile
+import threading
+from collections.abc import Callable, Container
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from py_app_dev.core.logging import logger
+
+
+def update_config_content(content: str, assignments: dict[str, str], config_prefix: str = "CONFIG_") -> str:
+    """
+    Applies the assignments to the content of a user configuration file (config.txt).
+
+    Only the lines of the assigned symbols are replaced, all other lines (comments, order, line endings)
+    are kept as they are. Symbols which are not yet in the file are appended at the end.
+
+    :param assignments: complete configuration lines (e.g. ``CONFIG_FOO=y`` or ``# CONFIG_FOO is not set``) by symbol name
+    """
+    assignment_pattern = re.compile(rf"^(?:{re.escape(config_prefix)}([A-Za-z0-9_]+)=.*|# {re.escape(config_prefix)}([A-Za-z0-9_]+) is not set)\s*$")
+    lines = content.splitlines(keepends=True)
+    newline = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
+    pending = dict(assignments)
+    for index, line in enumerate(lines):
+        match = assignment_pattern.match(line.rstrip("\r\n"))
+        if not match:
+            continue
+        name = match.group(1) or match.group(2)
+        if name in assignments:
+            ending = line[len(line.rstrip("\r\n")) :]
+            # A symbol assigned several times keeps only its first line
+            lines[index] = f"{assignments[name]}{ending}" if pending.pop(name, None) is not None else ""
+    if pending:
+        if lines and not lines[-1].endswith(("\r", "\n")):
+            lines[-1] += newline
+        lines.extend(f"{line}{newline}" for line in pending.values())
+    return "".join(lines)
+
+
+def config_assignments_digest(content: str, config_prefix: str = "CONFIG_", ordered_names: Container[str] = ()) -> str:
+    """
+    Hash of the assignments in the content of a user configuration file (config.txt).
+
+    Comments, empty lines, the order of the assignments and assignments which are overwritten later in the file
+    do not change the hash, such that files with the same hash have the same effect when loaded by kconfiglib.
+    The lines are matched like kconfiglib does it, the values are not normalized.
+
+    :param ordered_names: symbols whose assignment order matters, e.g. the symbols of a choice (the last one assigned is selected)
+    """
+    set_pattern = re.compile(rf"{re.escape(config_prefix)}([^=]+)=(.*)")
+    unset_pattern = re.compile(rf"# {re.escape(config_prefix)}([^ ]+) is not set")
+    assignments: dict[str, Optional[str]] = {}
+    for line in content.splitlines():
+        line = line.rstrip()
+        set_match = set_pattern.match(line)
+        if set_match:
+            name, value = set_match.group(1), set_match.group(2)
+        else:
+            unset_match = unset_pattern.match(line)
+            if not unset_match:
+                continue
+            name, value = unset_match.group(1), None
+        # Keep the order of the last assignments
+        assignments.pop(name, None)
+        assignments[name] = value
+    ordered = [[name, value] for name, value in assignments.items() if name in ordered_names]
+    unordered = sorted([name, value] for name, value in assignments.items() if name not in ordered_names)
+    return hashlib.sha256(json.dumps([ordered, unordered]).encode("utf-8")).hexdigest()
+
+
+def write_config_content(config_file: Path, content: str) -> None:
+    """Replaces the content of the file atomically: it is written to a temporary file next to it, which then replaces the file."""
+    with tempfile.NamedTemporaryFile("w", dir=config_file.parent, prefix=f".{config_file.name}.", suffix=".tmp", newline="", delete=False) as file:
+        temp_file = Path(file.name)
+        try:
+            file.write(content)
+        except BaseException:
+            file.close()
+            temp_file.unlink()
+            raise
+    try:
+        if config_file.exists():
+            shutil.copymode(config_file, temp_file)
+        os.replace(temp_file, config_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+
+def update_config_file(config_file: Path, assignments: dict[str, str], config_prefix: str = "CONFIG_") -> bool:
+    """Applies the assignments to the file. The file is only written if its content changes. Returns True if written."""
+    with config_file.open(newline="") as file:
+        content = file.read()
+    new_content = update_config_content(content, assignments, config_prefix)
+    if new_content == content:
+        return False
+    write_config_content(config_file, new_content)
+    return True
+
+
+@dataclass
+class ConfigFileUpdate:
+    config_file: Path
+    assignments: dict[str, str]
+    config_prefix: str = "CONFIG_"
+    #: called in the writer thread once the assignments are in the file, not called if writing failed
+    on_saved: Optional[Callable[[], None]] = field(default=None, compare=False)
+
+
+class ConfigFileWriter:
+    """
+    Writes the configuration file updates in a background thread.
+
+    All updates queued while the thread is busy are merged per file,
+    such that every file is written at most once per batch.
+    Call flush() before the process exits or the files are read again.
+    """
+
+    def __init__(self) -> None:
+        self.logger = logger.bind()
+        self._queue: queue.Queue[ConfigFileUpdate] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, update: ConfigFileUpdate) -> None:
+        self._queue.put(update)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="kspl-config-writer", daemon=True)
+                self._thread.start()
+
+    def flush(self) -> None:
+        """Blocks until all submitted updates are written."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            updates = [self._queue.get()]
+            while True:
+                try:
+                    updates.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(updates)
+            finally:
+                for _ in updates:
+                    self._queue.task_done()
+
+    def _write(self, updates: list[ConfigFileUpdate]) -> None:
+        merged: dict[Path, list[ConfigFileUpdate]] = {}
+        for update in updates:
+            merged.setdefault(update.config_file, []).append(update)
+        for config_file, file_updates in merged.items():
+            # The later updates overwrite the values of the earlier ones
+            assignments = {name: line for update in file_updates for name, line in update.assignments.items()}
+            try:
+                if update_config_file(config_file, assignments, file_updates[0].config_prefix):
+                    self.logger.info(f"Saved {len(assignments)} value(s) to {config_file}")
+            except OSError as e:
+                self.logger.error(f"Failed to save {config_file}: {e}")
+                continue
+            for update in file_updates:
+                if update.on_saved:
+                    update.on_saved()
@@ -1,11 +1,17 @@
+import asyncio
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Protocol, runtime_checkable
+from typing import Any, Optional, Protocol, runtime_checkable
 
 from py_app_dev.core.exceptions import UserNotificationException
 from py_app_dev.core.logging import logger
 
-from kspl.kconfig import EditableConfigElement, KConfig
+from kspl.config_file import ConfigFileUpdate, config_assignments_digest
+from kspl.discovery import VariantConfigFinder
+from kspl.kconfig import EditableConfigElement, KConfig, to_config_line
 
 
 @dataclass
@@ -16,14 +22,154 @@ class VariantViewData:
     config_dict: dict[str, Any]
 
 
+def get_variant_name(variants_dir: Path, config_file: Path) -> str:
+    """The variant name is the path of the configuration file directory relative to the variants directory."""
+    return config_file.relative_to(variants_dir).parent.as_posix()
+
+
+def create_config_dict(config: KConfig) -> dict[str, Any]:
+    return {config_elem.name: config_elem.value for config_elem in config.elements if not config_elem.is_menu}
+
+
 @dataclass
 class VariantData:
     name: str
     config: KConfig
 
+    @property
+    def is_loaded(self) -> bool:
+        """False as long as the configuration of a lazy variant was not evaluated."""
+        return True
+
     def find_element(self, element_name: str) -> EditableConfigElement | None:
         return self.config.find_element(element_name)
 
+    def set_element_value(self, name: str, value: Any) -> dict[str, Any]:
+        """Assigns a new value to an element, see KConfig.set_element_value()."""
+        return self.config.set_element_value(name, value)
+
+    @property
+    def config_file(self) -> Path | None:
+        """User configuration file of the variant, None for the default configuration of the model."""
+        return self.config.k_config_file
+
+    def get_parsed_files(self) -> list[Path]:
+        """Model files and configuration file the values of the variant were read from."""
+        return self.config.get_parsed_files()
+
+    def create_config_file_update(self) -> ConfigFileUpdate | None:
+        """
+        Collects the edited elements of the variant. They are marked as saved once the update is written.
+
+        Returns None if there is nothing to save or the variant has no configuration file.
+        """
+        changed_elements = self.config.get_changed_elements()
+        if not changed_elements or self.config_file is None:
+            return None
+        assignments = {element.name: to_config_line(element, self.config.config_prefix) for element in changed_elements}
+        saved_values = [(element, element.value) for element in changed_elements]
+
+        def mark_saved() -> None:
+            # Values edited again in the meantime stay changed
+            for element, value in saved_values:
+                element.original_value = value
+
+        return ConfigFileUpdate(self.config_file, assignments, self.config.config_prefix, on_saved=mark_saved)
+
+
+class LazyVariantData(VariantData):
+    """
+    Variant which is evaluated only when its configuration is accessed for the first time.
+
+    Only the name and the configuration file are known up front.
+    """
+
+    def __init__(self, name: str, kconfig_model_file: Path, config_file: Path) -> None:
+        self.name = name
+        self.kconfig_model_file = kconfig_model_file
+        self._config_file = config_file
+        self._config: Optional[KConfig] = None
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> KConfig:
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = KConfig(self.kconfig_model_file, self._config_file)
+        return self._config
+
+    @config.setter
+    def config(self, config: KConfig) -> None:
+        self._config = config
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._config is not None
+
+    @property
+    def config_file(self) -> Path | None:
+        return self._config_file
+
+    def __repr__(self) -> str:
+        return f"LazyVariantData(name={self.name!r}, config_file={self._config_file!r}, loaded={self.is_loaded})"
+
+
+class SharedVariantData(VariantData):
+    """
+    Variant whose configuration file has the same assignments as the ones of other variants.
+
+    The variants share one evaluated configuration for reading. The first edit gives the variant
+    its own configuration, evaluated from its configuration file (copy-on-write).
+    """
+
+    def __init__(self, name: str, shared_config: KConfig, kconfig_model_file: Path, config_file: Path) -> None:
+        self.name = name
+        self.config = shared_config
+        self.kconfig_model_file = kconfig_model_file
+        self._config_file = config_file
+        self.is_shared = True
+
+    @property
+    def config_file(self) -> Path | None:
+        return self._config_file
+
+    def get_parsed_files(self) -> list[Path]:
+        # The shared configuration was read from the configuration file of another variant
+        model_files = [file for file in self.config.get_parsed_files() if file != self.config.k_config_file]
+        return [*model_files, self._config_file]
+
+    def set_element_value(self, name: str, value: Any) -> dict[str, Any]:
+        if self.is_shared:
+            self.config = KConfig(self.kconfig_model_file, self._config_file)
+            self.is_shared = False
+        return super().set_element_value(name, value)
+
+    def __repr__(self) -> str:
+        return f"SharedVariantData(name={self.name!r}, config_file={self._config_file!r}, shared={self.is_shared})"
+
+
+class LazyVariantViewData(VariantViewData):
+    """View data whose values are collected when they are accessed for the first time, which evaluates the variant."""
+
+    def __init__(self, variant: VariantData) -> None:
+        self.name = variant.name
+        self._variant = variant
+        self._config_dict: Optional[dict[str, Any]] = None
+
+    @property
+    def config_dict(self) -> dict[str, Any]:
+        if self._config_dict is None:
+            self._config_dict = create_config_dict(self._variant.config)
+        return self._config_dict
+
+    @config_dict.setter
+    def config_dict(self, config_dict: dict[str, Any]) -> None:
+        self._config_dict = config_dict
+
+    def __repr__(self) -> str:
+        return f"LazyVariantViewData(name={self.name!r}, loaded={self._config_dict is not None})"
+
 
 @runtime_checkable
 class KConfigData(Protocol):
@@ -44,43 +190,145 @@ class KConfigData(Protocol):
 
 
 class SPLKConfigData(KConfigData):
-    def __init__(self, project_root_dir: Path) -> None:
+    def __init__(self, project_root_dir: Path, ignore_patterns: Sequence[str] = (), max_depth: Optional[int] = None, lazy: bool = False) -> None:
+        """
+        Loads the model and all variant configurations.
+
+        Configuration files with the same assignments are evaluated only once (see SharedVariantData).
+
+        :param ignore_patterns: directories in the variants directory to skip, e.g. ``build`` (see VariantConfigFinder)
+        :param max_depth: number of directory levels below the variants directory to search for variants, None for no limit
+        :param lazy: only discover the variants, every variant is evaluated when it is needed for the first time (see LazyVariantData)
+        """
         self.project_root_dir = project_root_dir.absolute()
-        variant_config_files = self._search_variant_config_file(self.project_root_dir)
+        self.lazy = lazy
+        self.variant_finder = VariantConfigFinder(self.project_root_dir / "variants", ignore_patterns=ignore_patterns, max_depth=max_depth)
+        self._load_configs()
+        self.logger = logger.bind()
+
+    def _load_configs(self) -> None:
+        variant_config_files = self._search_variant_config_file()
+        if not self.kconfig_model_file.is_file():
+            raise UserNotificationException(f"File {self.kconfig_model_file} does not exist.")
+        model = KConfig(self.kconfig_model_file)
+        if self.lazy:
+            variant_configs: list[VariantData] = [LazyVariantData(self._get_variant_name(file), self.kconfig_model_file, file) for file in variant_config_files]
+        else:
+            groups = self._group_identical_configs(model, variant_config_files)
+            variant_configs = self._create_variant_configs(variant_config_files, groups, [KConfig(self.kconfig_model_file, files[0]) for files in groups])
+        self._set_configs(model, variant_configs)
+
+    @classmethod
+    async def aload(
+        cls,
+        project_root_dir: Path,
+        executor: Optional[Executor] = None,
+        ignore_patterns: Sequence[str] = (),
+        max_depth: Optional[int] = None,
+        lazy: bool = False,
+    ) -> "SPLKConfigData":
+        """
+        Asyncio counterpart of the constructor, the parsing does not block the event loop.
+
+        The model and the variants are parsed in the executor (the default executor of the loop if not given),
+        one after the other: kconfiglib resolves the sourced files relative to the process wide working
+        directory, so the parses can not overlap. Cancelling the task stops after the running parse.
+        In lazy mode only the model is parsed.
+        """
+        kconfig_data = cls.__new__(cls)
+        kconfig_data.project_root_dir = project_root_dir.absolute()
+        kconfig_data.lazy = lazy
+        kconfig_data.variant_finder = VariantConfigFinder(kconfig_data.project_root_dir / "variants", ignore_patterns=ignore_patterns, max_depth=max_depth)
+        kconfig_data.logger = logger.bind()
+        await kconfig_data._aload_configs(executor)
+        return kconfig_data
+
+    async def arefresh(self, executor: Optional[Executor] = None) -> None:
+        """
+        Asyncio counterpart of refresh_data().
+
+        The data is replaced only after all configurations are parsed, a cancelled refresh keeps the previous data.
+        """
+        await self._aload_configs(executor)
+        self.logger.info(f"Refreshed data: found {len(self.variant_configs)} variants")
+
+    async def _aload_configs(self, executor: Optional[Executor]) -> None:
+        loop = asyncio.get_running_loop()
+        variant_config_files = await loop.run_in_executor(executor, self._search_variant_config_file)
         if not self.kconfig_model_file.is_file():
             raise UserNotificationException(f"File {self.kconfig_model_file} does not exist.")
-        self.model = KConfig(self.kconfig_model_file)
-        if variant_config_files:
-            self.variant_configs: list[VariantData] = [VariantData(self._get_variant_name(file), KConfig(self.kconfig_model_file, file)) for file in variant_config_files]
+
+        async def load(config_file: Optional[Path]) -> KConfig:
+            return await loop.run_in_executor(executor, KConfig, self.kconfig_model_file, config_file)
+
+        if self.lazy:
+            model = await load(None)
+            variant_configs: list[VariantData] = [LazyVariantData(self._get_variant_name(file), self.kconfig_model_file, file) for file in variant_config_files]
+        else:
+            # The model is needed to find the identical configurations
+            model = await load(None)
+            groups = self._group_identical_configs(model, variant_config_files)
+            variant_kconfigs = [await load(files[0]) for files in groups]
+            variant_configs = self._create_variant_configs(variant_config_files, groups, variant_kconfigs)
+        self._set_configs(model, variant_configs)
+
+    @staticmethod
+    def _group_identical_configs(model: KConfig, config_files: list[Path]) -> list[list[Path]]:
+        """Groups the configuration files with the same assignments (ignoring comments and order), such that every group is evaluated once."""
+        choice_symbols = {sym.name for choice in model.config.unique_choices for sym in choice.syms}
+        groups: dict[str, list[Path]] = {}
+        for config_file in config_files:
+            with config_file.open(encoding="utf-8", errors="surrogateescape") as file:
+                content = file.read()
+            groups.setdefault(config_assignments_digest(content, model.config_prefix, choice_symbols), []).append(config_file)
+        return list(groups.values())
+
+    def _create_variant_configs(self, config_files: list[Path], groups: list[list[Path]], configs: list[KConfig]) -> list[VariantData]:
+        variants: dict[Path, VariantData] = {}
+        for files, config in zip(groups, configs):
+            if len(files) == 1:
+                variants[files[0]] = VariantData(self._get_variant_name(files[0]), config)
+            else:
+                variants.update((file, SharedVariantData(self._get_variant_name(file), config, self.kconfig_model_file, file)) for file in files)
+        return [variants[file] for file in config_files]
+
+    def _set_configs(self, model: KConfig, variant_configs: list[VariantData]) -> None:
+        self.model = model
+        if variant_configs:
+            self.variant_configs: list[VariantData] = variant_configs
         else:
             self.variant_configs = [VariantData("Default", self.model)]
-        self.logger = logger.bind()
 
     @property
     def kconfig_model_file(self) -> Path:
         return self.project_root_dir / "KConfig"
 
+    @staticmethod
+    def find_variants(project_root_dir: Path, ignore_patterns: Sequence[str] = (), max_depth: Optional[int] = None) -> dict[str, Path]:
+        """Returns the configuration files by variant name. Only the file system is searched, nothing is parsed."""
+        variants_dir = project_root_dir.absolute() / "variants"
+        return {get_variant_name(variants_dir, file): file for file in VariantConfigFinder(variants_dir, ignore_patterns=ignore_patterns, max_depth=max_depth).find()}
+
     def get_elements(self) -> list[EditableConfigElement]:
         return self.model.elements
 
     def get_variants(self) -> list[VariantViewData]:
-        variants = []
+        variants: list[VariantViewData] = []
 
         for variant in self.variant_configs:
-            variants.append(
-                VariantViewData(
-                    variant.name,
-                    {config_elem.name: config_elem.value for config_elem in variant.config.elements if not config_elem.is_menu},
-                )
-            )
+            if variant.is_loaded:
+                variants.append(VariantViewData(variant.name, create_config_dict(variant.config)))
+            else:
+                # Evaluated only when the values are displayed
+                variants.append(LazyVariantViewData(variant))
         return variants
 
     def _get_variant_name(self, file: Path) -> str:
-        return file.relative_to(self.project_root_dir / "variants").parent.as_posix()
+        return get_variant_name(self.project_root_dir / "variants", file)
 
-    def _search_variant_config_file(self, project_dir: Path) -> list[Path]:
-        """Finds all files called 'config.txt' in the variants directory and returns a list with their paths."""
-        return list((project_dir / "variants").glob("**/config.txt"))
+    def _search_variant_config_file(self) -> list[Path]:
+        """Finds all files called 'config.txt' in the variants directory and returns a list with their paths (sorted)."""
+        return self.variant_finder.find()
 
     def find_variant_config(self, variant_name: str) -> VariantData | None:
         for variant in self.variant_configs:
@@ -90,17 +338,7 @@ class SPLKConfigData(KConfigData):
 
     def refresh_data(self) -> None:
         """Refresh the KConfig data by reloading all configuration files."""
-        variant_config_files = self._search_variant_config_file(self.project_root_dir)
-        if not self.kconfig_model_file.is_file():
-            raise UserNotificationException(f"File {self.kconfig_model_file} does not exist.")
-
-        # Reload the model
-        self.model = KConfig(self.kconfig_model_file)
-
-        # Reload variant configurations
-        if variant_config_files:
-            self.variant_configs = [VariantData(self._get_variant_name(file), KConfig(self.kconfig_model_file, file)) for file in variant_config_files]
-        else:
-            self.variant_configs = [VariantData("Default", self.model)]
+        # Reload the model and the variant configurations
+        self._load_configs()
 
         self.logger.info(f"Refreshed data: found {len(self.variant_configs)} variants")
@@ -0,0 +1,90 @@
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP
+from kspl.stats import FeatureStatistics
+
+
+@dataclass
+class VariantCover:
+    #: chosen variants, in the order they were chosen (the first covers the most)
+    variants: list[str]
+    #: number of features which are enabled (and disabled, if requested) in at least one variant
+    required: int
+    #: number of features the chosen variants enable (or disable) which no variant chosen before did
+    gains: list[int] = field(default_factory=list)
+
+
+def find_variant_cover(statistics: FeatureStatistics, include_disabled: bool = False) -> VariantCover:
+    """
+    Chooses a small set of variants which together enable every feature enabled in any variant.
+
+    Greedy set cover over the variant_features bitsets: the variant covering the most uncovered features
+    is chosen until all are covered. The result is at most ln(n) + 1 times larger than the optimal one.
+
+    :param include_disabled: also cover every feature which is disabled in any variant
+    """
+    features_count = len(statistics.features())
+    all_features = (1 << features_count) - 1
+    covers = list(statistics.variant_features)
+    if include_disabled:
+        # The disabled features are the upper half of the bits
+        covers = [features | (~features & all_features) << features_count for features in covers]
+    uncovered = 0
+    for cover in covers:
+        uncovered |= cover
+    result = VariantCover([], uncovered.bit_count())
+    while uncovered:
+        # max() keeps the first of the best variants, the result is deterministic
+        index = max(range(len(covers)), key=lambda index: (covers[index] & uncovered).bit_count())
+        result.variants.append(statistics.variant_names[index])
+        result.gains.append((covers[index] & uncovered).bit_count())
+        uncovered &= ~covers[index]
+    return result
+
+
+@dataclass
+class CoverCommandConfig(DataClassDictMixin):
+    project_dir: Path = field(
+        default=Path(".").absolute(),
+        metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
+    )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+    output_file: Optional[Path] = field(default=None, metadata={"help": "File to write the chosen variant names to, one per line."})
+    include_disabled: bool = field(default=False, metadata={"help": "Also cover every feature which is disabled in any variant.", "action": "store_true"})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "CoverCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class CoverCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("cover", "Choose a small set of variants which together enable every feature enabled in any variant.")
+        self.logger = logger.bind()
+
+    @time_it("Cover")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = CoverCommandConfig.from_namespace(args)
+        statistics = FeatureStatistics.from_variants(SPLKConfigData(cmd_config.project_dir, cmd_config.ignore_patterns, cmd_config.max_depth).variant_configs)
+        cover = find_variant_cover(statistics, cmd_config.include_disabled)
+        self.logger.info(f"{len(cover.variants)} of {len(statistics.variant_names)} variants cover all {cover.required} features")
+        # Only the names, such that the output can be used in the pipeline
+        for variant in cover.variants:
+            print(variant)
+        if cmd_config.output_file:
+            cmd_config.output_file.parent.mkdir(parents=True, exist_ok=True)
+            cmd_config.output_file.write_text("".join(f"{variant}\n" for variant in cover.variants))
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, CoverCommandConfig)
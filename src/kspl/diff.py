@@ -0,0 +1,159 @@
+import tempfile
+from argparse import ArgumentParser, Namespace
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.affected import SymbolValues, compare_values, symbol_values
+from kspl.config_file import config_assignments_digest
+from kspl.config_slurper import SPLKConfigData, get_variant_name
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP, VariantConfigFinder
+from kspl.git_revision import GitRevisionReader, load_model_at_revision
+from kspl.kconfig import KConfig, SymbolChange
+from kspl.variant_workers import map_variants
+
+
+@dataclass
+class VariantDiff:
+    name: str
+    #: "changed", "added" (only in the working tree) or "removed" (only at the revision)
+    status: str
+    #: symbols with another value than at the revision, only for changed variants
+    changes: list[SymbolChange] = field(default_factory=list)
+
+
+@dataclass
+class DiffReport:
+    revision: str
+    #: the variants with differences, sorted by name
+    variants: list[VariantDiff] = field(default_factory=list)
+    #: whether any model file differs from the revision
+    model_changed: bool = False
+    #: number of variants which exist in the working tree and at the revision
+    compared: int = 0
+
+
+def _assignments_digest(content: bytes, model: KConfig) -> str:
+    choice_symbols = {sym.name for choice in model.config.unique_choices for sym in choice.syms}
+    return config_assignments_digest(content.decode("utf-8", errors="surrogateescape"), model.config_prefix, choice_symbols)
+
+
+#: variant configuration files to evaluate with their content, by side ("new" or "base") and variant name
+_ConfigFiles = dict[tuple[str, str], tuple[Path, bytes]]
+
+
+def _evaluate(model_file: Path, model: KConfig, config_files: _ConfigFiles, jobs: Optional[int]) -> dict[tuple[str, str], SymbolValues]:
+    """Values of all symbols per variant, the variants with the same assignments are evaluated once."""
+    groups: dict[str, list[tuple[str, str]]] = {}
+    for key, (_, content) in config_files.items():
+        groups.setdefault(_assignments_digest(content, model), []).append(key)
+    values = map_variants(model_file, symbol_values, [(config_files[keys[0]][0], None) for keys in groups.values()], jobs)
+    return {key: group_values for keys, group_values in zip(groups.values(), values) for key in keys}
+
+
+def diff_variants(project_dir: Path, revision: str = "HEAD", jobs: Optional[int] = None, ignore_patterns: Sequence[str] = (), max_depth: Optional[int] = None) -> DiffReport:
+    """
+    Compares the effective configurations of the variants with the ones at a git revision.
+
+    The model files and the variant configuration files of the revision are read from the git objects (one
+    ``git cat-file --batch`` process), without checking out the revision. If no model file changed, the
+    revision side reuses the current model, only the variants whose assignments changed are evaluated and
+    both sides are evaluated by the same workers. Configurations with the same assignments are evaluated once.
+    """
+    project_dir = project_dir.absolute()
+    kconfig_model_file = project_dir / "KConfig"
+    if not kconfig_model_file.is_file():
+        raise UserNotificationException(f"File {kconfig_model_file} does not exist.")
+    variants_dir = project_dir / "variants"
+    config_files = SPLKConfigData.find_variants(project_dir, ignore_patterns, max_depth)
+    # The files at the revision are filtered the same way
+    finder = VariantConfigFinder(variants_dir.resolve(), ignore_patterns=ignore_patterns, max_depth=max_depth)
+    model = KConfig(kconfig_model_file)
+    report = DiffReport(revision)
+    with GitRevisionReader(project_dir, revision) as reader, tempfile.TemporaryDirectory() as base_dir:
+        base_root = Path(base_dir)
+        base_config_files = {
+            get_variant_name(variants_dir.resolve(), file): file for file in reader.list_files(variants_dir) if file.name == finder.file_name and finder.is_included(file)
+        }
+        report.model_changed = any(reader.read(file) != file.read_bytes() for file in model.get_parsed_files())
+        for name in sorted(config_files.keys() - base_config_files.keys()):
+            report.variants.append(VariantDiff(name, "added"))
+        for name in sorted(base_config_files.keys() - config_files.keys()):
+            report.variants.append(VariantDiff(name, "removed"))
+        common = sorted(config_files.keys() & base_config_files.keys())
+        report.compared = len(common)
+        new_contents = {name: config_files[name].read_bytes() for name in common}
+        base_contents = {name: reader.read(base_config_files[name]) or b"" for name in common}
+        if report.model_changed:
+            base_model = load_model_at_revision(reader, kconfig_model_file, model.get_parsed_files(), base_root)
+            base_model_file = base_root / kconfig_model_file.resolve().relative_to(reader.toplevel)
+            evaluated = common
+        else:
+            # Same model: identical assignments give identical values
+            evaluated = [name for name in common if _assignments_digest(new_contents[name], model) != _assignments_digest(base_contents[name], model)]
+        new_files: _ConfigFiles = {("new", name): (config_files[name], new_contents[name]) for name in evaluated}
+        base_files: _ConfigFiles = {}
+        for name in evaluated:
+            base_file = base_root / base_config_files[name].relative_to(reader.toplevel)
+            base_file.parent.mkdir(parents=True, exist_ok=True)
+            base_file.write_bytes(base_contents[name])
+            base_files["base", name] = (base_file, base_contents[name])
+        if report.model_changed:
+            values = _evaluate(kconfig_model_file, model, new_files, jobs) | _evaluate(base_model_file, base_model, base_files, jobs)
+        else:
+            # Both sides in one run, the workers parse the model once
+            values = _evaluate(kconfig_model_file, model, new_files | base_files, jobs)
+    for name in evaluated:
+        changes = compare_values(values["base", name], values["new", name])
+        if changes:
+            report.variants.append(VariantDiff(name, "changed", changes))
+    report.variants.sort(key=lambda variant: variant.name)
+    return report
+
+
+@dataclass
+class DiffCommandConfig(DataClassDictMixin):
+    project_dir: Path = field(
+        default=Path(".").absolute(),
+        metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
+    )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+    rev: str = field(default="HEAD", metadata={"help": "Git revision to compare the variants with. Default: HEAD"})
+    jobs: Optional[int] = field(default=None, metadata={"help": "Number of parallel worker processes. Default: number of CPUs."})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "DiffCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class DiffCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("diff", "Show the symbols whose values changed per variant since a git revision.")
+        self.logger = logger.bind()
+
+    @time_it("Diff")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = DiffCommandConfig.from_namespace(args)
+        report = diff_variants(cmd_config.project_dir, cmd_config.rev, cmd_config.jobs, cmd_config.ignore_patterns, cmd_config.max_depth)
+        self.logger.info(f"Model {'changed' if report.model_changed else 'unchanged'} since {report.revision}")
+        for variant in report.variants:
+            if variant.status == "changed":
+                print(f"{variant.name}:")
+                for change in variant.changes:
+                    print(f"  {change}")
+            else:
+                print(f"{variant.name}: {variant.status}")
+        changed = sum(1 for variant in report.variants if variant.status == "changed")
+        print(f"{changed} of {report.compared} variants changed since {report.revision}")
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, DiffCommandConfig)
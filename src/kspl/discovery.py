@@ -0,0 +1,104 @@
+import fnmatch
+import os
+from argparse import ArgumentParser
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+#: command line help of the variant search options
+IGNORE_PATTERNS_HELP = "Patterns (fnmatch) for the names or relative paths of the directories below 'variants' to skip, e.g. 'build' or '.*'."
+MAX_DEPTH_HELP = "Number of directory levels below 'variants' to search for variants. Default: no limit."
+
+
+def add_variant_search_arguments(parser: ArgumentParser) -> None:
+    """Registers the variant search options for the commands which register their arguments manually."""
+    parser.add_argument("--ignore-patterns", nargs="+", default=[], help=IGNORE_PATTERNS_HELP)
+    parser.add_argument("--max-depth", type=int, default=None, help=MAX_DEPTH_HELP)
+
+
+@dataclass(frozen=True)
+class DirectoryListing:
+    #: modification time of the directory when it was listed
+    mtime_ns: int
+    subdirectories: tuple[str, ...]
+    contains_file: bool
+
+
+class VariantConfigFinder:
+    """
+    Finds the variant configuration files below a directory.
+
+    The directories are walked with ``os.scandir``. Ignored directories and directories deeper than ``max_depth``
+    are not entered at all. The listings are cached with the directory modification time, such that
+    a new search only lists again the directories where entries were added, removed or renamed.
+
+    :param ignore_patterns: fnmatch patterns for the names (or the relative paths) of the directories to skip, e.g. ``build`` or ``.*``
+    :param max_depth: number of directory levels to descend, None for no limit
+    """
+
+    def __init__(self, root_dir: Path, file_name: str = "config.txt", ignore_patterns: Sequence[str] = (), max_depth: Optional[int] = None) -> None:
+        self.root_dir = root_dir
+        self.file_name = file_name
+        self.ignore_patterns = list(ignore_patterns)
+        self.max_depth = max_depth
+        self._listings: dict[Path, DirectoryListing] = {}
+
+    def find(self) -> list[Path]:
+        """Returns the found files sorted by path."""
+        found: list[Path] = []
+        listings: dict[Path, DirectoryListing] = {}
+        self._walk(self.root_dir, 0, found, listings, set())
+        # Only keep the directories which still exist
+        self._listings = listings
+        return sorted(found)
+
+    def _walk(self, directory: Path, depth: int, found: list[Path], listings: dict[Path, DirectoryListing], visited: set[tuple[int, int]]) -> None:
+        try:
+            stat = os.stat(directory)
+        except OSError:
+            return
+        # Symbolic links might create cycles
+        if (stat.st_dev, stat.st_ino) in visited:
+            return
+        visited.add((stat.st_dev, stat.st_ino))
+        listing = self._list(directory, stat.st_mtime_ns)
+        if listing is None:
+            return
+        listings[directory] = listing
+        if listing.contains_file:
+            found.append(directory / self.file_name)
+        if self.max_depth is not None and depth >= self.max_depth:
+            return
+        for name in listing.subdirectories:
+            subdirectory = directory / name
+            if not self._is_ignored(subdirectory):
+                self._walk(subdirectory, depth + 1, found, listings, visited)
+
+    def _list(self, directory: Path, mtime_ns: int) -> Optional[DirectoryListing]:
+        cached = self._listings.get(directory)
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            return cached
+        subdirectories = []
+        contains_file = False
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        subdirectories.append(entry.name)
+                    elif entry.name == self.file_name and entry.is_file():
+                        contains_file = True
+        except OSError:
+            return None
+        return DirectoryListing(mtime_ns, tuple(subdirectories), contains_file)
+
+    def is_included(self, file: Path) -> bool:
+        """Whether the search would find the file, only its path is checked. Used for files which are not in the file system, e.g. at a git revision."""
+        directories = list(file.relative_to(self.root_dir).parents)[:-1]
+        if self.max_depth is not None and len(directories) > self.max_depth:
+            return False
+        return not any(self._is_ignored(self.root_dir / directory) for directory in directories)
+
+    def _is_ignored(self, directory: Path) -> bool:
+        relative_path = directory.relative_to(self.root_dir).as_posix()
+        return any(fnmatch.fnmatch(directory.name, pattern) or fnmatch.fnmatch(relative_path, pattern) for pattern in self.ignore_patterns)
@@ -5,9 +5,11 @@ from typing import Optional
 
 from mashumaro import DataClassDictMixin
 from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.exceptions import UserNotificationException
 from py_app_dev.core.logging import logger, time_it
 
-from .config_slurper import KConfigData, SPLKConfigData
+from .config_slurper import SPLKConfigData
+from .discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP
 from .kconfig import KConfig
 
 
@@ -17,8 +19,11 @@ class EditCommandConfig(DataClassDictMixin):
         default=Path(".").absolute(),
         metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
     )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
     kconfig_model_file: Optional[Path] = field(default=None, metadata={"help": "KConfig model file (KConfig)."})
     kconfig_config_file: Optional[Path] = field(default=None, metadata={"help": "KConfig user configuration file (config.txt)."})
+    variant: Optional[str] = field(default=None, metadata={"help": "Name of the variant to edit (e.g. Sleep/Plus). If not specified, the variant is selected interactively."})
     gui: bool = field(default=True, metadata={"help": "Use the guiconfig GUI editor; pass --no-gui to use the terminal menuconfig.", "action": BooleanOptionalAction})
 
     @classmethod
@@ -37,16 +42,22 @@ class EditCommand(Command):
         cmd_config = EditCommandConfig.from_namespace(args)
         gui = cmd_config.gui
         if cmd_config.kconfig_model_file is None:
-            kconfig_data: KConfigData = SPLKConfigData(cmd_config.project_dir)
-            variants = kconfig_data.get_variants()
-            variant_names = [variant.name for variant in variants]
-            selected_variant = self._select_variant(variant_names)
+            # Only the selected variant is parsed, the other ones are just found on the file system
+            project_dir = cmd_config.project_dir.absolute()
+            kconfig_model_file = project_dir / "KConfig"
+            if not kconfig_model_file.is_file():
+                raise UserNotificationException(f"File {kconfig_model_file} does not exist.")
+            variants = SPLKConfigData.find_variants(project_dir, cmd_config.ignore_patterns, cmd_config.max_depth)
+            if not variants:
+                # Without variants the default configuration of the model is edited
+                KConfig(kconfig_model_file).menu_config(gui=gui)
+                return 0
+            selected_variant = cmd_config.variant or self._select_variant(list(variants))
             if selected_variant is not None:
-                variant_data = kconfig_data.find_variant_config(selected_variant)
-                if variant_data is not None:
-                    variant_data.config.menu_config(gui=gui)
-                else:
-                    self.logger.error(f"Variant {selected_variant} not found.")
+                config_file = variants.get(selected_variant)
+                if config_file is None:
+                    raise UserNotificationException(f"Variant {selected_variant} not found. Available variants: {', '.join(variants)}")
+                KConfig(kconfig_model_file, config_file).menu_config(gui=gui)
         else:
             KConfig(cmd_config.kconfig_model_file, cmd_config.kconfig_config_file).menu_config(gui=gui)
         return 0
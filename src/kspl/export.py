@@ -0,0 +1,132 @@
+import csv
+from argparse import ArgumentParser, Namespace
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP
+from kspl.kconfig import to_kconfig_string
+
+EXPORT_FORMATS = ("csv", "tsv", "columnar")
+
+
+def iter_matrix_rows(kconfig_data: SPLKConfigData, include_menus: bool = False, include_levels: bool = False) -> Iterator[list[str]]:
+    """
+    Yields the symbol x variant matrix row by row, starting with the header row.
+
+    Every row is created only when requested, such that the rows can be written without keeping the matrix in memory.
+    The values are in kconfig format (e.g. y, n, 0x10). Symbols without value in a variant are empty.
+    """
+    variants = kconfig_data.variant_configs
+    yield ["name", "type", *(["level"] if include_levels else []), *(variant.name for variant in variants)]
+    for element in kconfig_data.get_elements():
+        if element.is_menu and not include_menus:
+            continue
+        row = [element.name, element.type.name.lower()]
+        if include_levels:
+            row.append(str(element.level))
+        for variant in variants:
+            variant_element = None if element.is_menu else variant.config.find_element(element.name)
+            row.append("" if variant_element is None else to_kconfig_string(variant_element.type, variant_element.value))
+        yield row
+
+
+def write_delimited(rows: Iterator[list[str]], output_file: Path, delimiter: str = ",") -> int:
+    """Writes the rows as CSV (or TSV) one at a time. Returns the number of data rows."""
+    count = 0
+    with output_file.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, delimiter=delimiter)
+        writer.writerow(next(rows))
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_columnar(rows: Iterator[list[str]], output_file: Path, batch_size: int = 1024) -> int:
+    """
+    Writes the rows as Parquet file with one string column per header entry.
+
+    The rows are written in row groups of ``batch_size``, only one batch is kept in memory.
+    Requires the optional ``pyarrow`` package (``arrow`` extra).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise UserNotificationException("The columnar format requires the 'pyarrow' package. Install it with 'pip install kspl[arrow]'.") from e
+    header = next(rows)
+    schema = pa.schema([(column, pa.string()) for column in header])
+    count = 0
+    with pq.ParquetWriter(output_file, schema) as writer:
+        batch: list[list[str]] = []
+
+        def flush() -> None:
+            columns: list[Any] = [list(column) for column in zip(*batch)] if batch else [[] for _ in header]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            batch.clear()
+
+        for row in rows:
+            batch.append(row)
+            count += 1
+            if len(batch) == batch_size:
+                flush()
+        if batch or not count:
+            flush()
+    return count
+
+
+@dataclass
+class ExportCommandConfig(DataClassDictMixin):
+    output_file: Path = field(metadata={"help": "File to write the symbol x variant matrix to."})
+    project_dir: Path = field(
+        default=Path(".").absolute(),
+        metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
+    )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+    format: Optional[str] = field(default=None, metadata={"help": f"Output format: {', '.join(EXPORT_FORMATS)}. Default: determined from the file extension, otherwise csv."})
+    include_menus: bool = field(default=False, metadata={"help": "Also write a row for every menu.", "action": "store_true"})
+    include_levels: bool = field(default=False, metadata={"help": "Add a column with the menu level of every row.", "action": "store_true"})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "ExportCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+    @property
+    def export_format(self) -> str:
+        if self.format:
+            if self.format not in EXPORT_FORMATS:
+                raise UserNotificationException(f"Unknown export format '{self.format}'. Available formats: {', '.join(EXPORT_FORMATS)}.")
+            return self.format
+        return {".tsv": "tsv", ".parquet": "columnar"}.get(self.output_file.suffix.lower(), "csv")
+
+
+class ExportCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("export", "Export the values of all symbols in all variants as table (CSV, TSV or columnar).")
+        self.logger = logger.bind()
+
+    @time_it("Export")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = ExportCommandConfig.from_namespace(args)
+        export_format = cmd_config.export_format
+        rows = iter_matrix_rows(SPLKConfigData(cmd_config.project_dir, cmd_config.ignore_patterns, cmd_config.max_depth), cmd_config.include_menus, cmd_config.include_levels)
+        cmd_config.output_file.parent.mkdir(parents=True, exist_ok=True)
+        if export_format == "columnar":
+            count = write_columnar(rows, cmd_config.output_file)
+        else:
+            count = write_delimited(rows, cmd_config.output_file, "\t" if export_format == "tsv" else ",")
+        self.logger.info(f"Exported {count} rows to {cmd_config.output_file}")
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, ExportCommandConfig)
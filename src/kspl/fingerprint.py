@@ -0,0 +1,78 @@
+import json
+from argparse import ArgumentParser, Namespace
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP
+from kspl.generate import configuration_fingerprint
+from kspl.variant_workers import load_variant_data, map_variants
+
+
+def fingerprint_variant(config_file: Path) -> str:
+    """Fingerprint of the effective configuration of one variant, in a worker of map_variants()."""
+    return configuration_fingerprint(load_variant_data(config_file))
+
+
+def fingerprint_variants(project_dir: Path, jobs: Optional[int] = None, ignore_patterns: Sequence[str] = (), max_depth: Optional[int] = None) -> dict[str, str]:
+    """Returns the fingerprints by variant name. The variants are evaluated in parallel, every worker parses the model only once."""
+    project_dir = project_dir.absolute()
+    kconfig_model_file = project_dir / "KConfig"
+    if not kconfig_model_file.is_file():
+        raise UserNotificationException(f"File {kconfig_model_file} does not exist.")
+    variants = SPLKConfigData.find_variants(project_dir, ignore_patterns, max_depth)
+    return dict(zip(variants, map_variants(kconfig_model_file, fingerprint_variant, list(variants.values()), jobs)))
+
+
+def group_by_fingerprint(fingerprints: dict[str, str]) -> dict[str, list[str]]:
+    """Variant names by fingerprint. Variants in the same group have the same effective configuration."""
+    groups: dict[str, list[str]] = {}
+    for variant, fingerprint in fingerprints.items():
+        groups.setdefault(fingerprint, []).append(variant)
+    return groups
+
+
+@dataclass
+class FingerprintCommandConfig(DataClassDictMixin):
+    project_dir: Path = field(
+        default=Path(".").absolute(),
+        metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
+    )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+    output_file: Optional[Path] = field(default=None, metadata={"help": "JSON file to write the fingerprints and the groups of identical variants to."})
+    jobs: Optional[int] = field(default=None, metadata={"help": "Number of parallel worker processes. Default: number of CPUs."})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "FingerprintCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class FingerprintCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("fingerprint", "Compute a fingerprint of the effective configuration of every variant and group the identical ones.")
+        self.logger = logger.bind()
+
+    @time_it("Fingerprint")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = FingerprintCommandConfig.from_namespace(args)
+        fingerprints = fingerprint_variants(cmd_config.project_dir, cmd_config.jobs, cmd_config.ignore_patterns, cmd_config.max_depth)
+        groups = group_by_fingerprint(fingerprints)
+        for fingerprint, variants in groups.items():
+            print(f"{fingerprint}  {', '.join(variants)}")
+        print(f"{len(fingerprints)} variants, {len(groups)} unique configurations.")
+        if cmd_config.output_file:
+            cmd_config.output_file.parent.mkdir(parents=True, exist_ok=True)
+            cmd_config.output_file.write_text(json.dumps({"variants": fingerprints, "groups": groups}, indent=4))
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, FingerprintCommandConfig)
@@ -0,0 +1,111 @@
+import re
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.generate import GeneratedFile, HeaderWriter
+
+
+def parse_depfile(content: str) -> tuple[str, list[str]]:
+    """
+    Parses a make dependency file as written by the compiler (e.g. ``gcc -MD``).
+
+    Only the first rule is relevant, the other ones are the phony targets for the headers (``-MP``).
+
+    :return: the target and its prerequisites
+    """
+    rules = content.replace("\\\r\n", " ").replace("\\\n", " ").splitlines()
+    rule = rules[0] if rules else ""
+    target, separator, prerequisites = rule.partition(": ")
+    if not separator:
+        target, separator, prerequisites = rule.partition(":")
+    if not separator:
+        raise ValueError("No make rule found in dependency file.")
+    # Drop the symbol file dependencies of an already fixed file and protect the escaped spaces in file names before splitting
+    prerequisites = re.sub(r"\$\(wildcard [^)]*\)", " ", prerequisites).replace("\\ ", "\0")
+    tokens = [token.replace("\0", " ") for token in prerequisites.split()]
+    return target.strip(), tokens
+
+
+class DepfileFixer:
+    """
+    Rewrites compiler dependency files to depend on the per symbol files instead of the autoconf header.
+
+    This is what the Linux ``fixdep`` does: every prerequisite is scanned for the used ``CONFIG_`` symbols
+    and a dependency to the symbol file is added (wrapped in ``$(wildcard)`` because a symbol file might not exist).
+    The dependency to the autoconf header is dropped, such that changing one symbol only rebuilds its users.
+    """
+
+    def __init__(self, config_dir: Path, autoconf_header: Optional[Path] = None, config_prefix: str = HeaderWriter.config_prefix) -> None:
+        self.config_dir = config_dir
+        self.autoconf_header = autoconf_header
+        self.symbol_pattern = re.compile(rf"\b{re.escape(config_prefix)}([A-Za-z0-9_]+)")
+        #: used symbols by scanned file, such that the common headers are scanned only once
+        self._symbols_cache: dict[str, list[str]] = {}
+
+    def used_symbols(self, file: str) -> list[str]:
+        symbols = self._symbols_cache.get(file)
+        if symbols is None:
+            try:
+                content = Path(file).read_text(errors="ignore")
+            except OSError:
+                content = ""
+            # Tristate symbols might be used with their module define
+            symbols = list(dict.fromkeys(name.removesuffix("_MODULE") for name in self.symbol_pattern.findall(content)))
+            self._symbols_cache[file] = symbols
+        return symbols
+
+    def fix_content(self, content: str) -> str:
+        target, prerequisites = parse_depfile(content)
+        if self.autoconf_header is not None:
+            prerequisites = [file for file in prerequisites if not self._is_autoconf_header(file)]
+        symbols: dict[str, None] = {}
+        for file in prerequisites:
+            symbols.update(dict.fromkeys(self.used_symbols(file)))
+        escaped_prerequisites = [file.replace(" ", "\\ ") for file in prerequisites]
+        config_dependencies = [f"$(wildcard {(self.config_dir / symbol).as_posix()})" for symbol in symbols]
+        lines = [f"{target}: \\", *(f"  {dependency} \\" for dependency in escaped_prerequisites + config_dependencies)]
+        lines[-1] = lines[-1].removesuffix(" \\")
+        # Phony targets, such that deleted headers do not break the build
+        lines.extend(["", *(f"{file}:" for file in escaped_prerequisites[1:])])
+        return "\n".join(lines) + "\n"
+
+    def fix(self, depfile: Path) -> None:
+        GeneratedFile(depfile, self.fix_content(depfile.read_text()), skip_writing_if_unchanged=True).to_file()
+
+    def _is_autoconf_header(self, file: str) -> bool:
+        return self.autoconf_header is not None and Path(file).absolute() == self.autoconf_header.absolute()
+
+
+@dataclass
+class FixdepCommandConfig(DataClassDictMixin):
+    depfiles: list[Path] = field(metadata={"help": "Compiler dependency files to rewrite in place."})
+    config_dir: Path = field(metadata={"help": "Directory with the per symbol files (see 'kspl generate --out-config-dir')."})
+    autoconf_header: Optional[Path] = field(default=None, metadata={"help": "Generated C header to remove from the dependencies."})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "FixdepCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class FixdepCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("fixdep", "Make compiler dependency files depend on the per symbol files.")
+        self.logger = logger.bind()
+
+    @time_it("Fixdep")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = FixdepCommandConfig.from_namespace(args)
+        fixer = DepfileFixer(cmd_config.config_dir, cmd_config.autoconf_header)
+        for depfile in cmd_config.depfiles:
+            fixer.fix(depfile)
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, FixdepCommandConfig)
@@ -1,38 +1,88 @@
+import hashlib
 import json
 from abc import ABC, abstractmethod
 from argparse import ArgumentParser, Namespace
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Union
 
 import kconfiglib
 from mashumaro import DataClassDictMixin
 from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.exceptions import UserNotificationException
 from py_app_dev.core.logging import logger, time_it
 
-from kspl.kconfig import ConfigElementType, ConfigurationData, KConfig, TriState
+from kspl.kconfig import ConfigElement, ConfigElementType, ConfigurationData, KConfig, TriState, to_kconfig_string
+from kspl.snapshot import ENTRY, HEADER, INDEX_ITEM, MAGIC, STRING_REF, TRISTATE_VALUES, VALUE_SIZE, VERSION, SnapshotValueType
+
+#: Text for the text based formats, bytes for the binary ones
+FileContent = Union[str, bytes]
 
 
 class GeneratedFile:
-    def __init__(self, path: Path, content: str = "", skip_writing_if_unchanged: bool = False) -> None:
+    def __init__(self, path: Path, content: FileContent = "", skip_writing_if_unchanged: bool = False) -> None:
         self.path = path
 
         self.content = content
 
         self.skip_writing_if_unchanged = skip_writing_if_unchanged
 
-    def to_string(self) -> str:
+    def to_string(self) -> FileContent:
         return self.content
 
     def to_file(self) -> None:
         """Only write to file if the content has changed. The directory of the file is created if it does not exist."""
         content = self.to_string()
 
-        if not self.path.exists() or not self.skip_writing_if_unchanged or self.path.read_text() != content:
+        if isinstance(content, bytes):
+            if not self.path.exists() or not self.skip_writing_if_unchanged or self.path.read_bytes() != content:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.path.write_bytes(content)
+        elif not self.path.exists() or not self.skip_writing_if_unchanged or self.path.read_text() != content:
             self.path.parent.mkdir(parents=True, exist_ok=True)
             self.path.write_text(content)
 
 
+@dataclass(frozen=True)
+class RenderedElement:
+    """
+    A configuration element normalized once for all output formats.
+
+    The type dispatch and the TriState conversion are done only here,
+    every writer just picks the representation it needs.
+    """
+
+    name: str
+    type: ConfigElementType
+    value: Any
+    #: bool and tristate values as python bool (only ``y`` is True), None for all other types
+    bool_value: Optional[bool] = None
+    #: C literal of the value: escaped and quoted string, hex literal or decimal number. None for bool and tristate.
+    literal: Optional[str] = None
+
+    @classmethod
+    def from_element(cls, element: ConfigElement) -> "RenderedElement":
+        if element.type in [ConfigElementType.BOOL, ConfigElementType.TRISTATE]:
+            return cls(element.name, element.type, element.value, bool_value=element.value == TriState.Y)
+        if element.type is ConfigElementType.STRING:
+            return cls(element.name, element.type, element.value, literal=f'"{kconfiglib.escape(element.value)}"')
+        if element.type is ConfigElementType.HEX:
+            return cls(element.name, element.type, element.value, literal=hex(element.value))
+        return cls(element.name, element.type, element.value, literal=str(element.value))
+
+
+class ElementRenderer(ABC):
+    """Collects the rendered elements of one output during a pipeline pass."""
+
+    @abstractmethod
+    def add(self, element: RenderedElement) -> None:
+        """- adds one element to the output."""
+
+    @abstractmethod
+    def content(self) -> FileContent:
+        """- returns the output content after all elements were added."""
+
+
 class FileWriter(ABC):
     """Writes the ConfigurationData to a file."""
 
@@ -41,94 +91,294 @@ class FileWriter(ABC):
 
     def write(self, configuration_data: ConfigurationData) -> None:
         """Writes the ConfigurationData to a file. The file shall not be modified if the content is the same as the existing one."""
-        content = self.generate_content(configuration_data)
+        RenderPipeline([self]).write(configuration_data)
+
+    def write_rendered(self, renderer: ElementRenderer) -> None:
+        """- writes the output of a renderer created by this writer, after the pipeline pass."""
+        self.write_content(renderer.content())
+
+    def write_content(self, content: FileContent) -> None:
         GeneratedFile(self.output_file, content, skip_writing_if_unchanged=True).to_file()
 
-    @abstractmethod
-    def generate_content(self, configuration_data: ConfigurationData) -> str:
+    def generate_content(self, configuration_data: ConfigurationData) -> FileContent:
         """- generates the content of the file from the ConfigurationData."""
+        return RenderPipeline([self]).render(configuration_data)[0]
 
+    @abstractmethod
+    def create_renderer(self) -> ElementRenderer:
+        """- creates a fresh renderer for one pass over the configuration elements."""
 
-class HeaderWriter(FileWriter):
-    """Writes the ConfigurationData as pre-processor defines in a C Header file."""
 
-    config_prefix = "CONFIG_"  # Prefix for all configuration defines
+class RenderPipeline:
+    """
+    Renders the ConfigurationData for several writers in a single pass.
+
+    Every element is normalized only once and then fed to the renderers of all writers.
+    """
+
+    def __init__(self, writers: Optional[list[FileWriter]] = None) -> None:
+        self.writers: list[FileWriter] = list(writers or [])
 
-    def generate_content(self, configuration_data: ConfigurationData) -> str:
-        """
-        Does exactly what the kconfiglib.write_autoconf() method does.
+    def add_writer(self, writer: FileWriter) -> "RenderPipeline":
+        self.writers.append(writer)
+        return self
 
-        We had to implemented here because we refactor the file writers to use the ConfigurationData
-        instead of the KConfig configuration. ConfigurationData has variable substitution already done.
-        """
-        result: list[str] = [
+    def render(self, configuration_data: ConfigurationData) -> list[FileContent]:
+        """Returns the content for each writer, in the order the writers were added."""
+        return [renderer.content() for renderer in self._run(configuration_data)]
+
+    def write(self, configuration_data: ConfigurationData) -> None:
+        for writer, renderer in zip(self.writers, self._run(configuration_data)):
+            writer.write_rendered(renderer)
+
+    def _run(self, configuration_data: ConfigurationData) -> list[ElementRenderer]:
+        renderers = [writer.create_renderer() for writer in self.writers]
+        for element in configuration_data.elements:
+            rendered_element = RenderedElement.from_element(element)
+            for renderer in renderers:
+                renderer.add(rendered_element)
+        return renderers
+
+
+def c_define(config_prefix: str, element: RenderedElement) -> Optional[str]:
+    """Returns the pre-processor define for the element or None if the element shall not be defined (bool/tristate 'n')."""
+    if element.literal is not None:
+        return f"#define {config_prefix}{element.name} {element.literal}"
+    if element.value == TriState.Y:
+        return f"#define {config_prefix}{element.name} 1"
+    if element.value == TriState.M:
+        return f"#define {config_prefix}{element.name}_MODULE 1"
+    return None
+
+
+class HeaderRenderer(ElementRenderer):
+    def __init__(self, config_prefix: str) -> None:
+        self.config_prefix = config_prefix
+        self.result: list[str] = [
             "/** @file */",
             "#ifndef AUTOCONF_H",
             "#define AUTOCONF_H",
             "",
         ]
 
-        def add_define(define_decl: str, description: str) -> None:
-            result.append(f"/** {description} */")
-            result.append(define_decl)
+    def add(self, element: RenderedElement) -> None:
+        define_decl = c_define(self.config_prefix, element)
+        if define_decl:
+            self.result.append(f"/** {element.name} */")
+            self.result.append(define_decl)
 
-        for element in configuration_data.elements:
-            val = element.value
-            if element.type in [ConfigElementType.BOOL, ConfigElementType.TRISTATE]:
-                if val == TriState.Y:
-                    add_define(
-                        f"#define {self.config_prefix}{element.name} 1",
-                        element.name,
-                    )
-                elif val == TriState.M:
-                    add_define(
-                        f"#define {self.config_prefix}{element.name}_MODULE 1",
-                        element.name,
-                    )
-
-            elif element.type is ConfigElementType.STRING:
-                add_define(
-                    f'#define {self.config_prefix}{element.name} "{kconfiglib.escape(val)}"',
-                    element.name,
-                )
-
-            else:  # element.type in [INT, HEX]:
-                if element.type is ConfigElementType.HEX:
-                    val = hex(val)
-                add_define(
-                    f"#define {self.config_prefix}{element.name} {val}",
-                    element.name,
-                )
-        result.extend(["", "#endif /* AUTOCONF_H */", ""])
-        return "\n".join(result)
+    def content(self) -> str:
+        return "\n".join([*self.result, "", "#endif /* AUTOCONF_H */", ""])
+
+
+class HeaderWriter(FileWriter):
+    """
+    Writes the ConfigurationData as pre-processor defines in a C Header file.
+
+    Does exactly what the kconfiglib.write_autoconf() method does.
+    We had to implemented here because we refactor the file writers to use the ConfigurationData
+    instead of the KConfig configuration. ConfigurationData has variable substitution already done.
+    """
+
+    config_prefix = "CONFIG_"  # Prefix for all configuration defines
+
+    def create_renderer(self) -> ElementRenderer:
+        return HeaderRenderer(self.config_prefix)
+
+
+class ConfigDirectoryRenderer(ElementRenderer):
+    def __init__(self, config_prefix: str) -> None:
+        self.config_prefix = config_prefix
+        #: content of the per symbol files, by symbol name
+        self.symbol_files: dict[str, str] = {}
+
+    def add(self, element: RenderedElement) -> None:
+        define_decl = c_define(self.config_prefix, element)
+        self.symbol_files[element.name] = f"{define_decl}\n" if define_decl else ""
+
+    def content(self) -> str:
+        """All defines, like the autoconf header but without guards and comments. Only used for inspection."""
+        return "".join(self.symbol_files.values())
+
+
+class ConfigDirectoryWriter(FileWriter):
+    """
+    Writes one tiny file per symbol in the output directory (Linux ``include/config`` style).
+
+    A symbol file is only written when the value of its symbol changes, such that a build which
+    depends on the symbol files (see ``kspl fixdep``) only recompiles what uses the changed symbols.
+    Files of symbols which are no longer in the configuration are emptied, because this is a change as well.
+    The names of the written symbol files are kept in a manifest, other files in the directory are not touched.
+    """
+
+    config_prefix = HeaderWriter.config_prefix
+    #: symbol names cannot start with a dot
+    manifest_name = ".symbols"
+
+    def create_renderer(self) -> ElementRenderer:
+        return ConfigDirectoryRenderer(self.config_prefix)
+
+    def write_rendered(self, renderer: ElementRenderer) -> None:
+        if not isinstance(renderer, ConfigDirectoryRenderer):
+            raise TypeError(f"Unexpected renderer {type(renderer).__name__}.")
+        symbol_files = dict(renderer.symbol_files)
+        manifest_file = self.output_file / self.manifest_name
+        if manifest_file.is_file():
+            for name in manifest_file.read_text().splitlines():
+                symbol_files.setdefault(name, "")
+        for name, content in symbol_files.items():
+            GeneratedFile(self.output_file / name, content, skip_writing_if_unchanged=True).to_file()
+        GeneratedFile(manifest_file, "".join(f"{name}\n" for name in sorted(symbol_files)), skip_writing_if_unchanged=True).to_file()
+
+
+class JsonRenderer(ElementRenderer):
+    def __init__(self) -> None:
+        self.result: dict[str, Any] = {}
+
+    def add(self, element: RenderedElement) -> None:
+        self.result[element.name] = element.bool_value if element.type is ConfigElementType.BOOL else element.value
+
+    def content(self) -> str:
+        return json.dumps(self.result, indent=4)
 
 
 class JsonWriter(FileWriter):
     """Writes the ConfigurationData in json format."""
 
-    def generate_content(self, configuration_data: ConfigurationData) -> str:
-        result = {}
-        for element in configuration_data.elements:
-            if element.type is ConfigElementType.BOOL:
-                result[element.name] = True if element.value == TriState.Y else False
-            else:
-                result[element.name] = element.value
-        return json.dumps(result, indent=4)
+    def create_renderer(self) -> ElementRenderer:
+        return JsonRenderer()
+
+
+class CMakeRenderer(ElementRenderer):
+    def __init__(self) -> None:
+        self.result: list[str] = []
+
+    def add(self, element: RenderedElement) -> None:
+        val = element.bool_value if element.type is ConfigElementType.BOOL else element.value
+        self.result.append(f'set({element.name} "{val}")')
+
+    def content(self) -> str:
+        return "\n".join(self.result)
 
 
 class CMakeWriter(FileWriter):
     """Writes the ConfigurationData as CMake variables."""
 
-    def generate_content(self, configuration_data: ConfigurationData) -> str:
-        result: list[str] = []
-        add = result.append
-        for element in configuration_data.elements:
-            val = element.value
-            if element.type is ConfigElementType.BOOL:
-                val = True if element.value == TriState.Y else False
-            add(f'set({element.name} "{val}")')
+    def create_renderer(self) -> ElementRenderer:
+        return CMakeRenderer()
+
+
+class SnapshotRenderer(ElementRenderer):
+    def __init__(self) -> None:
+        self.names: list[bytes] = []
+        self.entries: list[bytes] = []
+        self.strings = bytearray()
+        self.string_offsets: dict[bytes, int] = {}
+
+    def add_string(self, value: bytes) -> tuple[int, int]:
+        """Adds the value to the string table (only once) and returns its offset and length."""
+        offset = self.string_offsets.get(value)
+        if offset is None:
+            offset = self.string_offsets[value] = len(self.strings)
+            self.strings += value
+        return offset, len(value)
+
+    def add(self, element: RenderedElement) -> None:
+        name = element.name.encode("utf-8")
+        if element.type in [ConfigElementType.BOOL, ConfigElementType.TRISTATE]:
+            value_type = SnapshotValueType.BOOL if element.type is ConfigElementType.BOOL else SnapshotValueType.TRISTATE
+            raw_value = TRISTATE_VALUES.index(element.value.name.lower()).to_bytes(VALUE_SIZE, "little")
+        elif element.type is ConfigElementType.STRING:
+            value_type = SnapshotValueType.STRING
+            raw_value = STRING_REF.pack(*self.add_string(element.value.encode("utf-8")))
+        else:
+            value_type = SnapshotValueType.HEX if element.type is ConfigElementType.HEX else SnapshotValueType.INT
+            try:
+                raw_value = element.value.to_bytes(VALUE_SIZE, "little", signed=value_type == SnapshotValueType.INT)
+            except OverflowError as e:
+                raise UserNotificationException(f"Value of {element.name} does not fit in 64 bits and can not be written to the snapshot.") from e
+        self.names.append(name)
+        self.entries.append(ENTRY.pack(*self.add_string(name), value_type, raw_value))
+
+    def content(self) -> bytes:
+        count = len(self.entries)
+        index = sorted(range(count), key=self.names.__getitem__)
+        strings_offset = HEADER.size + count * (ENTRY.size + INDEX_ITEM.size)
+        return b"".join(
+            [
+                HEADER.pack(MAGIC, VERSION, 0, count, strings_offset, len(self.strings)),
+                *self.entries,
+                *(INDEX_ITEM.pack(position) for position in index),
+                bytes(self.strings),
+            ]
+        )
+
+
+class SnapshotWriter(FileWriter):
+    """Writes the ConfigurationData as compact binary snapshot. Read it with kspl.snapshot.Snapshot."""
+
+    def create_renderer(self) -> ElementRenderer:
+        return SnapshotRenderer()
+
+
+#: Part of the hashed content, increase it when the canonical representation changes
+FINGERPRINT_VERSION = 1
+
+
+class FingerprintRenderer(ElementRenderer):
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def add(self, element: RenderedElement) -> None:
+        # JSON keeps names and values with separators or line breaks unambiguous
+        self.lines.append(json.dumps([element.name, element.type.name, to_kconfig_string(element.type, element.value)]))
+
+    def content(self) -> str:
+        digest = hashlib.sha256(f"kspl-fingerprint-{FINGERPRINT_VERSION}\n".encode())
+        # Sorted, such that reordering the KConfig model does not change the fingerprint
+        for line in sorted(self.lines):
+            digest.update(line.encode("utf-8") + b"\n")
+        return digest.hexdigest()
+
+
+class FingerprintWriter(FileWriter):
+    """
+    Writes the SHA-256 fingerprint of the effective configuration values.
 
-        return "\n".join(result)
+    Variants with the same fingerprint generate the same outputs, no matter how their configuration files look like.
+    """
+
+    def create_renderer(self) -> ElementRenderer:
+        return FingerprintRenderer()
+
+
+def configuration_fingerprint(configuration_data: ConfigurationData) -> str:
+    """Stable hash of the effective configuration values (see FingerprintWriter)."""
+    return str(FingerprintWriter(Path()).generate_content(configuration_data))
+
+
+#: Output formats by name. Register additional formats with register_output_format().
+_OUTPUT_FORMATS: dict[str, type[FileWriter]] = {}
+
+
+def register_output_format(name: str, writer_class: type[FileWriter]) -> None:
+    """Registers a writer class such that it can be requested by name (e.g. ``kspl generate --outputs name=file``)."""
+    _OUTPUT_FORMATS[name] = writer_class
+
+
+def get_output_format(name: str) -> type[FileWriter]:
+    writer_class = _OUTPUT_FORMATS.get(name)
+    if writer_class is None:
+        raise UserNotificationException(f"Unknown output format '{name}'. Available formats: {', '.join(sorted(_OUTPUT_FORMATS))}")
+    return writer_class
+
+
+register_output_format("header", HeaderWriter)
+register_output_format("json", JsonWriter)
+register_output_format("cmake", CMakeWriter)
+register_output_format("snapshot", SnapshotWriter)
+register_output_format("config-dir", ConfigDirectoryWriter)
+register_output_format("fingerprint", FingerprintWriter)
 
 
 @dataclass
@@ -144,6 +394,22 @@ class GenerateCommandConfig(DataClassDictMixin):
         default=None,
         metadata={"help": "File to write the configuration in CMake format."},
     )
+    out_snapshot_file: Optional[Path] = field(
+        default=None,
+        metadata={"help": "File to write the configuration as binary snapshot (see kspl.snapshot)."},
+    )
+    out_config_dir: Optional[Path] = field(
+        default=None,
+        metadata={"help": "Directory to write one file per symbol (e.g. include/config). Use 'kspl fixdep' to let the compiler depfiles depend on them."},
+    )
+    outputs: list[str] = field(
+        default_factory=list,
+        metadata={"help": "Additional outputs as FORMAT=FILE pairs, for any registered output format (e.g. json=features.json)."},
+    )
+    fingerprint_file: Optional[Path] = field(
+        default=None,
+        metadata={"help": "File to store the configuration fingerprint and the outputs. Nothing is generated if neither changed and all outputs exist."},
+    )
 
     @classmethod
     def from_namespace(cls, namespace: Namespace) -> "GenerateCommandConfig":
@@ -160,14 +426,50 @@ class GenerateCommand(Command):
         self.logger.info(f"Running {self.name} with args {args}")
         cmd_config = GenerateCommandConfig.from_namespace(args)
         config = KConfig(cmd_config.kconfig_model_file, cmd_config.kconfig_config_file).collect_config_data()
+        pipeline = self.create_pipeline(cmd_config)
+        if cmd_config.fingerprint_file:
+            fingerprint = configuration_fingerprint(config)
+            fingerprint_content = self.fingerprint_file_content(pipeline, fingerprint)
+            if self.is_up_to_date(pipeline, cmd_config.fingerprint_file, fingerprint_content):
+                self.logger.info(f"Configuration fingerprint {fingerprint} did not change, nothing to generate.")
+                return 0
+        pipeline.write(config)
+        if cmd_config.fingerprint_file:
+            # Written last, such that an interrupted generation is repeated
+            GeneratedFile(cmd_config.fingerprint_file, fingerprint_content, skip_writing_if_unchanged=True).to_file()
+        return 0
 
+    @staticmethod
+    def fingerprint_file_content(pipeline: RenderPipeline, fingerprint: str) -> str:
+        """The fingerprint followed by the requested outputs, such that other outputs are generated even if the configuration did not change."""
+        outputs = [f"{type(writer).__name__} {writer.output_file.absolute().as_posix()}" for writer in pipeline.writers]
+        return "".join(f"{line}\n" for line in [fingerprint, *outputs])
+
+    @staticmethod
+    def is_up_to_date(pipeline: RenderPipeline, fingerprint_file: Path, fingerprint_content: str) -> bool:
+        if not fingerprint_file.is_file() or fingerprint_file.read_text() != fingerprint_content:
+            return False
+        return all(writer.output_file.exists() for writer in pipeline.writers)
+
+    @staticmethod
+    def create_pipeline(cmd_config: GenerateCommandConfig) -> RenderPipeline:
+        pipeline = RenderPipeline()
         if cmd_config.out_header_file:
-            HeaderWriter(cmd_config.out_header_file).write(config)
+            pipeline.add_writer(HeaderWriter(cmd_config.out_header_file))
         if cmd_config.out_json_file:
-            JsonWriter(cmd_config.out_json_file).write(config)
+            pipeline.add_writer(JsonWriter(cmd_config.out_json_file))
         if cmd_config.out_cmake_file:
-            CMakeWriter(cmd_config.out_cmake_file).write(config)
-        return 0
+            pipeline.add_writer(CMakeWriter(cmd_config.out_cmake_file))
+        if cmd_config.out_snapshot_file:
+            pipeline.add_writer(SnapshotWriter(cmd_config.out_snapshot_file))
+        if cmd_config.out_config_dir:
+            pipeline.add_writer(ConfigDirectoryWriter(cmd_config.out_config_dir))
+        for output in cmd_config.outputs:
+            format_name, separator, output_file = output.partition("=")
+            if not separator or not output_file:
+                raise UserNotificationException(f"Invalid output '{output}'. Expected FORMAT=FILE.")
+            pipeline.add_writer(get_output_format(format_name)(Path(output_file)))
+        return pipeline
 
     def _register_arguments(self, parser: ArgumentParser) -> None:
         register_arguments_for_config_dataclass(parser, GenerateCommandConfig)
@@ -0,0 +1,141 @@
+import re
+import shutil
+import subprocess
+from collections.abc import Iterable
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Optional
+
+import kconfiglib
+from py_app_dev.core.exceptions import UserNotificationException
+
+from kspl.kconfig import KConfig
+
+#: kconfiglib error for a sourced file which does not exist, the path is relative to the model directory
+_SOURCE_NOT_FOUND = re.compile(r"'([^']+)' not found")
+
+
+class GitRevisionReader:
+    """
+    Reads the content of files at a git revision.
+
+    All files are read through one ``git cat-file --batch`` process instead of starting git for every file.
+    Use it as context manager, such that the process is stopped.
+    """
+
+    def __init__(self, directory: Path, revision: str = "HEAD") -> None:
+        self.revision = revision
+        git = shutil.which("git")
+        if git is None:
+            raise UserNotificationException("git is required to read the files at a revision, but it was not found.")
+        self.git = git
+        try:
+            self.toplevel = Path(self._git(directory, "rev-parse", "--show-toplevel").strip()).resolve()
+            self._git(directory, "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}")
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise UserNotificationException(f"Could not read revision '{revision}' of the git repository in {directory}.") from e
+        self._process: Optional[subprocess.Popen[bytes]] = None
+
+    def _git(self, directory: Path, *args: str) -> str:
+        # The arguments are no shell command, the revision is passed to git as it is
+        return subprocess.run([self.git, *args], cwd=directory, check=True, capture_output=True, text=True).stdout  # noqa: S603
+
+    def read(self, file: Path) -> Optional[bytes]:
+        """Returns the content of the file at the revision, None if the file did not exist."""
+        try:
+            relative_path = file.resolve().relative_to(self.toplevel).as_posix()
+        except ValueError:
+            # Not in the repository
+            return None
+        stdin, stdout = self._streams()
+        stdin.write(f"{self.revision}:{relative_path}\n".encode())
+        stdin.flush()
+        header = stdout.readline().split()
+        if len(header) != 3:
+            # "<object> missing"
+            return None
+        content = stdout.read(int(header[2]))
+        # Every content is followed by a line feed
+        stdout.read(1)
+        return content if header[1] == b"blob" else None
+
+    def _streams(self) -> tuple[IO[bytes], IO[bytes]]:
+        if self._process is None:
+            self._process = subprocess.Popen([self.git, "cat-file", "--batch"], cwd=self.toplevel, stdin=subprocess.PIPE, stdout=subprocess.PIPE)  # noqa: S603
+        if self._process.stdin is None or self._process.stdout is None:
+            raise RuntimeError("git cat-file has no pipes.")
+        return self._process.stdin, self._process.stdout
+
+    def list_files(self, directory: Path) -> list[Path]:
+        """Returns all files below the directory at the revision, with their paths in the working tree."""
+        try:
+            relative_path = directory.resolve().relative_to(self.toplevel).as_posix()
+        except ValueError:
+            return []
+        output = self._git(self.toplevel, "ls-tree", "-r", "-z", "--name-only", self.revision, "--", relative_path)
+        return [self.toplevel / name for name in output.split("\0") if name]
+
+    def export_files(self, files: Iterable[Path], source_root: Path, target_root: Path) -> list[Path]:
+        """
+        Writes the files as they were at the revision below the target directory, with their paths relative to the source directory.
+
+        :return: the files which did not exist at the revision (they are not written)
+        """
+        missing = []
+        for file in files:
+            content = self.read(file)
+            if content is None:
+                missing.append(file)
+                continue
+            target_file = target_root / file.absolute().relative_to(source_root.absolute())
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            target_file.write_bytes(content)
+        return missing
+
+    def close(self) -> None:
+        if self._process is not None:
+            if self._process.stdin:
+                self._process.stdin.close()
+            self._process.wait()
+            if self._process.stdout:
+                self._process.stdout.close()
+            self._process = None
+
+    def __enter__(self) -> "GitRevisionReader":
+        return self
+
+    def __exit__(self, exc_type: Optional[type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+
+def load_model_at_revision(reader: GitRevisionReader, kconfig_model_file: Path, model_files: Iterable[Path], target_root: Path, max_attempts: int = 20) -> KConfig:
+    """
+    Parses the model as it was at the revision of the reader.
+
+    The model files (e.g. the files of the current model) are written below the target directory, keeping their place
+    in the repository such that the relative 'source' paths still work. Sourced files which only existed at the
+    revision are exported when kconfiglib does not find them.
+
+    :return: the model, its file is below the target directory
+    """
+    model_file = kconfig_model_file.resolve()
+    target_model_file = target_root / model_file.relative_to(reader.toplevel)
+    files = {file.resolve() for file in model_files} | {model_file}
+    exported: set[Path] = set()
+    for _ in range(max_attempts):
+        missing = reader.export_files(files - exported, reader.toplevel, target_root)
+        if model_file in missing:
+            raise UserNotificationException(f"File {kconfig_model_file} does not exist at revision '{reader.revision}'.")
+        exported |= files
+        try:
+            return KConfig(target_model_file)
+        except kconfiglib.KconfigError as e:
+            match = _SOURCE_NOT_FOUND.search(str(e))
+            if not match:
+                raise
+            source_file = (model_file.parent / match.group(1)).resolve()
+            if source_file in exported:
+                # It did not exist at the revision either
+                raise
+            files.add(source_file)
+    raise UserNotificationException(f"The model at revision '{reader.revision}' sources more than {max_attempts} files which do not exist anymore.")
@@ -1,3 +1,5 @@
+import functools
+import time
 import tkinter
 from abc import abstractmethod
 from argparse import Namespace
@@ -6,7 +8,7 @@ from enum import auto
 from pathlib import Path
 from threading import Lock
 from tkinter import font, simpledialog, ttk
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 import customtkinter
 from CTkToolTip import CTkToolTip
@@ -16,8 +18,10 @@ from py_app_dev.mvp.event_manager import EventID, EventManager
 from py_app_dev.mvp.presenter import Presenter
 from py_app_dev.mvp.view import View
 
+from kspl.config_file import ConfigFileWriter
 from kspl.config_slurper import KConfigData, VariantViewData
 from kspl.kconfig import ConfigElementType, EditableConfigElement, TriState
+from kspl.search import SymbolSearchIndex
 
 
 @dataclass
@@ -32,6 +36,7 @@ class SegmentedButtonAction:
 class KSplEvents(EventID):
     EDIT = auto()
     REFRESH = auto()
+    SAVE = auto()
 
 
 class CTkView(View):
@@ -50,6 +55,59 @@ class EditEventData:
 FONT_INCREASE_VALUE = 1
 FONT_DECREASE_VALUE = -1
 
+#: font family, size and weight
+FontSpec = tuple[str, int, str]
+MethodType = TypeVar("MethodType", bound=Callable[..., Any])
+
+
+class TextMetricsCache:
+    """Caches the fonts and the measured text widths, measuring text is expensive in Tk."""
+
+    def __init__(self) -> None:
+        self._fonts: dict[FontSpec, font.Font] = {}
+        self._widths: dict[tuple[FontSpec, str], int] = {}
+
+    def measure(self, font_spec: FontSpec, text: str) -> int:
+        width = self._widths.get((font_spec, text))
+        if width is None:
+            text_font = self._fonts.get(font_spec)
+            if text_font is None:
+                text_font = self._fonts[font_spec] = font.Font(font=font_spec)
+            width = self._widths[(font_spec, text)] = text_font.measure(text)
+        return width
+
+
+def tcl_quote(text: str) -> str:
+    """Quotes a word for a Tcl script, such that it is passed as it is."""
+    return "".join("\\n" if char == "\n" else f"\\{char}" if char in ' \t\\[]{}$";' else char for char in text) or "{}"
+
+
+def log_frame_time(operation: str) -> Callable[[MethodType], MethodType]:
+    """Logs the time from the start of a MainView operation until Tk is idle again, i.e. until the changes are drawn."""
+
+    def decorator(method: MethodType) -> MethodType:
+        @functools.wraps(method)
+        def wrapper(self: "MainView", *args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            result = method(self, *args, **kwargs)
+            self.root.after_idle(lambda: self.logger.debug(f"{operation} took {(time.perf_counter() - start) * 1000:.1f} ms until idle"))
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def find_differing_elements(elements: list[EditableConfigElement], variants: list[VariantViewData], columns: list[str]) -> list[bool]:
+    """
+    Returns for every element whether its value differs between the given variant columns.
+
+    The values are taken from the variant data in memory in one pass, the tree view is not queried.
+    Menus never differ, they are only shown for the rows they contain.
+    """
+    config_dicts = [variant.config_dict for variant in variants if variant.name in columns]
+    return [not element.is_menu and len({repr(config_dict.get(element.name)) for config_dict in config_dicts}) > 1 for element in elements]
+
 
 class MainView(CTkView):
     def __init__(
@@ -63,11 +121,15 @@ class MainView(CTkView):
         self.elements = elements
         self.elements_dict = {elem.name: elem for elem in elements}
         self.variants = variants
+        self.variants_dict = {variant.name: variant for variant in variants}
 
         self.logger = logger.bind()
         self.edit_event_data: EditEventData | None = None
+        #: names of the callbacks waiting for the event loop to become idle, see _run_when_idle()
+        self._pending_idle_callbacks: set[str] = set()
         self.trigger_edit_event = self.event_manager.create_event_trigger(KSplEvents.EDIT)
         self.trigger_refresh_event = self.event_manager.create_event_trigger(KSplEvents.REFRESH)
+        self.trigger_save_event = self.event_manager.create_event_trigger(KSplEvents.SAVE)
         self.root = customtkinter.CTk()
         # Closing only stops the event loop; we deliberately never call destroy(). Tk
         # dispatches <Configure> events while tearing the widget tree down, and
@@ -94,6 +156,7 @@ class MainView(CTkView):
         self._max_font_size = 40
         # Keep style reference so we can update dynamically
         self._style = ttk.Style()
+        self.text_metrics = TextMetricsCache()
 
         # Frame for controls
         control_frame = customtkinter.CTkFrame(self.root)
@@ -105,6 +168,7 @@ class MainView(CTkView):
             SegmentedButtonAction("🔼 Collapse", self.collapse_all_items),
             SegmentedButtonAction("🔍 Select", self.open_column_selection_dialog),
             SegmentedButtonAction("🔄 Refresh", self.trigger_refresh_event),
+            SegmentedButtonAction("💾 Save", self.trigger_save_event, "Save the edited values to the variant config files"),
         ]
 
         # Define zoom actions using the new dataclass
@@ -116,8 +180,9 @@ class MainView(CTkView):
 
         # Use grid in control_frame to keep zoom controls stable (no horizontal shift on font resize)
         control_frame.grid_columnconfigure(0, weight=0)  # actions
-        control_frame.grid_columnconfigure(1, weight=1)  # elastic spacer
-        control_frame.grid_columnconfigure(2, weight=0)  # zoom controls
+        control_frame.grid_columnconfigure(1, weight=0)  # search
+        control_frame.grid_columnconfigure(2, weight=1)  # row filters, elastic spacer
+        control_frame.grid_columnconfigure(3, weight=0)  # zoom controls
 
         self.tree_control_segment = customtkinter.CTkSegmentedButton(
             master=control_frame,
@@ -128,6 +193,26 @@ class MainView(CTkView):
         )
         self.tree_control_segment.grid(row=0, column=0, padx=(2, 6), pady=2, sticky="w")
 
+        # Search box, filters the rows on every keystroke using the prebuilt index
+        self.search_entry = customtkinter.CTkEntry(
+            master=control_frame,
+            placeholder_text="Search symbols, prompts and help",
+            width=260,
+            height=35,
+        )
+        self.search_entry.grid(row=0, column=1, padx=6, pady=2, sticky="w")
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+
+        # Hide the rows having the same value in all visible variants
+        self.only_differences_var = tkinter.BooleanVar(value=False)
+        self.only_differences_switch = customtkinter.CTkSwitch(
+            master=control_frame,
+            text="Only differences",
+            variable=self.only_differences_var,
+            command=self.apply_row_filter,
+        )
+        self.only_differences_switch.grid(row=0, column=2, padx=6, pady=2, sticky="w")
+
         self.zoom_segment = customtkinter.CTkSegmentedButton(
             master=control_frame,
             values=[action.label for action in self.zoom_actions],
@@ -136,7 +221,7 @@ class MainView(CTkView):
             font=(self._font_family, self._font_size),
             corner_radius=6,
         )
-        self.zoom_segment.grid(row=0, column=2, padx=(6, 2), pady=2, sticky="e")
+        self.zoom_segment.grid(row=0, column=3, padx=(6, 2), pady=2, sticky="e")
 
         # Add tooltips for both control and zoom segments
         self._add_segmented_button_tooltips()
@@ -151,11 +236,11 @@ class MainView(CTkView):
         self.column_manager.update_columns(self.variants)
 
         # Keep track of the mapping between the tree view items and the config elements
-        self.tree_view_items_mapping = self.populate_tree_view()
+        self._load_tree_view()
         self.adjust_column_width()
+        self._update_variant_scrollbar()
         self.tree.bind("<Button-1>", self.on_tree_click)
-        # TODO: make the tree view editable
-        # self.tree.bind("<Double-1>", self.double_click_handler)
+        self.tree.bind("<Double-1>", self.double_click_handler)
 
         # ========================================================
         # put all together
@@ -181,7 +266,6 @@ class MainView(CTkView):
         frame.grid_rowconfigure(0, weight=1)
         frame.grid_columnconfigure(0, weight=1)
 
-        columns = [var.name for var in self.variants]
         style = self._style  # reuse stored style
         # From: https://stackoverflow.com/a/56684731
         # This gives the selection a transparent look
@@ -222,19 +306,22 @@ class MainView(CTkView):
         )
 
         # create a Treeview widget
+        # The variant columns are configured by the ColumnManager
         config_treeview = ttk.Treeview(
             frame,
-            columns=columns,
             show="tree headings",
             style="mystyle.Treeview",
         )
 
         scrollbar_y = ttk.Scrollbar(frame, command=config_treeview.yview)
         scrollbar_x = ttk.Scrollbar(frame, command=config_treeview.xview, orient=tkinter.HORIZONTAL)
-        config_treeview.config(xscrollcommand=scrollbar_x.set, yscrollcommand=scrollbar_y.set)
+        self.tree_scrollbar_y = scrollbar_y
+        config_treeview.config(xscrollcommand=scrollbar_x.set, yscrollcommand=self.on_tree_yscroll)
         scrollbar_y.pack(fill=tkinter.Y, side=tkinter.RIGHT)
         scrollbar_x.pack(fill=tkinter.X, side=tkinter.BOTTOM)
         config_treeview.pack(fill=tkinter.BOTH, expand=True)
+        # Moves the window of rendered variant columns, only shown if not all visible variants are rendered
+        self.variant_scrollbar = ttk.Scrollbar(frame, command=self.on_variant_scroll, orient=tkinter.HORIZONTAL)
 
         return config_treeview
 
@@ -262,6 +349,7 @@ class MainView(CTkView):
         self._font_size = self._base_font_size
         self._apply_font_update()
 
+    @log_frame_time("Zoom")
     def _apply_font_update(self) -> None:
         """Apply current font settings to style + key widgets."""
         try:
@@ -309,32 +397,168 @@ class MainView(CTkView):
         stack = []  # To keep track of the parent items
         last_level = -1
         mapping: dict[str, str] = {}
+        # Keep the hierarchy in python, such that rows can be filtered without querying the tree
+        self.element_item_ids: list[str] = []
+        #: rows whose cells were not filled after the rendered columns changed, because they were not on screen
+        self.stale_items: set[str] = set()
+        self.item_parents: dict[str, str] = {}
+        self.children_of: dict[str, list[str]] = {"": []}
 
         for element in self.elements:
             values = self.collect_values_for_element(element)
             if element.level == 0:
                 # Insert at the root level
-                item_id = self.tree.insert("", "end", text=element.name, values=values)
+                parent = ""
+                item_id = self.tree.insert(parent, "end", text=element.name, values=values)
                 stack = [item_id]  # Reset the stack with the root item
             elif element.level > last_level:
                 # Insert as a child of the last inserted item
-                item_id = self.tree.insert(stack[-1], "end", text=element.name, values=values)
+                parent = stack[-1]
+                item_id = self.tree.insert(parent, "end", text=element.name, values=values)
                 stack.append(item_id)
             elif element.level == last_level:
                 # Insert at the same level as the last item
-                item_id = self.tree.insert(stack[-2], "end", text=element.name, values=values)
+                parent = stack[-2]
+                item_id = self.tree.insert(parent, "end", text=element.name, values=values)
                 stack[-1] = item_id  # Replace the top item in the stack
             else:
                 # Go up in the hierarchy and insert at the appropriate level
-                item_id = self.tree.insert(stack[element.level - 1], "end", text=element.name, values=values)
+                parent = stack[element.level - 1]
+                item_id = self.tree.insert(parent, "end", text=element.name, values=values)
                 stack = [*stack[: element.level], item_id]
 
             last_level = element.level
             mapping[item_id] = element.name
+            self.element_item_ids.append(item_id)
+            self.item_parents[item_id] = parent
+            self.children_of.setdefault(parent, []).append(item_id)
         return mapping
 
+    def _load_tree_view(self) -> None:
+        """Populate the tree and (re)build everything derived from the elements."""
+        self.tree_view_items_mapping = self.populate_tree_view()
+        self.element_items = {name: item for item, name in self.tree_view_items_mapping.items()}
+        self.search_index = SymbolSearchIndex(self.elements)
+        if self.search_entry.get() or self.only_differences_var.get():
+            self.apply_row_filter()
+
+    def on_search_changed(self, _event: Any = None) -> None:
+        self.apply_row_filter()
+
+    @log_frame_time("Row filter")
+    def apply_row_filter(self) -> None:
+        """
+        Show only the rows matching the search text and, if enabled, differing between the visible variants.
+
+        The menus of the shown rows are kept. The rows are detached and reattached with one call per menu,
+        the tree is never rebuilt. The menus containing matches are opened, such that the matches are revealed.
+        """
+        query = self.search_entry.get()
+        matches: Optional[list[int]] = self.search_index.search(query) if query.strip() else None
+        if self.only_differences_var.get():
+            differing = find_differing_elements(self.elements, self.variants, self.column_manager.visible_columns)
+            matches = [index for index in (range(len(self.elements)) if matches is None else matches) if differing[index]]
+        visible_items: Optional[set[str]] = None
+        menus_to_open: set[str] = set()
+        if matches is not None:
+            visible_items = set()
+            for index in matches:
+                item = self.element_item_ids[index]
+                visible_items.add(item)
+                parent = self.item_parents[item]
+                while parent and parent not in menus_to_open:
+                    menus_to_open.add(parent)
+                    visible_items.add(parent)
+                    parent = self.item_parents[parent]
+        for parent, children in self.children_of.items():
+            self.tree.set_children(parent, *(children if visible_items is None else [child for child in children if child in visible_items]))
+        for menu in menus_to_open:
+            self.tree.item(menu, open=True)
+
     def collect_values_for_element(self, element: EditableConfigElement) -> list[int | str]:
-        return [self.prepare_value_to_be_displayed(element.type, variant.config_dict.get(element.name, None)) for variant in self.variants] if not element.is_menu else []
+        """Values of the rendered variant columns, see ColumnManager.rendered_columns."""
+        if element.is_menu:
+            return []
+        return [self.prepare_value_to_be_displayed(element.type, self.variants_dict[column].config_dict.get(element.name, None)) for column in self.column_manager.rendered_columns]
+
+    @log_frame_time("Column window")
+    def refresh_rendered_columns(self) -> None:
+        """
+        Fill the cells from the in-memory values after the rendered variant columns changed.
+
+        Only the rows on screen are filled. The other rows are marked stale and filled when they are scrolled
+        into view (see on_tree_yscroll), such that moving the column window costs the same for any number of rows.
+        """
+        self.stale_items = {item for item, element in zip(self.element_item_ids, self.elements) if not element.is_menu}
+        self.fill_visible_rows()
+        self.adjust_column_width()
+        self._update_variant_scrollbar()
+
+    def fill_visible_rows(self) -> None:
+        if not self.stale_items:
+            return
+        for item in self._visible_items():
+            if item in self.stale_items:
+                self.stale_items.discard(item)
+                element = self.elements_dict[self.tree_view_items_mapping[item]]
+                self.tree.item(item, values=self.collect_values_for_element(element))
+
+    def _visible_items(self) -> list[str]:
+        """The rows on screen from top to bottom, with one identify_row() and bbox() call per row."""
+        items: list[str] = []
+        height = self.tree.winfo_height()
+        y = 0
+        # Skip the headings
+        while y < height and self.tree.identify_region(1, y) == "heading":
+            y += 2
+        item = self.tree.identify_row(y)
+        while item and y < height:
+            items.append(item)
+            bbox = self.tree.bbox(item)
+            if not bbox:
+                break
+            y = bbox[1] + bbox[3]
+            item = self.tree.identify_row(y)
+        return items
+
+    def on_tree_yscroll(self, first: float, last: float) -> None:
+        """Called by the tree whenever the shown rows change (scrolling, opening menus, filtering, resizing)."""
+        self.tree_scrollbar_y.set(first, last)
+        if self.stale_items:
+            self._run_when_idle(self.fill_visible_rows)
+
+    def on_variant_scroll(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        """Scrollbar command moving the window of rendered variant columns. The cells are filled once the scroll events are processed."""
+        if action == "moveto":
+            start = round(float(amount) * len(self.column_manager.visible_columns))
+        else:
+            step = self.column_manager.window_size if unit == "pages" else 1
+            start = self.column_manager.window_start + int(amount) * step
+        if self.column_manager.scroll_window(start):
+            self._run_when_idle(self.refresh_rendered_columns)
+
+    def _run_when_idle(self, callback: Callable[[], None]) -> None:
+        """Runs the callback when the event loop is idle, once no matter how often it was requested until then."""
+        name = callback.__name__
+        if name in self._pending_idle_callbacks:
+            return
+        self._pending_idle_callbacks.add(name)
+
+        def run() -> None:
+            self._pending_idle_callbacks.discard(name)
+            callback()
+
+        self.root.after_idle(run)
+
+    def _update_variant_scrollbar(self) -> None:
+        visible_count = len(self.column_manager.visible_columns)
+        if visible_count <= self.column_manager.window_size:
+            self.variant_scrollbar.pack_forget()
+            return
+        if not self.variant_scrollbar.winfo_ismapped():
+            self.variant_scrollbar.pack(fill=tkinter.X, side=tkinter.BOTTOM, before=self.tree)
+        start = self.column_manager.window_start
+        self.variant_scrollbar.set(start / visible_count, (start + len(self.column_manager.rendered_columns)) / visible_count)
 
     def prepare_value_to_be_displayed(self, element_type: ConfigElementType, value: Any) -> str:
         """
@@ -356,35 +580,31 @@ class MainView(CTkView):
             return str(value)
 
     def adjust_column_width(self) -> None:
-        """Adjust the column widths to fit the header text, preserving manual resizing."""
-        heading_font = font.Font(font=(self._font_family, self._font_size, "bold"))
-        padding = 60
+        """
+        Adjust the column widths to fit the header text, preserving manual resizing.
 
-        # Only adjust columns that actually exist in the current configuration
-        current_columns = self.tree["columns"]
-        for col in current_columns:
-            try:
-                text = self.tree.heading(col, "text")
-                min_width = heading_font.measure(text) + padding
-                # Get current width to preserve manual resizing
-                current_width = self.tree.column(col, "width")
-                # Use the larger of current width or minimum required width
-                final_width = max(current_width, min_width)
-                self.tree.column(col, minwidth=min_width, width=final_width, stretch=False)
-            except tkinter.TclError:
-                # Column might not exist anymore, skip it
-                self.logger.warning(f"Skipping column '{col}' as it no longer exists")
-                continue
+        The heading texts and the current widths are read with one Tcl evaluation and the new widths are applied with another one.
+        The text widths come from the text metrics cache.
+        """
+        heading_font: FontSpec = (self._font_family, self._font_size, "bold")
+        padding = 60
 
-        # First column (#0)
+        # Only adjust columns that actually exist in the current configuration, including the first column (#0)
+        columns = ["#0", *self.tree["columns"]]
+        tree = str(self.tree)
         try:
-            text = self.tree.heading("#0", "text")
-            min_width = heading_font.measure(text) + padding
-            current_width = self.tree.column("#0", "width")
-            final_width = max(current_width, min_width)
-            self.tree.column("#0", minwidth=min_width, width=final_width, stretch=False)
-        except tkinter.TclError:
-            self.logger.warning("Skipping column '#0' as it no longer exists")
+            query = " ".join(f"[{tree} heading {tcl_quote(col)} -text] [{tree} column {tcl_quote(col)} -width]" for col in columns)
+            texts_and_widths = self.tree.tk.splitlist(self.tree.tk.eval(f"list {query}"))
+            commands = []
+            for index, col in enumerate(columns):
+                text, current_width = texts_and_widths[2 * index], int(texts_and_widths[2 * index + 1])
+                min_width = self.text_metrics.measure(heading_font, str(text)) + padding
+                # Use the larger of current width (manual resizing) or minimum required width
+                commands.append(f"{tree} column {tcl_quote(col)} -minwidth {min_width} -width {max(current_width, min_width)} -stretch 0")
+            self.tree.tk.eval("\n".join(commands))
+        except tkinter.TclError as e:
+            # Columns might not exist anymore while the tree is reconfigured
+            self.logger.warning(f"Skipping the column width adjustment: {e}")
 
     def on_tree_click(self, event: Any) -> None:
         """Handle click events on the treeview to highlight the column header."""
@@ -410,13 +630,12 @@ class MainView(CTkView):
         selected_item = current_selection[0]
         selected_element_name = self.tree_view_items_mapping[selected_item]
 
-        variant_idx_str = self.tree.identify_column(event.x)  # Get the clicked column
-        variant_idx = int(variant_idx_str.split("#")[-1]) - 1  # Convert to 0-based index
-
-        if variant_idx < 0 or variant_idx >= len(self.variants):
+        # Hidden columns are not part of the click position, hence map it through the column manager
+        variant_name = self.column_manager.get_column_from_click_position(event.x)
+        selected_variant = next((variant for variant in self.variants if variant.name == variant_name), None)
+        if selected_variant is None:
             return
 
-        selected_variant = self.variants[variant_idx]
         selected_element = self.elements_dict[selected_element_name]
         selected_element_value = selected_variant.config_dict.get(selected_element_name)
 
@@ -434,6 +653,17 @@ class MainView(CTkView):
                 )
                 if tmp_int_value is not None:
                     new_value = tmp_int_value
+            elif selected_element.type == ConfigElementType.HEX:
+                tmp_hex_value = simpledialog.askstring(
+                    "Enter new value",
+                    "Enter new value",
+                    initialvalue=hex(selected_element_value) if selected_element_value is not None else "",
+                )
+                if tmp_hex_value is not None:
+                    try:
+                        new_value = int(tmp_hex_value, 16)
+                    except ValueError:
+                        self.logger.error(f"Invalid hex value '{tmp_hex_value}'")
             else:
                 # Prompt the user to enter a new string value using messagebox
                 tmp_str_value = simpledialog.askstring(
@@ -445,7 +675,7 @@ class MainView(CTkView):
                     new_value = tmp_str_value
 
             # Check if the value has changed
-            if new_value:
+            if new_value is not None and new_value != selected_element_value:
                 # Trigger the EDIT event
                 self.create_edit_event_trigger(selected_variant, selected_element_name, new_value)
 
@@ -453,38 +683,53 @@ class MainView(CTkView):
         self.edit_event_data = EditEventData(variant, element_name, new_value)
         self.trigger_edit_event()
 
+    @log_frame_time("Edit")
+    def update_element_values(self, variant_name: str, values: dict[str, Any]) -> None:
+        """Update the given element values of one variant, only the affected cells are touched."""
+        variant = self.variants_dict.get(variant_name)
+        if variant is None:
+            return
+        variant.config_dict.update(values)
+        if self.only_differences_var.get():
+            self.apply_row_filter()
+        if variant_name not in self.column_manager.rendered_columns:
+            # The cells are filled from the values when the column gets rendered
+            return
+        for element_name, value in values.items():
+            item = self.element_items.get(element_name)
+            element = self.elements_dict.get(element_name)
+            if item is None or element is None:
+                continue
+            try:
+                self.tree.set(item, variant_name, self.prepare_value_to_be_displayed(element.type, value))
+            except tkinter.TclError:
+                self.logger.warning(f"Could not update '{element_name}' of variant '{variant_name}'")
+
     def pop_edit_event_data(self) -> EditEventData | None:
         result = self.edit_event_data
         self.edit_event_data = None
         return result
 
+    @log_frame_time("Expand all")
     def expand_all_items(self) -> None:
         """Expand all items in the tree view."""
+        self._set_items_open(True)
 
-        def expand_recursive(item: str) -> None:
-            self.tree.item(item, open=True)
-            children = self.tree.get_children(item)
-            for child in children:
-                expand_recursive(child)
-
-        # Start with root items
-        root_items = self.tree.get_children()
-        for item in root_items:
-            expand_recursive(item)
-
+    @log_frame_time("Collapse all")
     def collapse_all_items(self) -> None:
         """Collapse all items in the tree view."""
+        self._set_items_open(False)
 
-        def collapse_recursive(item: str) -> None:
-            children = self.tree.get_children(item)
-            for child in children:
-                collapse_recursive(child)
-            self.tree.item(item, open=False)
+    def _set_items_open(self, is_open: bool) -> None:
+        """
+        Open or close all items having children with a single Tcl evaluation.
 
-        # Start with root items
-        root_items = self.tree.get_children()
-        for item in root_items:
-            collapse_recursive(item)
+        The items are taken from the hierarchy recorded by populate_tree_view, hence the tree is not queried
+        and the rows hidden by the row filter keep their state when they are shown again.
+        """
+        parents = [parent for parent in self.children_of if parent]
+        if parents:
+            self.tree.tk.eval("\n".join(f"{self.tree} item {{{parent}}} -open {int(is_open)}" for parent in parents))
 
     def on_tree_control_segment_click(self, value: str) -> None:
         """Handle clicks on the tree control segmented button."""
@@ -602,12 +847,18 @@ class MainView(CTkView):
     def update_visible_columns(self) -> None:
         """Wrapper method to update visible columns via ColumnManager."""
         self.column_manager.update_visible_columns()
+        self.refresh_rendered_columns()
+        if self.only_differences_var.get():
+            # The differences depend on the visible variants
+            self.apply_row_filter()
 
+    @log_frame_time("Refresh view")
     def update_data(self, elements: list[EditableConfigElement], variants: list[VariantViewData]) -> None:
         """Update the view with refreshed data."""
         self.elements = elements
         self.elements_dict = {elem.name: elem for elem in elements}
         self.variants = variants
+        self.variants_dict = {variant.name: variant for variant in variants}
 
         # Clear the tree first
         for item in self.tree.get_children():
@@ -617,8 +868,9 @@ class MainView(CTkView):
         self.column_manager.update_columns(variants)
 
         # Repopulate the tree view
-        self.tree_view_items_mapping = self.populate_tree_view()
+        self._load_tree_view()
         self.adjust_column_width()
+        self._update_variant_scrollbar()
 
     # ...existing code...
 
@@ -628,8 +880,10 @@ class KSPL(Presenter):
         self.event_manager = event_manager
         self.event_manager.subscribe(KSplEvents.EDIT, self.edit)
         self.event_manager.subscribe(KSplEvents.REFRESH, self.refresh)
+        self.event_manager.subscribe(KSplEvents.SAVE, self.save)
         self.logger = logger.bind()
         self.kconfig_data = kconfig_data
+        self.config_file_writer = ConfigFileWriter()
         self.view = MainView(
             self.event_manager,
             self.kconfig_data.get_elements(),
@@ -647,14 +901,29 @@ class KSPL(Presenter):
             variant = self.kconfig_data.find_variant_config(edit_event_data.variant.name)
             if variant is None:
                 raise ValueError(f"Could not find variant '{edit_event_data.variant.name}'")
-            config_element = variant.find_element(edit_event_data.config_element_name)
-            if config_element is None:
-                raise ValueError(f"Could not find config element '{edit_event_data.config_element_name}'")
-            config_element.value = edit_event_data.new_value
+            # Let kconfiglib re-evaluate the dependent symbols and push only the changed cells to the view
+            changed_values = variant.set_element_value(edit_event_data.config_element_name, edit_event_data.new_value)
+            self.view.update_element_values(variant.name, changed_values)
+
+    def save(self) -> None:
+        """Write the edited values back to the variant configuration files, in the background."""
+        for variant_view in self.view.variants:
+            variant = self.kconfig_data.find_variant_config(variant_view.name)
+            if variant is None or not variant.is_loaded:
+                # A lazy variant which was never evaluated has no changes
+                continue
+            if variant.config_file is None and variant.config.get_changed_elements():
+                self.logger.warning(f"Variant '{variant.name}' has no configuration file, its changes can not be saved.")
+                continue
+            update = variant.create_config_file_update()
+            if update is not None:
+                self.config_file_writer.submit(update)
 
     def refresh(self) -> None:
         """Handle refresh event by reloading data and updating the view."""
         self.logger.info("Refreshing KConfig data...")
+        # The files shall be reloaded with all saved values
+        self.config_file_writer.flush()
         try:
             # Store old state for debugging
             old_variants = [v.name for v in self.kconfig_data.get_variants()]
@@ -679,6 +948,8 @@ class KSPL(Presenter):
 
     def run(self) -> None:
         self.view.mainloop()
+        # The writer thread is a daemon, the pending saves would be lost at exit
+        self.config_file_writer.flush()
 
 
 @dataclass
@@ -694,7 +965,15 @@ class GuiCommandConfig(DataClassDictMixin):
 
 
 class ColumnManager:
-    """Manages column state, visibility, selection, and headings for the treeview."""
+    """
+    Manages column state, visibility, selection, and headings for the treeview.
+
+    The treeview becomes slow with hundreds of columns, therefore only a window of the visible columns
+    is rendered (see rendered_columns). Visibility and selection always refer to all columns.
+    """
+
+    #: Maximum number of variant columns rendered at once
+    window_size = 40
 
     def __init__(self, tree: ttk.Treeview) -> None:
         self.tree = tree
@@ -703,8 +982,46 @@ class ColumnManager:
         self.header_texts: dict[str, str] = {}
         self.selected_column_id: str | None = None
         self.column_vars: dict[str, tkinter.BooleanVar] = {}
+        #: Position of the first rendered column in the visible columns
+        self.window_start = 0
         self._tree_lock = Lock()  # Prevent concurrent tree modifications
 
+    @property
+    def rendered_columns(self) -> list[str]:
+        """The visible columns which are currently columns of the treeview."""
+        return self.visible_columns[self.window_start : self.window_start + self.window_size]
+
+    def scroll_window(self, start: int) -> bool:
+        """Move the window of rendered columns. Returns True if the rendered columns changed."""
+        with self._tree_lock:
+            start = max(0, min(start, len(self.visible_columns) - self.window_size))
+            if start == self.window_start:
+                return False
+            self.window_start = start
+            self._render_window()
+            return True
+
+    def _render_window(self) -> None:
+        """Configure the treeview columns for the current window. The cell values must be filled again afterwards."""
+        self.window_start = max(0, min(self.window_start, len(self.visible_columns) - self.window_size))
+        rendered = self.rendered_columns
+        try:
+            # First completely clear the tree configuration
+            self.tree.configure(columns=(), displaycolumns=())
+            # Then set new configuration
+            self.tree["columns"] = tuple(rendered)
+            self.tree["displaycolumns"] = rendered
+        except tkinter.TclError:
+            # If there's still an error, log it but continue
+            pass
+        for column in rendered:
+            text = self.header_texts.get(column, column)
+            try:
+                self.tree.heading(column, text=f"✅{text}" if column == self.selected_column_id else text)
+            except tkinter.TclError:
+                # Column might not exist yet, will be handled in next update
+                pass
+
     def update_columns(self, variants: list[VariantViewData]) -> None:
         """Update column configuration with new variants."""
         with self._tree_lock:
@@ -725,26 +1042,9 @@ class ColumnManager:
             # Update all_columns after determining visible columns
             self.all_columns = new_all_columns
 
-            # Update tree configuration with error handling
-            try:
-                # First completely clear the tree configuration
-                self.tree.configure(columns=(), displaycolumns=())
-                # Then set new configuration
-                self.tree["columns"] = tuple(self.all_columns)
-                self.tree["displaycolumns"] = self.visible_columns
-            except tkinter.TclError:
-                # If there's still an error, log it but continue
-                pass
-
-            # Update header texts and tree headings
-            self.header_texts = {}
-            for variant in variants:
-                self.header_texts[variant.name] = variant.name
-                try:
-                    self.tree.heading(variant.name, text=variant.name)
-                except tkinter.TclError:
-                    # Column might not exist yet, will be handled in next update
-                    pass
+            # Update header texts and tree configuration
+            self.header_texts = {variant.name: variant.name for variant in variants}
+            self._render_window()
 
             # Clean up column variables for dialog
             self.column_vars = {k: v for k, v in self.column_vars.items() if k in self.all_columns}
@@ -760,6 +1060,9 @@ class ColumnManager:
 
             # Set new selection
             self.selected_column_id = column_name
+            if column_name not in self.rendered_columns:
+                # The heading is marked when the column gets rendered
+                return True
             original_text = self.header_texts.get(column_name)
             if original_text:
                 try:
@@ -779,7 +1082,7 @@ class ColumnManager:
         """Internal method to clear selection without public access."""
         if self.selected_column_id and self.selected_column_id in self.header_texts:
             # Only try to clear if the column still exists in the tree
-            if self.selected_column_id in self.all_columns:
+            if self.selected_column_id in self.rendered_columns:
                 original_text = self.header_texts[self.selected_column_id]
                 try:
                     self.tree.heading(self.selected_column_id, text=original_text)
@@ -795,17 +1098,14 @@ class ColumnManager:
             return None
 
         col_idx = int(column_id_str.replace("#", "")) - 1
-        if col_idx < 0 or col_idx >= len(self.visible_columns):
+        rendered = self.rendered_columns
+        if col_idx < 0 or col_idx >= len(rendered):
             return None
 
-        return self.visible_columns[col_idx]
+        return rendered[col_idx]
 
     def update_visible_columns(self) -> None:
         """Update visible columns based on column_vars state."""
         with self._tree_lock:
             self.visible_columns = [col_name for col_name, var in self.column_vars.items() if var.get()]
-            try:
-                self.tree["displaycolumns"] = self.visible_columns
-            except tkinter.TclError:
-                # Tree might be in an inconsistent state, log and continue
-                pass
+            self._render_window()
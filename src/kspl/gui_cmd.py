@@ -1,6 +1,7 @@
 from argparse import ArgumentParser, Namespace
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional
 
 from mashumaro import DataClassDictMixin
 from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
@@ -9,6 +10,7 @@ from py_app_dev.core.logging import logger, time_it
 from py_app_dev.mvp.event_manager import EventManager
 
 from kspl.config_slurper import KConfigData, SPLKConfigData
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP
 
 
 @dataclass
@@ -17,6 +19,12 @@ class GuiCommandConfig(DataClassDictMixin):
         default=Path(".").absolute(),
         metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
     )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+    lazy: bool = field(
+        default=False,
+        metadata={"help": "Evaluate every variant only when its column is displayed. Speeds up the start for SPLs with many variants.", "action": "store_true"},
+    )
 
     @classmethod
     def from_namespace(cls, namespace: Namespace) -> "GuiCommandConfig":
@@ -33,7 +41,7 @@ class GuiCommand(Command):
         self.logger.info(f"Running {self.name} with args {args}")
         config = GuiCommandConfig.from_namespace(args)
         event_manager = EventManager()
-        kconfig_data: KConfigData = SPLKConfigData(config.project_dir.absolute())
+        kconfig_data: KConfigData = SPLKConfigData(config.project_dir.absolute(), config.ignore_patterns, config.max_depth, lazy=config.lazy)
         try:
             from kspl.gui import KSPL
 
@@ -0,0 +1,70 @@
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.discovery import add_variant_search_arguments
+from kspl.kconfig import SymbolChange
+
+
+@dataclass
+class ImpactReport:
+    symbol: str
+    value: str
+    #: all symbols which might be affected according to the model dependencies
+    affected_symbols: list[str]
+    #: the symbols which actually change, by variant name
+    variant_changes: dict[str, list[SymbolChange]]
+
+
+def analyze_impact(kconfig_data: SPLKConfigData, symbol: str, value: str = "n") -> ImpactReport:
+    """
+    Finds out which symbols change, in every variant, if the symbol had the given value.
+
+    Only the symbols depending on it (see KConfig.dependency_index) are evaluated again, the variants are not modified.
+    """
+    variant_changes = {variant.name: variant.config.simulate_value(symbol, value) for variant in kconfig_data.variant_configs}
+    return ImpactReport(symbol, value, kconfig_data.model.dependency_index.affected(symbol), variant_changes)
+
+
+@dataclass
+class ImpactCommandConfig(DataClassDictMixin):
+    symbol: str
+    project_dir: Path = field(default=Path(".").absolute())
+    value: str = "n"
+    ignore_patterns: list[str] = field(default_factory=list)
+    max_depth: Optional[int] = None
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "ImpactCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class ImpactCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("impact", "Show which symbols change in every variant if a symbol gets a value.")
+        self.logger = logger.bind()
+
+    @time_it("Impact")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = ImpactCommandConfig.from_namespace(args)
+        report = analyze_impact(SPLKConfigData(cmd_config.project_dir, cmd_config.ignore_patterns, cmd_config.max_depth), cmd_config.symbol, cmd_config.value)
+        print(f"Symbols depending on {report.symbol}: {', '.join(report.affected_symbols[1:]) or '-'}")
+        for variant_name, changes in report.variant_changes.items():
+            print(f"{variant_name}:" if changes else f"{variant_name}: no changes")
+            for change in changes:
+                print(f"  {change}")
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        # The symbol is positional, which the dataclass based registration does not support
+        parser.add_argument("symbol", help="Symbol to change (without the CONFIG_ prefix).")
+        parser.add_argument("--project-dir", type=Path, default=Path(".").absolute(), help="Project root directory. Defaults to the current directory if not specified.")
+        parser.add_argument("--value", default="n", help="Value to give to the symbol (kconfig format, e.g. n, y, 13, 0x10). Default: n")
+        add_variant_search_arguments(parser)
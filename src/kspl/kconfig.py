@@ -1,15 +1,18 @@
 import os
 import re
+import threading
 from collections.abc import Generator
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum, auto
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
 
 import kconfiglib
 from kconfiglib import MenuNode
 from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger
 
 
 class TriState(Enum):
@@ -28,6 +31,14 @@ class ConfigElementType(Enum):
     MENU = auto()
 
 
+_SYMBOL_TYPES = {
+    kconfiglib.BOOL: ConfigElementType.BOOL,
+    kconfiglib.TRISTATE: ConfigElementType.TRISTATE,
+    kconfiglib.HEX: ConfigElementType.HEX,
+    kconfiglib.INT: ConfigElementType.INT,
+}
+
+
 @dataclass
 class ConfigElement:
     type: ConfigElementType
@@ -47,6 +58,10 @@ class EditableConfigElement(ConfigElement):
     level: int = 0
     #: Is determined when the value is calculated. This is a hidden function call due to property magic.
     write_to_conf: bool = True
+    #: Prompt text shown to the user (the menu title for menus)
+    prompt: Optional[str] = None
+    #: Help text from the KConfig model
+    help: Optional[str] = None
 
     @property
     def id(self) -> str:
@@ -68,14 +83,120 @@ class ConfigurationData:
     elements: list[ConfigElement]
 
 
+@dataclass
+class SymbolChange:
+    """Value change of a symbol. A value is None if the symbol has no value (e.g. unmet dependencies)."""
+
+    name: str
+    type: ConfigElementType
+    old_value: Any
+    new_value: Any
+
+    def __str__(self) -> str:
+        return f"{self.name}: {format_optional_value(self.type, self.old_value)} -> {format_optional_value(self.type, self.new_value)}"
+
+
+def format_optional_value(element_type: ConfigElementType, value: Any) -> str:
+    return "<no value>" if value is None else to_kconfig_string(element_type, value)
+
+
+def to_kconfig_string(element_type: ConfigElementType, value: Any) -> str:
+    """Converts the value of an element to its kconfiglib string representation (as used by Symbol.set_value())."""
+    if element_type in [ConfigElementType.BOOL, ConfigElementType.TRISTATE]:
+        return str(value.name).lower()
+    if element_type == ConfigElementType.HEX:
+        return hex(value)
+    return str(value)
+
+
+def to_config_line(element: ConfigElement, config_prefix: str = "CONFIG_") -> str:
+    """Creates the user configuration file (config.txt) line for the element, the same way kconfiglib writes it."""
+    if element.type in [ConfigElementType.BOOL, ConfigElementType.TRISTATE] and element.value == TriState.N:
+        return f"# {config_prefix}{element.name} is not set"
+    if element.type == ConfigElementType.STRING:
+        return f'{config_prefix}{element.name}="{kconfiglib.escape(element.value)}"'
+    return f"{config_prefix}{element.name}={to_kconfig_string(element.type, element.value)}"
+
+
+class DependencyIndex:
+    """
+    Reverse dependency index over the symbol names of a parsed KConfig model.
+
+    For every symbol it knows the symbols whose value might change when its value changes,
+    through 'depends on', 'select', 'imply', defaults, ranges and prompt visibility.
+    Choices are resolved to the symbols depending on them.
+    """
+
+    def __init__(self, config: kconfiglib.Kconfig) -> None:
+        self.dependents: dict[str, set[str]] = {}
+        for sym in config.unique_defined_syms:
+            dependent_names = self.dependents.setdefault(sym.name, set())
+            for dependent in sym._dependents:
+                if isinstance(dependent, kconfiglib.Choice):
+                    dependent_names.update(item.name for item in [*dependent.syms, *dependent._dependents] if isinstance(item, kconfiglib.Symbol))
+                else:
+                    dependent_names.add(dependent.name)
+            dependent_names.discard(sym.name)
+
+    def affected(self, name: str) -> list[str]:
+        """The symbol itself followed by all symbols that (transitively) depend on it."""
+        affected = [name]
+        visited = {name}
+        to_visit = [name]
+        while to_visit:
+            for dependent in self.dependents.get(to_visit.pop(), ()):
+                if dependent not in visited:
+                    visited.add(dependent)
+                    to_visit.append(dependent)
+                    affected.append(dependent)
+        return affected
+
+
+class DefiningFileIndex:
+    """Symbol names by the model file defining them. A symbol defined in several files is in all of them."""
+
+    def __init__(self, config: kconfiglib.Kconfig, root_directory: Path) -> None:
+        self.symbols: dict[Path, set[str]] = {}
+        for sym in config.unique_defined_syms:
+            for node in sym.nodes:
+                file = Path(node.filename)
+                # The sourced files are relative to the directory the model was parsed in
+                file = (file if file.is_absolute() else root_directory / file).resolve()
+                self.symbols.setdefault(file, set()).add(sym.name)
+
+    def defined_in(self, file: Path) -> set[str]:
+        return self.symbols.get(file.resolve(), set())
+
+
+#: the working directory is process wide, models parsed in other threads (e.g. SPLKConfigData.aload()) must change it one after the other
+_working_directory_lock = threading.RLock()
+
+
 @contextmanager
 def working_directory(some_directory: Path) -> Generator[None, Any, None]:
-    current_directory = Path().absolute()
+    with _working_directory_lock:
+        current_directory = Path().absolute()
+        try:
+            os.chdir(some_directory)
+            yield
+        finally:
+            os.chdir(current_directory)
+
+
+def _parse_model(model_file: Path) -> kconfiglib.Kconfig:
+    """Parses the model with kconfiglib. If the parsing fails, the files which kconfiglib did not close yet are closed."""
+    config = kconfiglib.Kconfig.__new__(kconfiglib.Kconfig)
     try:
-        os.chdir(some_directory)
-        yield
-    finally:
-        os.chdir(current_directory)
+        config.__init__(model_file.as_posix())
+    except Exception:
+        # The files of the enclosing 'source' statements are still open
+        readlines = [readline for _, readline in getattr(config, "_filestack", [])]
+        readlines.append(getattr(config, "_readline", None))
+        for readline in readlines:
+            if readline is not None:
+                readline.__self__.close()
+        raise
+    return config
 
 
 class KConfig:
@@ -96,7 +217,7 @@ class KConfig:
             raise FileNotFoundError(f"File {k_config_model_file} does not exist.")
         self.k_config_root_directory = k_config_root_directory or k_config_model_file.parent
         with working_directory(self.k_config_root_directory):
-            self.config = kconfiglib.Kconfig(k_config_model_file.absolute().as_posix())
+            self.config = _parse_model(k_config_model_file.absolute())
         self.parsed_files: list[Path] = self._collect_parsed_files()
         self.k_config_file: Optional[Path] = k_config_file
         if self.k_config_file:
@@ -106,6 +227,20 @@ class KConfig:
             self.parsed_files.append(self.k_config_file)
         self.elements = self._collect_elements()
         self._elements_dict = {element.id: element for element in self.elements}
+        #: values of the symbols which only got a value after an edit (see set_element_value)
+        self._late_values: dict[str, Any] = {}
+
+    def load_user_config(self, k_config_file: Path) -> None:
+        """Replaces the user configuration, e.g. to evaluate another variant of the same model without parsing the model again."""
+        if not k_config_file.is_file():
+            raise FileNotFoundError(f"File {k_config_file} does not exist.")
+        # Replacing resets the values of the previous configuration
+        self.config.load_config(str(k_config_file), replace=True)
+        self.k_config_file = k_config_file
+        self.parsed_files = [*self._collect_parsed_files(), k_config_file]
+        self.elements = self._collect_elements()
+        self._elements_dict = {element.id: element for element in self.elements}
+        self._late_values = {}
 
     def get_parsed_files(self) -> list[Path]:
         return self.parsed_files
@@ -160,17 +295,7 @@ class KConfig:
             sym = node.item
             if isinstance(sym, kconfiglib.Symbol):
                 if sym.config_string:
-                    val = sym.str_value
-                    type = ConfigElementType.STRING
-                    if sym.type in [kconfiglib.BOOL, kconfiglib.TRISTATE]:
-                        val = getattr(TriState, str(val).upper())
-                        type = ConfigElementType.BOOL if sym.type == kconfiglib.BOOL else ConfigElementType.TRISTATE
-                    elif sym.type == kconfiglib.HEX:
-                        val = int(str(val), 16)
-                        type = ConfigElementType.HEX
-                    elif sym.type == kconfiglib.INT:
-                        val = int(val)
-                        type = ConfigElementType.INT
+                    type, val = self._symbol_value(sym)
                     element = EditableConfigElement(
                         type=type,
                         name=sym.name,
@@ -178,6 +303,8 @@ class KConfig:
                         original_value=val,
                         level=level,
                         write_to_conf=sym._write_to_conf,
+                        prompt=node.prompt[0] if node.prompt else None,
+                        help=getattr(node, "help", None),
                     )
             else:
                 if isinstance(node, kconfiglib.MenuNode):
@@ -188,6 +315,8 @@ class KConfig:
                         original_value=None,
                         level=level,
                         write_to_conf=False,
+                        prompt=node.prompt[0],
+                        help=getattr(node, "help", None),
                     )
             return element
 
@@ -228,9 +357,123 @@ class KConfig:
         create_elements_tree(self.config.top_node, elements)
         return elements
 
+    @staticmethod
+    def _symbol_type(sym: kconfiglib.Symbol) -> ConfigElementType:
+        return _SYMBOL_TYPES.get(sym.type, ConfigElementType.STRING)
+
+    @classmethod
+    def _symbol_value(cls, sym: kconfiglib.Symbol) -> tuple[ConfigElementType, Any]:
+        val: Any = sym.str_value
+        type = cls._symbol_type(sym)
+        if type in [ConfigElementType.BOOL, ConfigElementType.TRISTATE]:
+            val = getattr(TriState, str(val).upper())
+        elif type == ConfigElementType.HEX:
+            val = int(str(val), 16)
+        elif type == ConfigElementType.INT:
+            val = int(val)
+        return type, val
+
+    def set_element_value(self, name: str, value: Any) -> dict[str, Any]:
+        """
+        Assigns a new value to an element and re-evaluates only the symbols depending on it.
+
+        The value is given to kconfiglib as user value, such that 'depends on', 'select', 'imply', etc. are considered.
+        Only the elements of the affected symbols are updated. The edited element keeps its original value,
+        such that it is reported as changed. The other elements just follow the new evaluation, unless they
+        were edited before and still have a value.
+
+        :return: the new values of the elements whose value changed (None if the symbol has no value anymore)
+        """
+        element = self.find_element(name)
+        sym = self.config.syms.get(name)
+        if element is None or element.is_menu or sym is None:
+            raise ValueError(f"Could not find config element '{name}'")
+        if not sym.set_value(to_kconfig_string(element.type, value)):
+            raise ValueError(f"Invalid value '{value}' for config element '{name}'")
+        changed_values: dict[str, Any] = {}
+        for affected_sym in self._affected_symbols(sym):
+            new_value = self._optional_symbol_value(affected_sym)
+            affected_element = self.find_element(affected_sym.name)
+            if affected_element is None:
+                # Symbol without value when the configuration was loaded
+                if self._late_values.get(affected_sym.name) != new_value:
+                    self._late_values[affected_sym.name] = new_value
+                    changed_values[affected_sym.name] = new_value
+                continue
+            # Dependents edited before keep their original value, such that the pending edit is still saved.
+            # A symbol without value has nothing to save, its pending edit is dropped.
+            follows_evaluation = (affected_element is not element and not affected_element.has_been_changed) or new_value is None
+            if affected_element.value != new_value:
+                affected_element.value = new_value
+                changed_values[affected_sym.name] = new_value
+            if follows_evaluation:
+                affected_element.original_value = affected_element.value
+            affected_element.write_to_conf = affected_sym._write_to_conf
+        if element.value != value:
+            logger.warning(f"Value '{value}' for '{name}' was not accepted, the resulting value is '{element.value}'.")
+        return changed_values
+
+    @cached_property
+    def dependency_index(self) -> DependencyIndex:
+        """Reverse dependency index, built once per parse when first needed."""
+        return DependencyIndex(self.config)
+
+    @cached_property
+    def defining_file_index(self) -> DefiningFileIndex:
+        return DefiningFileIndex(self.config, self.k_config_root_directory)
+
+    def _affected_symbols(self, sym: kconfiglib.Symbol) -> list[kconfiglib.Symbol]:
+        """The symbol itself and all symbols that (transitively) depend on it."""
+        if sym is self.config.modules:
+            return list(self.config.unique_defined_syms)
+        return [self.config.syms[name] for name in self.dependency_index.affected(sym.name)]
+
+    def simulate_value(self, name: str, value: str) -> list[SymbolChange]:
+        """
+        Evaluates which symbols would change if the symbol had the given value, without changing the configuration.
+
+        :param value: value in kconfiglib format, e.g. 'n' or '0x10'
+        :return: the changed symbols, the symbol itself first
+        """
+        sym = self.config.syms.get(name)
+        if sym is None or sym.nodes == []:
+            raise UserNotificationException(f"Symbol '{name}' is not defined.")
+        affected_syms = self._affected_symbols(sym)
+        old_values = {affected_sym.name: self._optional_symbol_value(affected_sym) for affected_sym in affected_syms}
+        old_user_value = sym.user_value
+        choice_state = (sym.choice.user_value, sym.choice.user_selection) if sym.choice else None
+        try:
+            if not sym.set_value(value):
+                raise UserNotificationException(f"Invalid value '{value}' for symbol '{name}'.")
+            new_values = {affected_sym.name: self._optional_symbol_value(affected_sym) for affected_sym in affected_syms}
+        finally:
+            if old_user_value is None:
+                sym.unset_value()
+            else:
+                sym.set_value(old_user_value)
+            if sym.choice and choice_state:
+                sym.choice.user_value, sym.choice.user_selection = choice_state
+                sym.choice._rec_invalidate()
+        return [
+            SymbolChange(affected_sym.name, self._symbol_type(affected_sym), old_values[affected_sym.name], new_values[affected_sym.name])
+            for affected_sym in affected_syms
+            if old_values[affected_sym.name] != new_values[affected_sym.name]
+        ]
+
+    def _optional_symbol_value(self, sym: kconfiglib.Symbol) -> Any:
+        return self._symbol_value(sym)[1] if sym.config_string else None
+
     def find_element(self, name: str) -> EditableConfigElement | None:
         return self._elements_dict.get(name, None)
 
+    def get_changed_elements(self) -> list[EditableConfigElement]:
+        """Elements whose value was edited since the configuration was loaded or last saved."""
+        return [element for element in self.elements if not element.is_menu and element.has_been_changed]
+
+    @property
+    def config_prefix(self) -> str:
+        return self.config.config_prefix
+
     def _collect_parsed_files(self) -> list[Path]:
         """Collects all parsed files from the KConfig instance and returns them as a list of absolute paths."""
         parsed_files: list[Path] = []
@@ -7,16 +7,44 @@ from py_app_dev.core.exceptions import UserNotificationException
 from py_app_dev.core.logging import logger, setup_logger
 
 from kspl import __version__
+from kspl.affected import AffectedCommand
+from kspl.check import CheckCommand
+from kspl.cover import CoverCommand
+from kspl.diff import DiffCommand
 from kspl.edit import EditCommand
+from kspl.export import ExportCommand
+from kspl.fingerprint import FingerprintCommand
+from kspl.fixdep import FixdepCommand
 from kspl.generate import GenerateCommand
 from kspl.gui_cmd import GuiCommand
+from kspl.impact import ImpactCommand
+from kspl.serve import ServeHttpCommand
+from kspl.set_values import SetCommand
+from kspl.stats import StatsCommand
 
 
 def do_run() -> None:
     parser = ArgumentParser(prog="kspl", description="kconfig for SPL", exit_on_error=False)
     parser.add_argument("-v", "--version", action="version", version=f"%(prog)s {__version__}")
     builder = CommandLineHandlerBuilder(parser)
-    builder.add_commands([GuiCommand(), GenerateCommand(), EditCommand()])
+    builder.add_commands(
+        [
+            GuiCommand(),
+            GenerateCommand(),
+            EditCommand(),
+            FixdepCommand(),
+            ImpactCommand(),
+            ExportCommand(),
+            ServeHttpCommand(),
+            SetCommand(),
+            CheckCommand(),
+            FingerprintCommand(),
+            StatsCommand(),
+            CoverCommand(),
+            AffectedCommand(),
+            DiffCommand(),
+        ]
+    )
     handler = builder.create()
     handler.run(argv[1:])
 
@@ -0,0 +1,53 @@
+from collections import defaultdict
+
+from kspl.kconfig import EditableConfigElement
+
+
+class SymbolSearchIndex:
+    """
+    Trigram index over the names, prompts and help texts of the configuration elements.
+
+    It is built once per load. A search only verifies the elements of the shortest
+    posting list of the query trigrams, instead of scanning all the texts.
+    Queries shorter than a trigram are only matched against the names and prompts.
+    """
+
+    ngram_size = 3
+
+    def __init__(self, elements: list[EditableConfigElement]) -> None:
+        self.names = [element.name for element in elements]
+        self._lower_names = [name.lower() for name in self.names]
+        self._short_texts = [f"{element.name}\n{element.prompt or ''}".lower() for element in elements]
+        self._texts = [f"{short_text}\n{element.help or ''}".lower() for short_text, element in zip(self._short_texts, elements)]
+        postings: dict[str, list[int]] = defaultdict(list)
+        for index, text in enumerate(self._texts):
+            for ngram in self._ngrams(text):
+                postings[ngram].append(index)
+        self._postings = dict(postings)
+
+    def _ngrams(self, text: str) -> set[str]:
+        return {text[i : i + self.ngram_size] for i in range(len(text) - self.ngram_size + 1)}
+
+    def search(self, query: str) -> list[int]:
+        """
+        Returns the positions of the matching elements.
+
+        Elements whose name starts with the query come first, then the ones whose name contains it
+        and finally the ones where only the prompt or the help text matches. Within these groups the element order is kept.
+        """
+        query = query.strip().lower()
+        if not query:
+            return list(range(len(self.names)))
+        if len(query) < self.ngram_size:
+            matches = [index for index, text in enumerate(self._short_texts) if query in text]
+        else:
+            ngrams = self._ngrams(query)
+            candidates = min((self._postings.get(ngram, []) for ngram in ngrams), key=len)
+            matches = [index for index in candidates if query in self._texts[index]]
+        return sorted(matches, key=lambda index: self._rank(index, query))
+
+    def _rank(self, index: int, query: str) -> int:
+        name = self._lower_names[index]
+        if name.startswith(query):
+            return 0
+        return 1 if query in name else 2
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import threading
+from argparse import ArgumentParser, Namespace
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import unquote, urlsplit
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP, VariantConfigFinder
+from kspl.kconfig import ConfigElementType, EditableConfigElement, TriState
+
+#: modification times of the files a snapshot was created from
+FilesStamp = tuple[tuple[str, int], ...]
+
+
+def to_json_value(element: EditableConfigElement) -> Any:
+    """Bool values become JSON booleans, tristate values 'y', 'm' or 'n', all other values are kept."""
+    if element.type == ConfigElementType.BOOL:
+        return element.value == TriState.Y
+    if element.type == ConfigElementType.TRISTATE:
+        return str(element.value.name).lower()
+    return element.value
+
+
+@dataclass(frozen=True)
+class QuerySnapshot:
+    """
+    Immutable view of the SPL data answering the queries.
+
+    A new snapshot is created for every reload; readers keep using the snapshot they got.
+    The ETag is derived from the content, a reload without changes keeps it.
+    """
+
+    elements: tuple[dict[str, Any], ...]
+    #: values by variant name and element name
+    variant_values: dict[str, dict[str, Any]]
+    etag: str
+    files_stamp: FilesStamp = ()
+
+    @classmethod
+    def create(cls, kconfig_data: SPLKConfigData, files_stamp: FilesStamp = ()) -> "QuerySnapshot":
+        elements = tuple(
+            {"name": element.name, "type": element.type.name.lower(), "level": element.level, "prompt": element.prompt}
+            for element in kconfig_data.get_elements()
+            if not element.is_menu
+        )
+        variant_values = {
+            variant.name: {element.name: to_json_value(element) for element in variant.config.elements if not element.is_menu} for variant in kconfig_data.variant_configs
+        }
+        content = json.dumps([elements, variant_values], sort_keys=True)
+        return cls(elements, variant_values, f'"{hashlib.sha256(content.encode()).hexdigest()[:32]}"', files_stamp)
+
+    def variant_names(self) -> list[str]:
+        return list(self.variant_values)
+
+    def element_values(self, name: str) -> Optional[dict[str, Any]]:
+        """Values of the element in all variants, None if no variant knows the element."""
+        if not any(name in values for values in self.variant_values.values()):
+            return None
+        return {variant_name: values.get(name) for variant_name, values in self.variant_values.items()}
+
+
+class SnapshotStore:
+    """
+    Keeps the current snapshot and replaces it when the project files change.
+
+    The files are polled in a background thread. The new snapshot is created before it replaces the
+    current one (a single reference assignment), such that the readers never wait for a reload.
+    """
+
+    def __init__(self, project_dir: Path, poll_interval: float = 1.0, ignore_patterns: Sequence[str] = (), max_depth: Optional[int] = None) -> None:
+        self.project_dir = project_dir.absolute()
+        self.poll_interval = poll_interval
+        self.ignore_patterns = ignore_patterns
+        self.max_depth = max_depth
+        self.logger = logger.bind()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._variant_finder = VariantConfigFinder(self.project_dir / "variants", ignore_patterns=ignore_patterns, max_depth=max_depth)
+        self.snapshot = self._create_snapshot()
+
+    def _create_snapshot(self) -> QuerySnapshot:
+        kconfig_data = SPLKConfigData(self.project_dir, self.ignore_patterns, self.max_depth)
+        parsed_files = {file.absolute() for variant in kconfig_data.variant_configs for file in variant.get_parsed_files()}
+        return QuerySnapshot.create(kconfig_data, self._files_stamp(parsed_files))
+
+    def _files_stamp(self, parsed_files: set[Path]) -> FilesStamp:
+        # New variants are detected because the config files are searched again
+        files = parsed_files | set(self._variant_finder.find())
+        stamp = []
+        for file in sorted(files):
+            try:
+                stamp.append((file.as_posix(), file.stat().st_mtime_ns))
+            except OSError:
+                stamp.append((file.as_posix(), -1))
+        return tuple(stamp)
+
+    def reload_if_changed(self) -> bool:
+        """Creates a new snapshot if any of the project files changed. Returns True if the snapshot was replaced."""
+        current = self.snapshot
+        if self._files_stamp({Path(file) for file, _ in current.files_stamp}) == current.files_stamp:
+            return False
+        try:
+            snapshot = self._create_snapshot()
+        except Exception as e:
+            # Keep serving the last valid data, e.g. while a file is being edited
+            self.logger.warning(f"Failed to reload {self.project_dir}: {e}")
+            return False
+        self.snapshot = snapshot
+        self.logger.info(f"Reloaded {self.project_dir}, ETag {snapshot.etag}")
+        return True
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll, name="kspl-snapshot-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _poll(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            self.reload_if_changed()
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers the read-only JSON queries.
+
+    - ``GET /variants``: variant names
+    - ``GET /variants/<name>``: values of all elements in the variant
+    - ``GET /elements``: elements of the model
+    - ``GET /elements/<name>``: values of the element in all variants
+    """
+
+    store: SnapshotStore
+
+    def do_GET(self) -> None:
+        snapshot = self.store.snapshot
+        parts = [unquote(part) for part in urlsplit(self.path).path.split("/") if part]
+        body = self._query(snapshot, parts)
+        if body is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Not found: {self.path}"})
+        elif snapshot.etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", snapshot.etag)
+            self.end_headers()
+        else:
+            self._send_json(HTTPStatus.OK, body, snapshot.etag)
+
+    @staticmethod
+    def _query(snapshot: QuerySnapshot, parts: list[str]) -> Any:
+        if parts == ["variants"]:
+            return snapshot.variant_names()
+        if parts == ["elements"]:
+            return list(snapshot.elements)
+        if len(parts) == 2 and parts[0] == "variants":
+            return snapshot.variant_values.get(parts[1])
+        if len(parts) == 2 and parts[0] == "elements":
+            return snapshot.element_values(parts[1])
+        return None
+
+    def _send_json(self, status: HTTPStatus, body: Any, etag: Optional[str] = None) -> None:
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def create_server(store: SnapshotStore, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    handler = type("BoundQueryRequestHandler", (QueryRequestHandler,), {"store": store})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+@dataclass
+class ServeHttpCommandConfig(DataClassDictMixin):
+    project_dir: Path = field(
+        default=Path(".").absolute(),
+        metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
+    )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+    host: str = field(default="127.0.0.1", metadata={"help": "Address to listen on. Default: 127.0.0.1"})
+    port: int = field(default=8080, metadata={"help": "Port to listen on. Default: 8080"})
+    poll_interval: float = field(default=1.0, metadata={"help": "Seconds between the checks for changed files. Default: 1.0"})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "ServeHttpCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class ServeHttpCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("serve-http", "Serve the variant values as read-only JSON over HTTP.")
+        self.logger = logger.bind()
+
+    @time_it("Serve")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = ServeHttpCommandConfig.from_namespace(args)
+        store = SnapshotStore(cmd_config.project_dir, cmd_config.poll_interval, cmd_config.ignore_patterns, cmd_config.max_depth)
+        try:
+            server = create_server(store, cmd_config.host, cmd_config.port)
+        except OSError as e:
+            raise UserNotificationException(f"Could not listen on {cmd_config.host}:{cmd_config.port}: {e}") from e
+        store.start()
+        self.logger.info(f"Serving {cmd_config.project_dir} on http://{cmd_config.host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            store.stop()
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, ServeHttpCommandConfig)
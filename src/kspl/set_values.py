@@ -0,0 +1,191 @@
+import fnmatch
+from argparse import ArgumentParser, Namespace
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import kconfiglib
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command
+from py_app_dev.core.exceptions import UserNotificationException
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_file import update_config_content, write_config_content
+from kspl.config_slurper import SPLKConfigData
+from kspl.discovery import add_variant_search_arguments
+from kspl.variant_workers import load_variant, map_variants
+
+
+def parse_assignment(assignment: str) -> tuple[str, str]:
+    """Splits a ``SYMBOL=VALUE`` assignment. Quotes around the value are removed."""
+    name, separator, value = assignment.partition("=")
+    if not separator or not name.strip():
+        raise UserNotificationException(f"Invalid assignment '{assignment}', expected SYMBOL=VALUE.")
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = kconfiglib.unescape(value[1:-1])
+    return name.strip(), value
+
+
+def user_config_line(sym: kconfiglib.Symbol, config_prefix: str) -> str:
+    """Configuration file line for the user value of the symbol, the same way kconfiglib writes it."""
+    value = sym.user_value
+    if sym.orig_type in (kconfiglib.BOOL, kconfiglib.TRISTATE):
+        return f"{config_prefix}{sym.name}={kconfiglib.TRI_TO_STR[value]}" if value else f"# {config_prefix}{sym.name} is not set"
+    if sym.orig_type == kconfiglib.STRING:
+        return f'{config_prefix}{sym.name}="{kconfiglib.escape(value)}"'
+    return f"{config_prefix}{sym.name}={value}"
+
+
+@dataclass
+class VariantSetResult:
+    variant: str
+    #: False if the variant does not match the conditions
+    selected: bool = True
+    #: True if the configuration file content changed
+    changed: bool = False
+    #: assignments with an invalid symbol or value, they are not written
+    rejected: list[str] = field(default_factory=list)
+    #: symbols whose value differs from the assigned one, e.g. because of unmet dependencies or a 'select', they are not written
+    overridden: list[str] = field(default_factory=list)
+
+
+@dataclass
+class BulkSetJob:
+    variant: str
+    config_file: Path
+    assignments: list[tuple[str, str]]
+    conditions: list[tuple[str, str]]
+    dry_run: bool = False
+
+
+def apply_assignments(job: BulkSetJob) -> VariantSetResult:
+    """Applies the assignments to one variant, in a worker of map_variants()."""
+    result = VariantSetResult(job.variant)
+    config = load_variant(job.config_file)
+    if not all(name in config.syms and config.syms[name].str_value == value for name, value in job.conditions):
+        result.selected = False
+        return result
+    lines: dict[str, str] = {}
+    assigned: list[tuple[kconfiglib.Symbol, str]] = []
+    for name, value in job.assignments:
+        sym = config.syms.get(name)
+        if sym is None or not sym.nodes:
+            result.rejected.append(f"{name}={value} (unknown symbol)")
+        elif not sym.set_value(value):
+            result.rejected.append(f"{name}={value} (invalid value for {kconfiglib.TYPE_TO_STR[sym.orig_type]})")
+        else:
+            assigned.append((sym, value))
+    for sym, value in assigned:
+        if sym.str_value != value:
+            # Writing it would only leave a line without effect in the file
+            result.overridden.append(f"{sym.name}={value} (value is '{sym.str_value}')")
+        else:
+            lines[sym.name] = user_config_line(sym, config.config_prefix)
+    if lines:
+        with job.config_file.open(newline="") as file:
+            content = file.read()
+        new_content = update_config_content(content, lines, config.config_prefix)
+        result.changed = new_content != content
+        if result.changed and not job.dry_run:
+            write_config_content(job.config_file, new_content)
+    return result
+
+
+def bulk_set(
+    project_dir: Path,
+    assignments: list[str],
+    variant_patterns: Optional[list[str]] = None,
+    conditions: Optional[list[str]] = None,
+    jobs: Optional[int] = None,
+    dry_run: bool = False,
+    ignore_patterns: Sequence[str] = (),
+    max_depth: Optional[int] = None,
+) -> list[VariantSetResult]:
+    """
+    Applies the assignments to all variants matching the name patterns and the conditions.
+
+    The model is parsed once per worker and the variants are evaluated in parallel worker processes.
+    Only the configuration files whose content changes are written. Assignments which kconfiglib overrides
+    (e.g. unmet dependencies) are reported and not written.
+
+    :param variant_patterns: fnmatch patterns for the variant names, all variants if empty
+    :param conditions: SYMBOL=VALUE conditions on the current values, all must be fulfilled
+    """
+    project_dir = project_dir.absolute()
+    kconfig_model_file = project_dir / "KConfig"
+    if not kconfig_model_file.is_file():
+        raise UserNotificationException(f"File {kconfig_model_file} does not exist.")
+    parsed_assignments = [parse_assignment(assignment) for assignment in assignments]
+    parsed_conditions = [parse_assignment(condition) for condition in conditions or []]
+    set_jobs = [
+        BulkSetJob(name, config_file, parsed_assignments, parsed_conditions, dry_run)
+        for name, config_file in SPLKConfigData.find_variants(project_dir, ignore_patterns, max_depth).items()
+        if not variant_patterns or any(fnmatch.fnmatchcase(name, pattern) for pattern in variant_patterns)
+    ]
+    return map_variants(kconfig_model_file, apply_assignments, set_jobs, jobs)
+
+
+@dataclass
+class SetCommandConfig(DataClassDictMixin):
+    assignments: list[str]
+    project_dir: Path = field(default=Path(".").absolute())
+    variants: list[str] = field(default_factory=list)
+    where: list[str] = field(default_factory=list)
+    jobs: Optional[int] = None
+    dry_run: bool = False
+    ignore_patterns: list[str] = field(default_factory=list)
+    max_depth: Optional[int] = None
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "SetCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class SetCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("set", "Assign symbol values in many variant configuration files at once.")
+        self.logger = logger.bind()
+
+    @time_it("Set")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = SetCommandConfig.from_namespace(args)
+        results = bulk_set(
+            cmd_config.project_dir,
+            cmd_config.assignments,
+            cmd_config.variants,
+            cmd_config.where,
+            cmd_config.jobs,
+            cmd_config.dry_run,
+            cmd_config.ignore_patterns,
+            cmd_config.max_depth,
+        )
+        selected = [result for result in results if result.selected]
+        changed = [result for result in selected if result.changed]
+        action = "Would update" if cmd_config.dry_run else "Updated"
+        print(f"{action} {len(changed)} of {len(selected)} selected variants ({len(results) - len(selected)} not matching the conditions)")
+        for result in selected:
+            if result.changed:
+                print(f"  {result.variant}: {'would be changed' if cmd_config.dry_run else 'changed'}")
+            for rejected in result.rejected:
+                print(f"  {result.variant}: rejected {rejected}")
+            for overridden in result.overridden:
+                print(f"  {result.variant}: overridden {overridden}")
+        return 0
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        # The assignments are positional, which the dataclass based registration does not support
+        parser.add_argument(
+            "assignments",
+            nargs="+",
+            help="Assignments in the form SYMBOL=VALUE (without the CONFIG_ prefix, kconfig format e.g. y, n, 200, 0x10). "
+            "Assignments which would be overridden, e.g. because of unmet dependencies, are reported and not written.",
+        )
+        parser.add_argument("--project-dir", type=Path, default=Path(".").absolute(), help="Project root directory. Defaults to the current directory if not specified.")
+        parser.add_argument("--variants", nargs="+", default=[], help="Variant name patterns (e.g. 'Sleep/*'). Default: all variants.")
+        parser.add_argument("--where", nargs="+", default=[], help="Only change the variants where all these SYMBOL=VALUE conditions hold (e.g. BAR=y).")
+        parser.add_argument("--jobs", type=int, default=None, help="Number of parallel worker processes. Default: number of CPUs.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would change, do not write any file.")
+        add_variant_search_arguments(parser)
@@ -0,0 +1,152 @@
+"""
+Compact binary snapshot of the variant configuration.
+
+The snapshot is written by ``kspl generate`` (see ``SnapshotWriter``) and read back with ``Snapshot``.
+This module intentionally depends only on the standard library,
+such that downstream tools can read the configuration without importing kconfiglib.
+
+Layout (all numbers little endian):
+
+- header: magic, format version, number of entries, offset and size of the string table
+- entries (in configuration order): name offset and length, value type, 8 bytes value
+- index: entry numbers sorted by name, used for the binary search by name
+- string table: UTF-8 encoded names and string values
+"""
+
+import mmap
+import struct
+from collections.abc import Iterator, Mapping
+from enum import IntEnum
+from pathlib import Path
+from types import TracebackType
+from typing import Optional, Union
+
+MAGIC = b"KSPLSNAP"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIII")
+#: number of bytes for the value of an entry
+VALUE_SIZE = 8
+#: name offset, name length, value type, raw value
+ENTRY = struct.Struct(f"<IIB3x{VALUE_SIZE}s")
+INDEX_ITEM = struct.Struct("<I")
+#: offset and length of a string value in the string table
+STRING_REF = struct.Struct("<II")
+#: bool and tristate values are stored as numbers
+TRISTATE_VALUES = ("n", "m", "y")
+
+SnapshotValue = Union[bool, int, str]
+
+
+class SnapshotValueType(IntEnum):
+    BOOL = 1
+    TRISTATE = 2
+    STRING = 3
+    INT = 4
+    HEX = 5
+
+
+class Snapshot(Mapping[str, SnapshotValue]):
+    """
+    Read-only, lazy view of a configuration snapshot.
+
+    Values are decoded only when accessed:
+
+    - bool: python bool
+    - tristate: 'y', 'm' or 'n'
+    - string: str
+    - int and hex: int
+    """
+
+    def __init__(self, data: Union[bytes, mmap.mmap]) -> None:
+        self._data = data
+        magic, version, _, self._count, self._strings_offset, _ = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a kspl configuration snapshot.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}, expected {VERSION}.")
+        self._entries_offset = HEADER.size
+        self._index_offset = self._entries_offset + self._count * ENTRY.size
+
+    @classmethod
+    def open(cls, path: Path) -> "Snapshot":
+        """Memory maps the snapshot file. Use it as a context manager or call close() to release the file."""
+        with path.open("rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the names in configuration order."""
+        for position in range(self._count):
+            yield self._name(position)
+
+    def __getitem__(self, name: str) -> SnapshotValue:
+        return self._value(self._find(name))
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._find_position(name) is not None
+
+    def type_of(self, name: str) -> SnapshotValueType:
+        return SnapshotValueType(self._entry(self._find(name))[2])
+
+    def _find(self, name: str) -> int:
+        position = self._find_position(name)
+        if position is None:
+            raise KeyError(name)
+        return position
+
+    def _find_position(self, name: str) -> Optional[int]:
+        """Binary search over the sorted index. Returns the entry position or None."""
+        key = name.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            position = INDEX_ITEM.unpack_from(self._data, self._index_offset + middle * INDEX_ITEM.size)[0]
+            candidate = self._name_bytes(position)
+            if candidate == key:
+                return position
+            if candidate < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _entry(self, position: int) -> tuple[int, int, int, bytes]:
+        return ENTRY.unpack_from(self._data, self._entries_offset + position * ENTRY.size)
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings_offset + offset
+        return bytes(self._data[start : start + length])
+
+    def _name_bytes(self, position: int) -> bytes:
+        name_offset, name_length, _, _ = self._entry(position)
+        return self._string(name_offset, name_length)
+
+    def _name(self, position: int) -> str:
+        return self._name_bytes(position).decode("utf-8")
+
+    def _value(self, position: int) -> SnapshotValue:
+        _, _, value_type, raw_value = self._entry(position)
+        if value_type == SnapshotValueType.BOOL:
+            return raw_value[0] == TRISTATE_VALUES.index("y")
+        if value_type == SnapshotValueType.TRISTATE:
+            return TRISTATE_VALUES[raw_value[0]]
+        if value_type == SnapshotValueType.STRING:
+            return self._string(*STRING_REF.unpack_from(raw_value)).decode("utf-8")
+        return int.from_bytes(raw_value, "little", signed=value_type == SnapshotValueType.INT)
@@ -0,0 +1,162 @@
+import json
+from argparse import ArgumentParser, Namespace
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from mashumaro import DataClassDictMixin
+from py_app_dev.core.cmd_line import Command, register_arguments_for_config_dataclass
+from py_app_dev.core.logging import logger, time_it
+
+from kspl.config_slurper import SPLKConfigData, VariantData
+from kspl.discovery import IGNORE_PATTERNS_HELP, MAX_DEPTH_HELP
+from kspl.kconfig import ConfigElementType, KConfig, TriState, to_kconfig_string
+
+
+@dataclass
+class SymbolStatistics:
+    name: str
+    type: ConfigElementType
+    #: bit i is set if the symbol is enabled ('y' or 'm') in variant i, only for bool and tristate symbols
+    enabled: int = 0
+    #: number of variants per value (kconfig format), only for int, hex and string symbols
+    histogram: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def is_feature(self) -> bool:
+        return self.type in (ConfigElementType.BOOL, ConfigElementType.TRISTATE)
+
+    @property
+    def enabled_count(self) -> int:
+        return self.enabled.bit_count()
+
+
+class FeatureStatistics:
+    """
+    Usage of the symbols over all variants.
+
+    Every feature (bool or tristate symbol) has a bitset with one bit per variant, such that the counts and the
+    always/never enabled checks are single integer operations. Variants sharing one evaluated configuration
+    (see SharedVariantData) are counted together.
+    """
+
+    def __init__(self, variant_names: list[str], symbols: dict[str, SymbolStatistics], variant_features: Optional[list[int]] = None) -> None:
+        self.variant_names = variant_names
+        self.symbols = symbols
+        #: bitset with the bits of all variants
+        self.all_variants = (1 << len(variant_names)) - 1
+        #: the other way around, per variant: bit k is set if the k-th feature (see features()) is enabled
+        self.variant_features = variant_features if variant_features is not None else self._transpose()
+
+    def _transpose(self) -> list[int]:
+        variant_features = [0] * len(self.variant_names)
+        for position, symbol in enumerate(self.features()):
+            for index in range(len(self.variant_names)):
+                if symbol.enabled >> index & 1:
+                    variant_features[index] |= 1 << position
+        return variant_features
+
+    @classmethod
+    def from_variants(cls, variants: list[VariantData]) -> "FeatureStatistics":
+        """Collects the statistics of the variants. Configurations shared by several variants are read once."""
+        #: evaluated configurations with the bits of the variants using them
+        configs: dict[int, tuple[KConfig, int]] = {}
+        for index, variant in enumerate(variants):
+            config, variant_bits = configs.get(id(variant.config), (variant.config, 0))
+            configs[id(variant.config)] = (config, variant_bits | 1 << index)
+        symbols: dict[str, SymbolStatistics] = {}
+        for config, variant_bits in configs.values():
+            # Symbols with unmet dependencies have no value, so the configurations can have different elements.
+            # Missing features count as not enabled.
+            collected: set[str] = set()
+            for element in config.elements:
+                if element.is_menu or element.name in collected:
+                    continue
+                collected.add(element.name)
+                symbol = symbols.setdefault(element.name, SymbolStatistics(element.name, element.type))
+                if symbol.is_feature:
+                    if element.value != TriState.N:
+                        symbol.enabled |= variant_bits
+                else:
+                    symbol.histogram[to_kconfig_string(symbol.type, element.value)] += variant_bits.bit_count()
+        return cls([variant.name for variant in variants], symbols)
+
+    def features(self) -> list[SymbolStatistics]:
+        return [symbol for symbol in self.symbols.values() if symbol.is_feature]
+
+    def values(self) -> list[SymbolStatistics]:
+        return [symbol for symbol in self.symbols.values() if not symbol.is_feature]
+
+    def never_enabled(self) -> list[str]:
+        """Dead features, not enabled in any variant."""
+        return [symbol.name for symbol in self.features() if not symbol.enabled]
+
+    def always_enabled(self) -> list[str]:
+        return [symbol.name for symbol in self.features() if symbol.enabled == self.all_variants]
+
+    def enabled_variants(self, name: str) -> list[str]:
+        enabled = self.symbols[name].enabled
+        return [variant_name for index, variant_name in enumerate(self.variant_names) if enabled >> index & 1]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "variants": self.variant_names,
+            "features": {symbol.name: symbol.enabled_count for symbol in self.features()},
+            "never_enabled": self.never_enabled(),
+            "always_enabled": self.always_enabled(),
+            "values": {symbol.name: dict(symbol.histogram.most_common()) for symbol in self.values()},
+        }
+
+
+@dataclass
+class StatsCommandConfig(DataClassDictMixin):
+    project_dir: Path = field(
+        default=Path(".").absolute(),
+        metadata={"help": "Project root directory. Defaults to the current directory if not specified."},
+    )
+    ignore_patterns: list[str] = field(default_factory=list, metadata={"help": IGNORE_PATTERNS_HELP})
+    max_depth: Optional[int] = field(default=None, metadata={"help": MAX_DEPTH_HELP})
+    output_file: Optional[Path] = field(default=None, metadata={"help": "JSON file to write the statistics to."})
+    max_values: int = field(default=5, metadata={"help": "Number of most common values to print per int, hex or string symbol. Default: 5"})
+
+    @classmethod
+    def from_namespace(cls, namespace: Namespace) -> "StatsCommandConfig":
+        return cls.from_dict(vars(namespace))
+
+
+class StatsCommand(Command):
+    def __init__(self) -> None:
+        super().__init__("stats", "Show in how many variants the features are enabled and which values the symbols have.")
+        self.logger = logger.bind()
+
+    @time_it("Stats")
+    def run(self, args: Namespace) -> int:
+        self.logger.info(f"Running {self.name} with args {args}")
+        cmd_config = StatsCommandConfig.from_namespace(args)
+        statistics = FeatureStatistics.from_variants(SPLKConfigData(cmd_config.project_dir, cmd_config.ignore_patterns, cmd_config.max_depth).variant_configs)
+        self.print_statistics(statistics, cmd_config.max_values)
+        if cmd_config.output_file:
+            cmd_config.output_file.parent.mkdir(parents=True, exist_ok=True)
+            cmd_config.output_file.write_text(json.dumps(statistics.to_dict(), indent=4))
+        return 0
+
+    @staticmethod
+    def print_statistics(statistics: FeatureStatistics, max_values: int) -> None:
+        variants_count = len(statistics.variant_names)
+        features = statistics.features()
+        print(f"Features enabled in {variants_count} variants:")
+        width = max((len(symbol.name) for symbol in statistics.symbols.values()), default=0)
+        for symbol in sorted(features, key=lambda symbol: (-symbol.enabled_count, symbol.name)):
+            print(f"  {symbol.name:<{width}}  {symbol.enabled_count}/{variants_count}")
+        print(f"Always enabled ({len(statistics.always_enabled())}): {', '.join(statistics.always_enabled())}")
+        print(f"Never enabled ({len(statistics.never_enabled())}): {', '.join(statistics.never_enabled())}")
+        print("Values:")
+        for symbol in statistics.values():
+            common_values = symbol.histogram.most_common(max_values)
+            more = len(symbol.histogram) - len(common_values)
+            text = ", ".join(f"{value} ({count})" for value, count in common_values) + (f", ... ({more} more)" if more > 0 else "")
+            print(f"  {symbol.name:<{width}}  {text}")
+
+    def _register_arguments(self, parser: ArgumentParser) -> None:
+        register_arguments_for_config_dataclass(parser, StatsCommandConfig)
@@ -0,0 +1,82 @@
+"""
+Evaluates many variants of one model in parallel worker processes.
+
+Every worker parses the model once and loads the variant configurations into it one after the other,
+instead of parsing the model again for every variant.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+import kconfiglib
+
+from kspl.kconfig import ConfigurationData, KConfig
+
+JobType = TypeVar("JobType")
+ResultType = TypeVar("ResultType")
+
+#: the model parsed once per worker process
+_worker_kconfig: Optional[KConfig] = None
+#: warnings of the model parsing, they are the same for all variants
+_model_warnings: list[str] = []
+
+
+def init_worker(kconfig_model_file: Path) -> None:
+    global _worker_kconfig, _model_warnings
+    _worker_kconfig = KConfig(kconfig_model_file)
+    # The warnings are collected and reported by the callers
+    _worker_kconfig.config.warn_to_stderr = False
+    _model_warnings = list(_worker_kconfig.config.warnings)
+
+
+def worker_kconfig() -> KConfig:
+    if _worker_kconfig is None:
+        raise RuntimeError("Worker not initialized.")
+    return _worker_kconfig
+
+
+def worker_config() -> kconfiglib.Kconfig:
+    return worker_kconfig().config
+
+
+def model_warnings() -> list[str]:
+    return list(_model_warnings)
+
+
+def load_variant(config_file: Path) -> kconfiglib.Kconfig:
+    """Loads the variant configuration into the model of the worker. Returns the model with only the warnings of this variant."""
+    config = worker_config()
+    config.warnings.clear()
+    # Replacing resets the values of the previous variant
+    config.load_config(str(config_file), replace=True)
+    return config
+
+
+def load_variant_data(config_file: Path) -> ConfigurationData:
+    """Loads the variant configuration into the model of the worker and returns the effective configuration (variables substituted)."""
+    kconfig = worker_kconfig()
+    kconfig.config.warnings.clear()
+    kconfig.load_user_config(config_file)
+    return kconfig.collect_config_data()
+
+
+def map_variants(
+    kconfig_model_file: Path, function: Callable[[JobType], ResultType], jobs: list[JobType], workers: Optional[int] = None, model_loaded: bool = False
+) -> list[ResultType]:
+    """
+    Calls the function for every job, in worker processes which parsed the model.
+
+    The function must be a module level function (it is pickled) and use load_variant() or worker_config().
+    With one worker (or one job) everything runs in the current process.
+
+    :param model_loaded: init_worker() was already called for the model in the current process, it is not parsed again when running in it
+    """
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        if jobs and not model_loaded:
+            init_worker(kconfig_model_file)
+        return [function(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(kconfig_model_file,)) as executor:
+        return list(executor.map(function, jobs))
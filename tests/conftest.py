@@ -0,0 +1,79 @@
+import subprocess
+import textwrap
+from pathlib import Path
+from typing import Optional, Protocol
+
+import pytest
+
+
+class CreateSPLProject(Protocol):
+    def __call__(self, model: str, variants: dict[str, str], project_dir: Optional[Path] = None) -> Path:
+        """Creates an SPL project from the KConfig model and the content of the variant configuration files by variant name."""
+        ...
+
+
+@pytest.fixture
+def create_spl_project(tmp_path: Path) -> CreateSPLProject:
+    def create(model: str, variants: dict[str, str], project_dir: Optional[Path] = None) -> Path:
+        project_dir = project_dir or tmp_path
+        project_dir.mkdir(parents=True, exist_ok=True)
+        (project_dir / "KConfig").write_text(textwrap.dedent(model))
+        for variant, content in variants.items():
+            config_file = project_dir / "variants" / variant / "config.txt"
+            config_file.parent.mkdir(parents=True)
+            # Written as is, the line endings are part of some tests
+            config_file.write_bytes(content.encode())
+        return project_dir
+
+    return create
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    """Project with two variants, the test modules with other symbols define their own."""
+    return create_spl_project(
+        """\
+        config FOO
+            bool "foo"
+        config LEVEL
+            int "level"
+            default 3
+        """,
+        {"A": "CONFIG_FOO=y\n", "B": "CONFIG_LEVEL=5\n"},
+    )
+
+
+def git(repo_dir: Path, *args: str) -> None:
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args], cwd=repo_dir, check=True, capture_output=True)  # noqa: S603, S607
+
+
+@pytest.fixture
+def spl_repo(tmp_path: Path, create_spl_project: CreateSPLProject) -> Path:
+    """Git repository with the project in the 'spl' directory, the model sources a file. Returns the repository directory."""
+    project_dir = create_spl_project(
+        """\
+        config BASE
+            bool "base"
+        source "features/Kconfig"
+        """,
+        {"A": "CONFIG_FOO=y\n", "B": "CONFIG_BASE=y\n", "C": "# CONFIG_FOO is not set\n"},
+        tmp_path / "spl",
+    )
+    (project_dir / "features").mkdir()
+    (project_dir / "features/Kconfig").write_text(
+        textwrap.dedent(
+            """\
+            config FOO
+                bool "foo"
+            config FOO_TIMEOUT
+                int "timeout"
+                depends on FOO
+                default 100
+            """
+        )
+    )
+    (tmp_path / "README.md").write_text("SPL\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "Initial")
+    return tmp_path
@@ -0,0 +1,59 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+
+from kspl.affected import AffectedCommand, find_affected_variants
+from kspl.git_revision import GitRevisionReader
+from kspl.kconfig import ConfigElementType, SymbolChange, TriState
+from tests.conftest import git
+
+
+def test_git_revision_reader(spl_repo: Path) -> None:
+    (spl_repo / "README.md").write_text("Changed\n")
+    with GitRevisionReader(spl_repo / "spl") as reader:
+        assert reader.read(spl_repo / "README.md") == b"SPL\n"
+        assert reader.read(spl_repo / "unknown.txt") is None
+        assert reader.read(spl_repo / "spl/KConfig") == (spl_repo / "spl/KConfig").read_bytes()
+        target_dir = spl_repo / "export"
+        assert reader.export_files([spl_repo / "README.md", spl_repo / "unknown.txt"], spl_repo, target_dir) == [spl_repo / "unknown.txt"]
+        assert (target_dir / "README.md").read_text() == "SPL\n"
+    with pytest.raises(UserNotificationException):
+        GitRevisionReader(spl_repo, "unknown-revision")
+
+
+def test_only_variants_with_changed_values_are_affected(spl_repo: Path) -> None:
+    features_file = spl_repo / "spl/features/Kconfig"
+    features_file.write_text(features_file.read_text().replace("default 100", "default 200"))
+    (spl_repo / "spl/variants/B/config.txt").write_text("# CONFIG_BASE is not set\n")
+    (spl_repo / "README.md").write_text("Changed\n")
+
+    report = find_affected_variants(spl_repo / "spl", [features_file, spl_repo / "spl/variants/B/config.txt", spl_repo / "README.md"], jobs=1)
+
+    # C has FOO disabled, FOO_TIMEOUT has no value there
+    assert [variant.name for variant in report.variants] == ["A", "B"]
+    assert report.variants[0].changes == [SymbolChange("FOO_TIMEOUT", ConfigElementType.INT, 100, 200)]
+    assert report.variants[1].reasons == [f"configuration file {spl_repo / 'spl/variants/B/config.txt'} changed"]
+    assert report.model_symbols == ["FOO", "FOO_TIMEOUT"]
+    assert report.ignored_files == [spl_repo / "README.md"]
+
+
+def test_changed_defaults_affect_variants_without_explicit_values(spl_repo: Path) -> None:
+    features_file = spl_repo / "spl/features/Kconfig"
+    features_file.write_text(features_file.read_text().replace('bool "foo"', 'bool "foo"\n    default y'))
+    git(spl_repo, "commit", "-q", "-am", "Enable FOO by default")
+
+    report = find_affected_variants(spl_repo / "spl", [features_file], base_revision="HEAD~1", jobs=2)
+
+    assert [variant.name for variant in report.variants] == ["B"]
+    assert report.variants[0].changes[0] == SymbolChange("FOO", ConfigElementType.BOOL, TriState.N, TriState.Y)
+
+
+def test_affected_command(spl_repo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    config_file = spl_repo / "spl/variants/C/config.txt"
+    output_file = spl_repo / "out/affected.txt"
+    AffectedCommand().run(Namespace(changed=[str(config_file)], project_dir=spl_repo / "spl", base_rev="HEAD", jobs=1, output_file=output_file))
+
+    assert capsys.readouterr().out == "C\n"
+    assert output_file.read_text() == "C\n"
@@ -0,0 +1,86 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+
+from kspl import variant_workers
+from kspl.check import CheckCommand, check_variants
+from tests.conftest import CreateSPLProject
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    return create_spl_project(
+        """\
+        config BAR
+            bool "bar"
+        config SEL
+            bool "sel"
+            select BAR
+        config FOO_TIMEOUT
+            int "timeout"
+            range 0 500
+            default 100
+        config DEP
+            bool "dep"
+        config NAME
+            string "name"
+            depends on DEP
+        """,
+        {
+            "Good": "CONFIG_BAR=y\nCONFIG_FOO_TIMEOUT=200\n",
+            "Bad": 'CONFIG_SEL=y\n# CONFIG_BAR is not set\nCONFIG_FOO_TIMEOUT=600\nCONFIG_NAME="x"\nCONFIG_UNKNOWN=y\n',
+            "Sub/Twice": "CONFIG_BAR=y\nCONFIG_BAR=y\n",
+        },
+    )
+
+
+def test_check_variants(spl_project: Path) -> None:
+    model_problems, results = check_variants(spl_project, jobs=1)
+    results_by_variant = {result.variant: result for result in results}
+
+    assert model_problems == []
+    assert results_by_variant["Good"].problems == []
+    bad = results_by_variant["Bad"]
+    assert bad.ignored_assignments == [
+        "BAR is assigned 'n' but has the value 'y' (selected by another symbol)",
+        "FOO_TIMEOUT is assigned '600' but has the value '100' (outside the active range)",
+        "NAME is assigned 'x' but has the value '' (unmet dependencies)",
+    ]
+    assert any("variants/Bad/config.txt:5" in warning and "UNKNOWN" in warning for warning in bad.warnings)
+    assert any(warning.startswith("warning: user value 600 on the int symbol FOO_TIMEOUT (defined at KConfig:") for warning in bad.warnings)
+    assert any("set more than once" in warning for warning in results_by_variant["Sub/Twice"].warnings)
+
+
+def test_check_variants_with_relative_project_dir(spl_project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(spl_project.parent)
+    init_calls = []
+    # The model parsed for the model warnings is reused when running in this process
+    monkeypatch.setattr(variant_workers, "init_worker", init_calls.append)
+
+    results = check_variants(Path(spl_project.name), jobs=1)[1]
+
+    assert len(results) == 3
+    assert init_calls == []
+
+
+def test_parallel_workers_reset_the_previous_variant(spl_project: Path) -> None:
+    results = {result.variant: result for result in check_variants(spl_project, jobs=2)[1]}
+    assert results["Good"].problems == []
+    assert len(results["Bad"].ignored_assignments) == 3
+
+
+def test_check_command_fails_for_problems(spl_project: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(UserNotificationException):
+        CheckCommand().run(Namespace(project_dir=spl_project, jobs=1))
+    output = capsys.readouterr().out
+    assert "Checked 3 variants, 2 with problems." in output
+    assert "Bad:\n  BAR is assigned 'n'" in output
+    assert "Good:" not in output
+
+
+def test_check_command_passes(spl_project: Path) -> None:
+    for variant in ["Bad", "Sub/Twice"]:
+        (spl_project / "variants" / variant / "config.txt").write_text("CONFIG_BAR=y\n")
+    assert CheckCommand().run(Namespace(project_dir=spl_project, jobs=1)) == 0
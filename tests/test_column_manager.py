@@ -206,3 +206,37 @@ def test_update_visible_columns_empty_vars() -> None:
 
     assert column_manager.visible_columns == []
     mock_tree.__setitem__.assert_called_with("displaycolumns", [])
+
+
+def test_only_a_window_of_the_columns_is_rendered() -> None:
+    mock_tree = create_mock_tree()
+    column_manager = ColumnManager(mock_tree)
+    column_manager.window_size = 2
+    variants = [VariantViewData(f"variant{i}", {}) for i in range(5)]
+
+    column_manager.update_columns(variants)
+
+    assert column_manager.visible_columns == [variant.name for variant in variants]
+    assert column_manager.rendered_columns == ["variant0", "variant1"]
+    mock_tree.__setitem__.assert_called_with("displaycolumns", ["variant0", "variant1"])
+
+    assert column_manager.scroll_window(10) is True
+    assert column_manager.rendered_columns == ["variant3", "variant4"]
+    assert column_manager.scroll_window(3) is False
+    mock_tree.identify_column.return_value = "#1"
+    assert column_manager.get_column_from_click_position(100) == "variant3"
+
+
+def test_selection_of_a_column_outside_the_window() -> None:
+    mock_tree = create_mock_tree()
+    column_manager = ColumnManager(mock_tree)
+    column_manager.window_size = 2
+    column_manager.update_columns([VariantViewData(f"variant{i}", {}) for i in range(4)])
+    mock_tree.heading.reset_mock()
+
+    assert column_manager.set_selected_column("variant3") is True
+    assert column_manager.selected_column_id == "variant3"
+    mock_tree.heading.assert_not_called()
+
+    column_manager.scroll_window(2)
+    mock_tree.heading.assert_called_with("variant3", text="✅variant3")
@@ -0,0 +1,112 @@
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from kspl.config_file import ConfigFileUpdate, ConfigFileWriter, config_assignments_digest, update_config_content, update_config_file, write_config_content
+from kspl.config_slurper import SPLKConfigData
+from kspl.kconfig import TriState
+
+
+def test_config_assignments_digest_ignores_comments_and_order() -> None:
+    digest = config_assignments_digest("# Variant A\nCONFIG_FOO=y\n# CONFIG_BAR is not set\nCONFIG_LEVEL=3\n")
+
+    assert config_assignments_digest("CONFIG_LEVEL=3   \r\n\r\n# CONFIG_BAR is not set\r\nCONFIG_FOO=y\r\n") == digest
+    assert config_assignments_digest("CONFIG_FOO=n\nCONFIG_LEVEL=3\nCONFIG_FOO=y\n# CONFIG_BAR is not set\n") == digest, "the last assignment wins"
+    assert config_assignments_digest("CONFIG_FOO=y\nCONFIG_BAR=n\nCONFIG_LEVEL=3\n") != digest
+    # The last assigned symbol of a choice is selected
+    assert config_assignments_digest("CONFIG_A=y\nCONFIG_B=y\n", ordered_names={"A", "B"}) != config_assignments_digest("CONFIG_B=y\nCONFIG_A=y\n", ordered_names={"A", "B"})
+
+
+def test_update_config_content_only_touches_assigned_lines() -> None:
+    content = '# Variant A\r\nCONFIG_FOO=y\r\n# CONFIG_BAR is not set\r\nCONFIG_NAME="x"\r\n'
+    assert update_config_content(content, {"BAR": "CONFIG_BAR=y", "NEW": "CONFIG_NEW=0x10"}) == (
+        '# Variant A\r\nCONFIG_FOO=y\r\nCONFIG_BAR=y\r\nCONFIG_NAME="x"\r\nCONFIG_NEW=0x10\r\n'
+    )
+
+
+def test_update_config_content_removes_duplicate_assignments() -> None:
+    content = "CONFIG_FOO=y\nCONFIG_FOO=n\nCONFIG_BAR=1"
+    assert update_config_content(content, {"FOO": "# CONFIG_FOO is not set", "BAZ": "CONFIG_BAZ=2"}) == "# CONFIG_FOO is not set\nCONFIG_BAR=1\nCONFIG_BAZ=2\n"
+
+
+def test_update_config_file_skips_unchanged_content(tmp_path: Path) -> None:
+    config_file = tmp_path / "config.txt"
+    config_file.write_text("CONFIG_FOO=y\n")
+    assert not update_config_file(config_file, {"FOO": "CONFIG_FOO=y"})
+    assert update_config_file(config_file, {"FOO": "# CONFIG_FOO is not set"})
+    assert config_file.read_text() == "# CONFIG_FOO is not set\n"
+
+
+def test_write_config_content_keeps_the_file_on_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    config_file = tmp_path / "config.txt"
+    config_file.write_text("CONFIG_FOO=y\n")
+    config_file.chmod(0o640)
+    write_config_content(config_file, "CONFIG_FOO=n\r\n")
+    assert config_file.read_bytes() == b"CONFIG_FOO=n\r\n"
+    assert config_file.stat().st_mode & 0o777 == 0o640
+
+    def fail(*_: object) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.replace", fail)
+    with pytest.raises(OSError):
+        write_config_content(config_file, "CONFIG_FOO=y\n")
+    assert config_file.read_bytes() == b"CONFIG_FOO=n\r\n"
+    assert [file.name for file in tmp_path.iterdir()] == ["config.txt"]
+
+
+def test_config_file_writer_merges_updates_per_file(tmp_path: Path) -> None:
+    config_file = tmp_path / "config.txt"
+    config_file.write_text("CONFIG_FOO=y\nCONFIG_BAR=1\n")
+    writer = ConfigFileWriter()
+    writer.submit(ConfigFileUpdate(config_file, {"FOO": "# CONFIG_FOO is not set"}))
+    writer.submit(ConfigFileUpdate(config_file, {"BAR": "CONFIG_BAR=2"}))
+    writer.flush()
+    assert config_file.read_text() == "# CONFIG_FOO is not set\nCONFIG_BAR=2\n"
+
+
+def test_variant_config_file_update_collects_edited_elements(tmp_path: Path) -> None:
+    (tmp_path / "KConfig").write_text(
+        textwrap.dedent(
+            """\
+            config FOO
+                bool "foo"
+            config SIZE
+                hex "size"
+                default 0x10
+            config NAME
+                string "name"
+            """
+        )
+    )
+    config_file = tmp_path / "variants/A/config.txt"
+    config_file.parent.mkdir(parents=True)
+    config_file.write_text("# my variant\nCONFIG_FOO=y\n")
+    variant = SPLKConfigData(tmp_path).find_variant_config("A")
+    assert variant is not None
+    assert variant.create_config_file_update() is None
+
+    variant.config.find_element("FOO").value = TriState.N
+    variant.config.find_element("SIZE").value = 0x20
+    variant.config.find_element("NAME").value = 'say "hi"'
+    update = variant.create_config_file_update()
+
+    assert update == ConfigFileUpdate(
+        config_file,
+        {"FOO": "# CONFIG_FOO is not set", "SIZE": "CONFIG_SIZE=0x20", "NAME": 'CONFIG_NAME="say \\"hi\\""'},
+    )
+    assert [element.name for element in variant.config.get_changed_elements()] == ["FOO", "SIZE", "NAME"], "not saved before the update is written"
+
+    writer = ConfigFileWriter()
+    writer.submit(update)
+    writer.flush()
+    assert variant.config.get_changed_elements() == [], "the saved elements are no longer changed"
+
+
+def test_config_file_writer_keeps_elements_changed_on_errors(tmp_path: Path) -> None:
+    saved = []
+    writer = ConfigFileWriter()
+    writer.submit(ConfigFileUpdate(tmp_path / "missing/config.txt", {"FOO": "CONFIG_FOO=y"}, on_saved=lambda: saved.append(True)))
+    writer.flush()
+    assert saved == []
@@ -0,0 +1,140 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+
+from kspl.config_slurper import KConfigData, SharedVariantData, SPLKConfigData
+from kspl.kconfig import TriState
+from tests.conftest import CreateSPLProject
+
+
+def test_aload_returns_the_same_data(spl_project: Path) -> None:
+    kconfig_data = asyncio.run(SPLKConfigData.aload(spl_project))
+
+    assert isinstance(kconfig_data, KConfigData)
+    expected = SPLKConfigData(spl_project)
+    assert sorted(variant.name for variant in kconfig_data.get_variants()) == ["A", "B"]
+    assert sorted(kconfig_data.get_variants(), key=lambda variant: variant.name) == sorted(expected.get_variants(), key=lambda variant: variant.name)
+    assert [element.name for element in kconfig_data.get_elements()] == [element.name for element in expected.get_elements()]
+
+
+def test_arefresh(spl_project: Path) -> None:
+    kconfig_data = SPLKConfigData(spl_project)
+    config_file = spl_project / "variants" / "C" / "config.txt"
+    config_file.parent.mkdir(parents=True)
+    config_file.write_text("CONFIG_LEVEL=7\n")
+
+    asyncio.run(kconfig_data.arefresh())
+
+    variant = kconfig_data.find_variant_config("C")
+    assert variant is not None
+    assert variant.find_element("LEVEL").value == 7  # type: ignore[union-attr]
+
+
+def test_aload_without_model(tmp_path: Path) -> None:
+    with pytest.raises(UserNotificationException):
+        asyncio.run(SPLKConfigData.aload(tmp_path))
+
+
+def test_cancelled_arefresh_keeps_the_data(spl_project: Path) -> None:
+    kconfig_data = SPLKConfigData(spl_project)
+    variant_configs = kconfig_data.variant_configs
+
+    async def cancel_refresh() -> None:
+        task = asyncio.create_task(kconfig_data.arefresh())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_refresh())
+    assert kconfig_data.variant_configs is variant_configs
+
+
+def test_lazy_variants_are_evaluated_when_needed(spl_project: Path) -> None:
+    kconfig_data = SPLKConfigData(spl_project, lazy=True)
+
+    assert [variant.is_loaded for variant in kconfig_data.variant_configs] == [False, False]
+    variants = kconfig_data.get_variants()
+    assert [variant.name for variant in variants] == ["A", "B"]
+    assert not any(variant.is_loaded for variant in kconfig_data.variant_configs)
+
+    # Displaying the values of a variant evaluates only this variant
+    assert variants[1].config_dict["LEVEL"] == 5
+    assert [variant.is_loaded for variant in kconfig_data.variant_configs] == [False, True]
+
+    variant = kconfig_data.find_variant_config("A")
+    assert variant is not None
+    assert variant.config_file == spl_project / "variants" / "A" / "config.txt"
+    assert not variant.is_loaded
+    assert variant.find_element("LEVEL").value == 3  # type: ignore[union-attr]
+    assert variant.is_loaded
+    assert kconfig_data.get_variants() == SPLKConfigData(spl_project).get_variants()
+
+
+def test_lazy_aload(spl_project: Path) -> None:
+    kconfig_data = asyncio.run(SPLKConfigData.aload(spl_project, lazy=True))
+    assert [variant.is_loaded for variant in kconfig_data.variant_configs] == [False, False]
+    assert [element.name for element in kconfig_data.get_elements()] == ["FOO", "LEVEL"]
+
+
+def test_identical_configs_are_evaluated_once(spl_project: Path) -> None:
+    for variant, content in {"C": "# Clone of A\n\nCONFIG_FOO=y\n", "D": "CONFIG_LEVEL=3\nCONFIG_FOO=y\n"}.items():
+        (spl_project / "variants" / variant).mkdir()
+        (spl_project / "variants" / variant / "config.txt").write_text(content)
+
+    for kconfig_data in [SPLKConfigData(spl_project), asyncio.run(SPLKConfigData.aload(spl_project))]:
+        variants = {variant.name: variant for variant in kconfig_data.variant_configs}
+        assert list(variants) == ["A", "B", "C", "D"]
+        assert isinstance(variants["A"], SharedVariantData) and isinstance(variants["C"], SharedVariantData)
+        assert variants["A"].config is variants["C"].config
+        assert not isinstance(variants["B"], SharedVariantData)
+        assert variants["C"].config_file == spl_project / "variants/C/config.txt"
+        assert variants["C"].get_parsed_files() == [spl_project / "KConfig", spl_project / "variants/C/config.txt"]
+        # Assigning the default changes the effective configuration but not the assignments
+        assert variants["D"].config is not variants["A"].config
+
+
+def test_shared_variant_is_copied_on_edit(spl_project: Path) -> None:
+    (spl_project / "variants/C").mkdir()
+    (spl_project / "variants/C/config.txt").write_text("CONFIG_FOO=y\n")
+    kconfig_data = SPLKConfigData(spl_project)
+    variant_a = kconfig_data.find_variant_config("A")
+    variant_c = kconfig_data.find_variant_config("C")
+    assert variant_a is not None and variant_c is not None
+
+    assert variant_c.set_element_value("FOO", TriState.N) == {"FOO": TriState.N}
+
+    assert variant_c.config is not variant_a.config
+    assert variant_a.config.find_element("FOO").value == TriState.Y
+    update = variant_c.create_config_file_update()
+    assert update is not None and update.config_file == spl_project / "variants/C/config.txt"
+    assert variant_a.create_config_file_update() is None
+
+
+def test_edits_of_symbols_without_value_are_not_saved(create_spl_project: CreateSPLProject) -> None:
+    spl_project = create_spl_project(
+        """\
+        config BAR
+            bool "bar"
+            default y
+        config FOO
+            int "foo"
+            depends on BAR
+            default 1
+        config BAZ
+            bool "baz"
+            depends on BAR
+        """,
+        {"A": "CONFIG_BAR=y\n"},
+    )
+    variant = SPLKConfigData(spl_project).find_variant_config("A")
+    assert variant is not None
+    variant.set_element_value("FOO", 5)
+    variant.set_element_value("BAZ", TriState.Y)
+
+    assert variant.set_element_value("BAR", TriState.N) == {"BAR": TriState.N, "FOO": None, "BAZ": None}
+
+    update = variant.create_config_file_update()
+    assert update is not None and update.assignments == {"BAR": "# CONFIG_BAR is not set"}
@@ -0,0 +1,71 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.cover import CoverCommand, find_variant_cover
+from kspl.kconfig import ConfigElementType
+from kspl.stats import FeatureStatistics, SymbolStatistics
+from tests.conftest import CreateSPLProject
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    return create_spl_project(
+        """\
+        config A
+            bool "a"
+        config B
+            bool "b"
+        config C
+            bool "c"
+        config D
+            bool "d"
+        """,
+        {
+            "V1": "CONFIG_A=y\n",
+            "V2": "CONFIG_A=y\nCONFIG_B=y\nCONFIG_C=y\n",
+            "V3": "CONFIG_C=y\n",
+            "V4": "CONFIG_D=y\n",
+        },
+    )
+
+
+def test_cover_all_enabled_features(spl_project: Path) -> None:
+    statistics = FeatureStatistics.from_variants(SPLKConfigData(spl_project).variant_configs)
+    cover = find_variant_cover(statistics)
+
+    assert cover.variants == ["V2", "V4"]
+    assert cover.gains == [3, 1]
+    assert cover.required == 4
+
+
+def test_cover_also_disabled_features(spl_project: Path) -> None:
+    statistics = FeatureStatistics.from_variants(SPLKConfigData(spl_project).variant_configs)
+    cover = find_variant_cover(statistics, include_disabled=True)
+
+    # Every variant enables or disables all 4 features, the first one is chosen first
+    assert cover.variants == ["V1", "V2", "V4"]
+    assert cover.gains == [4, 2, 2]
+    assert cover.required == 8
+
+
+def test_cover_of_statistics_without_variant_features() -> None:
+    symbols = {
+        "A": SymbolStatistics("A", ConfigElementType.BOOL, 0b011),
+        "B": SymbolStatistics("B", ConfigElementType.BOOL, 0b100),
+        "DEAD": SymbolStatistics("DEAD", ConfigElementType.BOOL, 0),
+    }
+    statistics = FeatureStatistics(["X", "Y", "Z"], symbols)
+
+    assert statistics.variant_features == [0b001, 0b001, 0b010]
+    assert find_variant_cover(statistics).variants == ["X", "Z"]
+
+
+def test_cover_command(spl_project: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    output_file = spl_project / "out/variants.txt"
+    CoverCommand().run(Namespace(project_dir=spl_project, output_file=output_file, include_disabled=False))
+
+    assert capsys.readouterr().out == "V2\nV4\n"
+    assert output_file.read_text() == "V2\nV4\n"
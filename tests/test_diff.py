@@ -0,0 +1,60 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from kspl.diff import DiffCommand, VariantDiff, diff_variants
+from kspl.kconfig import ConfigElementType, SymbolChange, TriState
+from tests.conftest import git
+
+
+def test_only_changed_configurations_are_compared(spl_repo: Path) -> None:
+    (spl_repo / "spl/variants/A/config.txt").write_text("CONFIG_FOO=y\nCONFIG_FOO_TIMEOUT=5\n")
+    # Only a comment and the order changed
+    (spl_repo / "spl/variants/B/config.txt").write_text("# Base variant\nCONFIG_BASE=y\n")
+    (spl_repo / "spl/variants/C/config.txt").unlink()
+    (spl_repo / "spl/variants/D").mkdir()
+    (spl_repo / "spl/variants/D/config.txt").write_text("CONFIG_BASE=y\n")
+
+    report = diff_variants(spl_repo / "spl", jobs=1)
+
+    assert not report.model_changed
+    assert report.compared == 2
+    assert report.variants == [
+        VariantDiff("A", "changed", [SymbolChange("FOO_TIMEOUT", ConfigElementType.INT, 100, 5)]),
+        VariantDiff("C", "removed"),
+        VariantDiff("D", "added"),
+    ]
+
+
+def test_ignored_variants_are_skipped_on_both_sides(spl_repo: Path) -> None:
+    (spl_repo / "spl/variants/A/config.txt").write_text("CONFIG_FOO=y\nCONFIG_FOO_TIMEOUT=5\n")
+    (spl_repo / "spl/variants/B/config.txt").unlink()
+
+    report = diff_variants(spl_repo / "spl", jobs=1, ignore_patterns=["A", "B"])
+
+    assert report.compared == 1
+    assert report.variants == []
+
+
+def test_model_files_are_read_from_the_revision(spl_repo: Path) -> None:
+    # The sourced file exists only at the revision
+    (spl_repo / "spl/KConfig").write_text('config BASE\n    bool "base"\n    default y\nconfig FOO\n    bool "foo"\n')
+    (spl_repo / "spl/features/Kconfig").unlink()
+    git(spl_repo, "commit", "-q", "-am", "Drop the timeout")
+
+    report = diff_variants(spl_repo / "spl", revision="HEAD~1", jobs=2)
+
+    assert report.model_changed
+    assert report.variants == [
+        VariantDiff("A", "changed", [SymbolChange("BASE", ConfigElementType.BOOL, TriState.N, TriState.Y), SymbolChange("FOO_TIMEOUT", ConfigElementType.INT, 100, None)]),
+        VariantDiff("C", "changed", [SymbolChange("BASE", ConfigElementType.BOOL, TriState.N, TriState.Y)]),
+    ]
+
+
+def test_diff_command(spl_repo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    (spl_repo / "spl/variants/C/config.txt").write_text("CONFIG_FOO=y\n")
+
+    assert DiffCommand().run(Namespace(project_dir=spl_repo / "spl", rev="HEAD", jobs=1)) == 0
+
+    assert capsys.readouterr().out == "C:\n  FOO: n -> y\n  FOO_TIMEOUT: <no value> -> 100\n1 of 3 variants changed since HEAD\n"
@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+
+from kspl.discovery import VariantConfigFinder
+
+
+def create_config(variants_dir: Path, variant: str) -> Path:
+    config_file = variants_dir / variant / "config.txt"
+    config_file.parent.mkdir(parents=True, exist_ok=True)
+    config_file.write_text("")
+    return config_file
+
+
+def test_find_with_ignore_patterns_and_max_depth(tmp_path: Path) -> None:
+    for variant in ["B", "A", "group/C", "build/out/D", ".cache/E", "group/deep/er/F"]:
+        create_config(tmp_path, variant)
+
+    assert VariantConfigFinder(tmp_path).find() == sorted(tmp_path.glob("**/config.txt"))
+    assert [file.parent.relative_to(tmp_path).as_posix() for file in VariantConfigFinder(tmp_path, ignore_patterns=["build", ".*"], max_depth=2).find()] == [
+        "A",
+        "B",
+        "group/C",
+    ]
+    assert [file.parent.name for file in VariantConfigFinder(tmp_path, ignore_patterns=["group/deep"]).find()] == ["E", "A", "B", "D", "C"]
+
+
+def test_is_included_checks_only_the_path(tmp_path: Path) -> None:
+    finder = VariantConfigFinder(tmp_path, ignore_patterns=["build", ".*"], max_depth=2)
+    included = ["config.txt", "A/config.txt", "group/C/config.txt"]
+    excluded = ["build/out/D/config.txt", ".cache/E/config.txt", "group/deep/F/config.txt"]
+    assert [finder.is_included(tmp_path / file) for file in included + excluded] == [True] * 3 + [False] * 3
+
+
+def test_unchanged_directories_are_not_listed_again(tmp_path: Path, monkeypatch) -> None:
+    create_config(tmp_path, "A")
+    create_config(tmp_path, "group/B")
+    finder = VariantConfigFinder(tmp_path)
+    assert len(finder.find()) == 2
+
+    listed: list[str] = []
+    scandir = os.scandir
+
+    def tracking_scandir(path: Path):  # type: ignore[no-untyped-def]
+        listed.append(Path(path).name)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", tracking_scandir)
+    assert len(finder.find()) == 2
+    assert listed == []
+
+    new_config = create_config(tmp_path, "group/C")
+    group_dir = tmp_path / "group"
+    # Make sure the modification time changes even on file systems with coarse timestamps
+    os.utime(group_dir, ns=(group_dir.stat().st_atime_ns, group_dir.stat().st_mtime_ns + 1_000_000_000))
+    assert new_config in finder.find()
+    assert "group" in listed
+    assert tmp_path.name not in listed
+
+
+def test_missing_directory(tmp_path: Path) -> None:
+    assert VariantConfigFinder(tmp_path / "variants").find() == []
@@ -0,0 +1,74 @@
+from argparse import Namespace
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.edit import EditCommand
+from kspl.kconfig import KConfig
+from tests.conftest import CreateSPLProject
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    return create_spl_project(
+        """\
+        config FOO
+            bool "foo"
+        """,
+        {"Sleep/Plus": "CONFIG_FOO=y\n", "Base": "CONFIG_FOO=y\n"},
+    )
+
+
+@pytest.fixture
+def opened_configs(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[Optional[Path]]]:
+    """Records the configuration file of every created KConfig and of the one opened in the editor."""
+    created: list[Optional[Path]] = []
+    opened: list[Optional[Path]] = []
+    original_init = KConfig.__init__
+
+    def init(self: KConfig, k_config_model_file: Path, k_config_file: Optional[Path] = None, k_config_root_directory: Optional[Path] = None) -> None:
+        created.append(k_config_file)
+        original_init(self, k_config_model_file, k_config_file, k_config_root_directory)
+
+    monkeypatch.setattr(KConfig, "__init__", init)
+    monkeypatch.setattr(KConfig, "menu_config", lambda self, gui=True: opened.append(self.k_config_file))
+    yield opened
+    # Only the edited configuration is parsed
+    assert created == opened
+
+
+def edit_args(project_dir: Path, variant: Optional[str] = None) -> Namespace:
+    return Namespace(project_dir=project_dir, kconfig_model_file=None, kconfig_config_file=None, variant=variant, gui=False)
+
+
+def test_find_variants(spl_project: Path) -> None:
+    assert SPLKConfigData.find_variants(spl_project) == {
+        "Base": spl_project / "variants" / "Base" / "config.txt",
+        "Sleep/Plus": spl_project / "variants" / "Sleep" / "Plus" / "config.txt",
+    }
+
+
+def test_edit_given_variant(spl_project: Path, opened_configs: list[Optional[Path]]) -> None:
+    EditCommand().run(edit_args(spl_project, "Sleep/Plus"))
+    assert opened_configs == [spl_project / "variants" / "Sleep" / "Plus" / "config.txt"]
+
+
+def test_edit_selected_variant(spl_project: Path, opened_configs: list[Optional[Path]], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("builtins.input", lambda prompt: "1")
+    EditCommand().run(edit_args(spl_project))
+    assert opened_configs == [spl_project / "variants" / "Base" / "config.txt"]
+
+
+def test_edit_with_relative_project_dir(spl_project: Path, opened_configs: list[Optional[Path]], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(spl_project.parent)
+    EditCommand().run(edit_args(Path(spl_project.name), "Base"))
+    assert opened_configs == [spl_project / "variants" / "Base" / "config.txt"]
+
+
+def test_edit_unknown_variant(spl_project: Path, opened_configs: list[Optional[Path]]) -> None:
+    with pytest.raises(UserNotificationException, match="Sleep/Plus"):
+        EditCommand().run(edit_args(spl_project, "Unknown"))
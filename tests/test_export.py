@@ -0,0 +1,76 @@
+import csv
+import sys
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.export import ExportCommand, iter_matrix_rows, write_columnar
+from tests.conftest import CreateSPLProject
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    return create_spl_project(
+        """\
+        menu "Features"
+        config FOO
+            bool "foo"
+            default y
+        config SIZE
+            hex "size"
+            depends on FOO
+            default 0x10
+        endmenu
+        config NAME
+            string "name"
+            default "a, b"
+        """,
+        {"A": "CONFIG_FOO=y\n", "B": "# CONFIG_FOO is not set\n"},
+    )
+
+
+def export_args(spl_project: Path, output_file: Path, **kwargs: object) -> Namespace:
+    return Namespace(**{"output_file": output_file, "project_dir": spl_project, "format": None, "include_menus": False, "include_levels": False, **kwargs})
+
+
+def test_iter_matrix_rows(spl_project: Path) -> None:
+    rows = list(iter_matrix_rows(SPLKConfigData(spl_project), include_menus=True, include_levels=True))
+    variant_names = [variant.name for variant in SPLKConfigData(spl_project).variant_configs]
+    assert rows[0] == ["name", "type", "level", *variant_names]
+    values = {row[0]: dict(zip(variant_names, row[3:])) for row in rows[1:]}
+    assert [row[:3] for row in rows[1:]] == [["Features", "menu", "0"], ["FOO", "bool", "1"], ["SIZE", "hex", "1"], ["NAME", "string", "0"]]
+    assert values["Features"] == {"A": "", "B": ""}
+    assert values["FOO"] == {"A": "y", "B": "n"}
+    assert values["SIZE"] == {"A": "0x10", "B": ""}
+
+
+def test_export_csv_and_tsv(spl_project: Path, tmp_path: Path) -> None:
+    ExportCommand().run(export_args(spl_project, tmp_path / "out" / "matrix.csv"))
+    with (tmp_path / "out" / "matrix.csv").open(newline="") as file:
+        rows = list(csv.reader(file))
+    assert [row[0] for row in rows] == ["name", "FOO", "SIZE", "NAME"]
+    assert rows[3][2:] == ["a, b", "a, b"]
+
+    ExportCommand().run(export_args(spl_project, tmp_path / "matrix.tsv"))
+    assert (tmp_path / "matrix.tsv").read_text().splitlines()[1].split("\t")[:2] == ["FOO", "bool"]
+
+
+def test_export_unknown_format(spl_project: Path, tmp_path: Path) -> None:
+    with pytest.raises(UserNotificationException):
+        ExportCommand().run(export_args(spl_project, tmp_path / "matrix.xls", format="xls"))
+
+
+def test_columnar_requires_pyarrow(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(UserNotificationException, match="pyarrow"):
+        write_columnar(iter([["name"]]), tmp_path / "matrix.parquet")
+
+
+def test_columnar_export(spl_project: Path, tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    write_columnar(iter_matrix_rows(SPLKConfigData(spl_project)), tmp_path / "matrix.parquet", batch_size=2)
+    table = pq.read_table(tmp_path / "matrix.parquet")
+    assert table.column("name").to_pylist() == ["FOO", "SIZE", "NAME"]
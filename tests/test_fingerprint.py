@@ -0,0 +1,62 @@
+import json
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from kspl.fingerprint import FingerprintCommand, fingerprint_variants, group_by_fingerprint
+from tests.conftest import CreateSPLProject
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    return create_spl_project(
+        """\
+        config BAR
+            bool "bar"
+        config FOO_TIMEOUT
+            int "timeout"
+            default 100
+        config NAME
+            string "name"
+            default "timeout ${FOO_TIMEOUT}"
+        """,
+        {
+            "A": "CONFIG_BAR=y\n",
+            # Same effective configuration as A, the default is assigned explicitly
+            "B": "# Comment\nCONFIG_FOO_TIMEOUT=100\nCONFIG_BAR=y\n",
+            "C": "CONFIG_BAR=y\nCONFIG_FOO_TIMEOUT=200\n",
+        },
+    )
+
+
+def test_identical_variants_have_the_same_fingerprint(spl_project: Path) -> None:
+    fingerprints = fingerprint_variants(spl_project, jobs=1)
+
+    assert list(fingerprints) == ["A", "B", "C"]
+    assert fingerprints["A"] == fingerprints["B"]
+    assert fingerprints["A"] != fingerprints["C"]
+    assert list(group_by_fingerprint(fingerprints).values()) == [["A", "B"], ["C"]]
+    assert fingerprint_variants(spl_project, jobs=2) == fingerprints
+
+
+def test_substituted_values_are_fingerprinted(spl_project: Path) -> None:
+    (spl_project / "variants/B/config.txt").write_text('CONFIG_BAR=y\nCONFIG_NAME="timeout 100"\n')
+    (spl_project / "variants/C/config.txt").write_text('CONFIG_BAR=y\nCONFIG_NAME="timeout ${FOO_TIMEOUT}"\n')
+    fingerprints = fingerprint_variants(spl_project, jobs=1)
+    assert fingerprints["A"] == fingerprints["B"] == fingerprints["C"]
+
+
+def test_relative_project_dir(spl_project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    fingerprints = fingerprint_variants(spl_project, jobs=1)
+    monkeypatch.chdir(spl_project.parent)
+    assert fingerprint_variants(Path(spl_project.name), jobs=1) == fingerprints
+
+
+def test_fingerprint_command(spl_project: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    output_file = spl_project / "out/fingerprints.json"
+    FingerprintCommand().run(Namespace(project_dir=spl_project, output_file=output_file, jobs=1))
+
+    assert "3 variants, 2 unique configurations." in capsys.readouterr().out
+    result = json.loads(output_file.read_text())
+    assert result["groups"][result["variants"]["C"]] == ["C"]
@@ -0,0 +1,42 @@
+import textwrap
+from argparse import Namespace
+from pathlib import Path
+
+from kspl.fixdep import FixdepCommand, parse_depfile
+
+
+def test_parse_depfile() -> None:
+    content = "build/main.o: src/main.c include/my\\ header.h \\\n include/autoconf.h\n\ninclude/my\\ header.h:\n"
+    assert parse_depfile(content) == ("build/main.o", ["src/main.c", "include/my header.h", "include/autoconf.h"])
+
+
+def test_fixdep_replaces_autoconf_header_with_symbol_files(tmp_path: Path) -> None:
+    source_file = tmp_path / "main.c"
+    source_file.write_text("#include <autoconf.h>\n#if CONFIG_FOO\n#endif\nint x = CONFIG_BAR_MODULE + CONFIG_FOO;\n")
+    header_file = tmp_path / "util.h"
+    header_file.write_text("#define UTIL_SIZE CONFIG_SIZE\n")
+    autoconf_header = tmp_path / "autoconf.h"
+    autoconf_header.write_text("#define CONFIG_FOO 1\n")
+    depfile = tmp_path / "main.d"
+    depfile.write_text(f"main.o: {source_file.as_posix()} \\\n {header_file.as_posix()} {autoconf_header.as_posix()}\n")
+    config_dir = Path("include/config")
+
+    args = Namespace(depfiles=[depfile], config_dir=config_dir, autoconf_header=autoconf_header)
+    FixdepCommand().run(args)
+
+    expected = textwrap.dedent(
+        f"""\
+        main.o: \\
+          {source_file.as_posix()} \\
+          {header_file.as_posix()} \\
+          $(wildcard include/config/FOO) \\
+          $(wildcard include/config/BAR) \\
+          $(wildcard include/config/SIZE)
+
+        {header_file.as_posix()}:
+        """
+    )
+    assert depfile.read_text() == expected
+    # Fixing an already fixed file does not change it
+    FixdepCommand().run(args)
+    assert depfile.read_text() == expected
@@ -5,7 +5,20 @@ from pathlib import Path
 
 import pytest
 
-from kspl.generate import CMakeWriter, GenerateCommand, HeaderWriter, JsonWriter
+from kspl import generate
+from kspl.generate import (
+    CMakeWriter,
+    ConfigDirectoryWriter,
+    ElementRenderer,
+    FileWriter,
+    GenerateCommand,
+    HeaderWriter,
+    JsonWriter,
+    RenderedElement,
+    RenderPipeline,
+    configuration_fingerprint,
+    register_output_format,
+)
 from kspl.kconfig import (
     ConfigElement,
     ConfigElementType,
@@ -154,3 +167,136 @@ def test_generate(tmp_path: Path) -> None:
     assert json_file.exists()
     assert cmake_file.exists()
     assert header_file.exists()
+
+
+class NamesRenderer(ElementRenderer):
+    def __init__(self) -> None:
+        self.names: list[str] = []
+
+    def add(self, element: RenderedElement) -> None:
+        self.names.append(element.name)
+
+    def content(self) -> str:
+        return ",".join(self.names)
+
+
+class NamesWriter(FileWriter):
+    def create_renderer(self) -> ElementRenderer:
+        return NamesRenderer()
+
+
+def test_render_pipeline_feeds_all_writers_in_one_pass(tmp_path: Path, configuration_data: ConfigurationData) -> None:
+    header_writer = HeaderWriter(tmp_path / "autoconf.h")
+    json_writer = JsonWriter(tmp_path / "features.json")
+    cmake_writer = CMakeWriter(tmp_path / "features.cmake")
+    names_writer = NamesWriter(tmp_path / "names.txt")
+
+    RenderPipeline([header_writer, json_writer, cmake_writer]).add_writer(names_writer).write(configuration_data)
+
+    assert (tmp_path / "autoconf.h").read_text() == header_writer.generate_content(configuration_data)
+    assert (tmp_path / "features.json").read_text() == json_writer.generate_content(configuration_data)
+    assert (tmp_path / "features.cmake").read_text() == cmake_writer.generate_content(configuration_data)
+    assert (tmp_path / "names.txt").read_text() == "NAME,STATUS_SET,STATUS_NOT_SET,MY_INT,MY_HEX"
+
+
+def test_rendered_element_normalization() -> None:
+    assert RenderedElement.from_element(ConfigElement(ConfigElementType.STRING, "S", 'say "hi"')).literal == '"say \\"hi\\""'
+    assert RenderedElement.from_element(ConfigElement(ConfigElementType.HEX, "H", 255)).literal == "0xff"
+    assert RenderedElement.from_element(ConfigElement(ConfigElementType.INT, "I", 13)).literal == "13"
+    assert RenderedElement.from_element(ConfigElement(ConfigElementType.TRISTATE, "T", TriState.M)).bool_value is False
+    assert RenderedElement.from_element(ConfigElement(ConfigElementType.BOOL, "B", TriState.Y)).bool_value is True
+
+
+def test_generate_registered_output_format(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # The registration must not leak into the other tests
+    monkeypatch.setattr(generate, "_OUTPUT_FORMATS", dict(generate._OUTPUT_FORMATS))
+    register_output_format("names", NamesWriter)
+    feature_model_file = tmp_path / "kconfig.txt"
+    feature_model_file.write_text(
+        """
+        config FIRST_BOOL
+            bool "You can select FIRST_BOOL"
+        config FIRST_NAME
+            string "You can select FIRST_NAME"
+        """
+    )
+    names_file = tmp_path / "gen/names.txt"
+
+    GenerateCommand().run(Namespace(kconfig_model_file=feature_model_file, outputs=[f"names={names_file}"]))
+
+    assert names_file.read_text() == "FIRST_BOOL,FIRST_NAME"
+
+
+def test_config_directory_writer_only_touches_changed_symbols(tmp_path: Path, configuration_data: ConfigurationData) -> None:
+    config_dir = tmp_path / "include/config"
+    ConfigDirectoryWriter(config_dir).write(configuration_data)
+
+    assert (config_dir / "NAME").read_text() == '#define CONFIG_NAME "John Smith"\n'
+    assert (config_dir / "STATUS_SET").read_text() == "#define CONFIG_STATUS_SET 1\n"
+    assert (config_dir / "STATUS_NOT_SET").read_text() == ""
+    assert (config_dir / "MY_HEX").read_text() == "#define CONFIG_MY_HEX 0x10\n"
+    timestamps = {file.name: file.stat().st_mtime_ns for file in config_dir.iterdir()}
+
+    os.utime(config_dir / "MY_INT", ns=(0, 0))
+    os.utime(config_dir / "NAME", ns=(0, 0))
+    changed_data = ConfigurationData([element for element in configuration_data.elements if element.name != "NAME"])
+    changed_data.elements[2] = ConfigElement(ConfigElementType.INT, "MY_INT", 14)
+    ConfigDirectoryWriter(config_dir).write(changed_data)
+
+    assert (config_dir / "MY_INT").read_text() == "#define CONFIG_MY_INT 14\n"
+    assert (config_dir / "MY_INT").stat().st_mtime_ns != 0
+    assert (config_dir / "NAME").read_text() == "", "removed symbols are a change as well"
+    assert (config_dir / "STATUS_SET").stat().st_mtime_ns == timestamps["STATUS_SET"]
+
+
+def test_config_directory_writer_keeps_other_files(tmp_path: Path, configuration_data: ConfigurationData) -> None:
+    config_dir = tmp_path / "include"
+    config_dir.mkdir()
+    (config_dir / "board.h").write_text("#define BOARD 1\n")
+    ConfigDirectoryWriter(config_dir).write(configuration_data)
+
+    ConfigDirectoryWriter(config_dir).write(ConfigurationData(configuration_data.elements[1:]))
+
+    assert (config_dir / "board.h").read_text() == "#define BOARD 1\n"
+    assert (config_dir / "NAME").read_text() == ""
+
+
+def test_configuration_fingerprint(configuration_data: ConfigurationData) -> None:
+    fingerprint = configuration_fingerprint(configuration_data)
+
+    assert len(fingerprint) == 64
+    assert configuration_fingerprint(ConfigurationData(list(reversed(configuration_data.elements)))) == fingerprint, "the order does not matter"
+    changed_data = ConfigurationData([*configuration_data.elements[:3], ConfigElement(ConfigElementType.INT, "MY_INT", 14), configuration_data.elements[4]])
+    assert configuration_fingerprint(changed_data) != fingerprint
+
+
+def test_generate_skipped_if_fingerprint_did_not_change(tmp_path: Path) -> None:
+    feature_model_file = tmp_path / "kconfig.txt"
+    feature_model_file.write_text(
+        """
+        config FIRST_BOOL
+            bool "You can select FIRST_BOOL"
+        """
+    )
+    header_file = tmp_path / "gen/autoconf.h"
+    fingerprint_file = tmp_path / "gen/config.fingerprint"
+    args = Namespace(kconfig_model_file=feature_model_file, out_header_file=header_file, fingerprint_file=fingerprint_file)
+
+    GenerateCommand().run(args)
+    fingerprint = fingerprint_file.read_text()
+    header_file.write_text("outdated")
+    GenerateCommand().run(args)
+    assert header_file.read_text() == "outdated"
+
+    header_file.unlink()
+    GenerateCommand().run(args)
+    assert "AUTOCONF_H" in header_file.read_text()
+    assert fingerprint_file.read_text() == fingerprint
+
+    # Other outputs are generated, even if the old files are still there
+    header_file.write_text("outdated")
+    json_file = tmp_path / "gen/config.json"
+    json_file.write_text("outdated")
+    GenerateCommand().run(Namespace(kconfig_model_file=feature_model_file, out_header_file=header_file, out_json_file=json_file, fingerprint_file=fingerprint_file))
+    assert json_file.read_text() != "outdated"
+    assert header_file.read_text() != "outdated"
@@ -1,8 +1,10 @@
+import tkinter
 from pathlib import Path
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
-from kspl.config_slurper import SPLKConfigData
-from kspl.gui import MainView
+from kspl.config_slurper import SPLKConfigData, VariantViewData
+from kspl.gui import KSPL, MainView, TextMetricsCache, find_differing_elements, tcl_quote
+from kspl.kconfig import ConfigElementType, EditableConfigElement, TriState
 
 
 def test_spl_kconfig_data():
@@ -28,3 +30,113 @@ def test_mainloop_does_not_destroy_the_window():
     view.root = MagicMock()
     view.mainloop()
     assert view.root.mock_calls == [call.mainloop()]
+
+
+def test_save_warns_about_changes_without_config_file():
+    this_dir = Path(__file__).parent.absolute()
+    kconfig_data = SPLKConfigData(this_dir / "data")
+    presenter = KSPL.__new__(KSPL)
+    presenter.logger = MagicMock()
+    presenter.kconfig_data = kconfig_data
+    presenter.view = MagicMock()
+    presenter.view.variants = kconfig_data.get_variants()
+    presenter.config_file_writer = MagicMock()
+
+    presenter.save()
+    presenter.config_file_writer.submit.assert_not_called()
+
+    # The default variant has no configuration file, its changes can not be saved
+    kconfig_data.variant_configs[0].config.find_element("L1_CFG_C").value = 14
+    presenter.save()
+    presenter.config_file_writer.submit.assert_not_called()
+    presenter.logger.warning.assert_called_once()
+
+
+def test_find_differing_elements():
+    elements = [
+        EditableConfigElement(ConfigElementType.MENU, "Menu", None, None),
+        EditableConfigElement(ConfigElementType.BOOL, "SAME", TriState.Y, TriState.Y),
+        EditableConfigElement(ConfigElementType.INT, "DIFF", 1, 1),
+        EditableConfigElement(ConfigElementType.STRING, "ONLY_IN_B", "x", "x"),
+    ]
+    variants = [
+        VariantViewData("A", {"SAME": TriState.Y, "DIFF": 1}),
+        VariantViewData("B", {"SAME": TriState.Y, "DIFF": 2, "ONLY_IN_B": "x"}),
+        VariantViewData("C", {"SAME": TriState.Y, "DIFF": 1}),
+    ]
+    assert find_differing_elements(elements, variants, ["A", "B", "C"]) == [False, False, True, True]
+    assert find_differing_elements(elements, variants, ["A", "C"]) == [False, False, False, False]
+
+
+def test_expand_and_collapse_all_items_in_one_tcl_call():
+    view = MainView.__new__(MainView)
+    view.root = MagicMock()
+    view.tree = MagicMock()
+    view.tree.__str__.return_value = ".tree"
+    view.children_of = {"": ["I001", "I004"], "I001": ["I002", "I003"], "I003": ["I005"]}
+
+    view.expand_all_items()
+    view.collapse_all_items()
+
+    assert view.tree.tk.eval.mock_calls == [
+        call(".tree item {I001} -open 1\n.tree item {I003} -open 1"),
+        call(".tree item {I001} -open 0\n.tree item {I003} -open 0"),
+    ]
+    view.tree.get_children.assert_not_called()
+
+
+def test_text_metrics_are_measured_once():
+    with patch("kspl.gui.font.Font") as font_class:
+        font_class.return_value.measure.side_effect = lambda text: 10 * len(text)
+        cache = TextMetricsCache()
+        assert cache.measure(("Calibri", 16, "bold"), "variant") == 70
+        assert cache.measure(("Calibri", 16, "bold"), "variant") == 70
+        assert cache.measure(("Calibri", 16, "bold"), "other") == 50
+        assert cache.measure(("Calibri", 17, "bold"), "other") == 50
+    assert font_class.call_count == 2
+    assert font_class.return_value.measure.call_count == 3
+
+
+def test_tcl_quote():
+    interpreter = tkinter.Tcl()
+    for text in ["plain", "with space", "group/{A}", 'a"b[c]$d;e\\f', "", "#0", "new\nline"]:
+        assert interpreter.splitlist(interpreter.eval(f"list {tcl_quote(text)}")) == (text,)
+
+
+def test_only_the_rows_on_screen_are_filled_when_scrolling_the_variant_columns():
+    elements = [EditableConfigElement(ConfigElementType.INT, f"E{index}", index, index) for index in range(100)]
+    view = MainView.__new__(MainView)
+    view.root = MagicMock()
+    view.tree = MagicMock()
+    view.tree_scrollbar_y = MagicMock()
+    view._pending_idle_callbacks = set()
+    view.elements = elements
+    view.elements_dict = {element.name: element for element in elements}
+    view.element_item_ids = [f"I{index}" for index in range(100)]
+    view.tree_view_items_mapping = {f"I{index}": f"E{index}" for index in range(100)}
+    view.variants_dict = {"A": VariantViewData("A", {element.name: 7 for element in elements})}
+    view.column_manager = MagicMock(rendered_columns=["A"], visible_columns=["A"] * 50, window_start=0)
+    view.adjust_column_width = MagicMock()
+    view._update_variant_scrollbar = MagicMock()
+    # Two rows of 20 pixels below the headings are on screen
+    view.tree.winfo_height.return_value = 60
+    view.tree.identify_region.side_effect = lambda x, y: "heading" if y < 20 else "cell"
+    view.tree.identify_row.side_effect = lambda y: {20: "I0", 40: "I1"}.get(y, "")
+    view.tree.bbox.side_effect = lambda item: (0, 20 * (int(item[1:]) + 1), 100, 20)
+
+    # Scroll events are coalesced until the event loop is idle
+    view.on_variant_scroll("scroll", "1", "units")
+    view.on_variant_scroll("moveto", "0.5")
+    assert view.root.after_idle.call_count == 1
+    view.root.after_idle.call_args.args[0]()
+
+    assert view.tree.item.mock_calls == [call("I0", values=["7"]), call("I1", values=["7"])]
+    assert len(view.stale_items) == 98
+
+    # Scrolling down fills the rows coming into view
+    view.tree.item.reset_mock()
+    view.tree.identify_row.side_effect = lambda y: {20: "I1", 40: "I2"}.get(y, "")
+    view.tree.bbox.side_effect = lambda item: (0, 20 * int(item[1:]), 100, 20)
+    view.on_tree_yscroll(0.01, 0.03)
+    view.root.after_idle.call_args.args[0]()
+    assert view.tree.item.mock_calls == [call("I2", values=["7"])]
@@ -0,0 +1,67 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.impact import ImpactCommand, analyze_impact
+from kspl.kconfig import ConfigElementType, KConfig, SymbolChange, TriState
+from tests.conftest import CreateSPLProject
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    return create_spl_project(
+        """\
+        config FOO
+            bool "foo"
+            select SELECTED
+        config SELECTED
+            bool "selected"
+        config SIZE
+            hex "size"
+            depends on FOO
+            default 0x10
+        config LEVEL
+            int "level"
+            default 3 if SELECTED
+            default 1
+        config OTHER
+            bool "other"
+        """,
+        {"A": "CONFIG_FOO=y\n", "B": "# CONFIG_FOO is not set\n"},
+    )
+
+
+def test_dependency_index(spl_project: Path) -> None:
+    index = KConfig(spl_project / "KConfig").dependency_index
+    assert index.affected("FOO")[0] == "FOO"
+    assert set(index.affected("FOO")) == {"FOO", "SELECTED", "SIZE", "LEVEL"}
+    assert index.affected("OTHER") == ["OTHER"]
+
+
+def test_analyze_impact(spl_project: Path) -> None:
+    kconfig_data = SPLKConfigData(spl_project)
+    report = analyze_impact(kconfig_data, "FOO", "n")
+
+    assert report.affected_symbols[0] == "FOO"
+    changes = {change.name: change for change in report.variant_changes["A"]}
+    assert changes == {
+        "FOO": SymbolChange("FOO", ConfigElementType.BOOL, TriState.Y, TriState.N),
+        "SELECTED": SymbolChange("SELECTED", ConfigElementType.BOOL, TriState.Y, TriState.N),
+        "SIZE": SymbolChange("SIZE", ConfigElementType.HEX, 0x10, None),
+        "LEVEL": SymbolChange("LEVEL", ConfigElementType.INT, 3, 1),
+    }
+    assert str(changes["SIZE"]) == "SIZE: 0x10 -> <no value>"
+    assert report.variant_changes["B"] == []
+    # The variants are not modified
+    variant_a = kconfig_data.find_variant_config("A")
+    assert variant_a is not None
+    assert variant_a.config.config.syms["SIZE"].str_value == "0x10"
+
+
+def test_impact_command(spl_project: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    ImpactCommand().run(Namespace(symbol="FOO", project_dir=spl_project, value="n"))
+    output = capsys.readouterr().out
+    assert "LEVEL: 3 -> 1" in output
+    assert "B: no changes" in output
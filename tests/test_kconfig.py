@@ -1,9 +1,12 @@
+import gc
 import os
 import sys
 import textwrap
 import types
+import warnings
 from pathlib import Path
 
+import kconfiglib
 import pytest
 
 from kspl.kconfig import (
@@ -390,6 +393,21 @@ def test_config_including_other_configs_based_on_env_vars(tmp_path: Path) -> Non
     ]
 
 
+def test_missing_source_closes_the_model_files(tmp_path: Path) -> None:
+    (tmp_path / "common").mkdir()
+    (tmp_path / "common" / "common.txt").write_text('source "common/missing.txt"\n')
+    feature_model_file = tmp_path / "kconfig.txt"
+    feature_model_file.write_text('source "common/common.txt"\n')
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        with pytest.raises(kconfiglib.KconfigError, match="not found"):
+            KConfig(feature_model_file)
+        gc.collect()
+
+    assert [warning for warning in caught if issubclass(warning.category, ResourceWarning)] == []
+
+
 def test_extract_elements_with_levels():
     this_dir = Path(__file__).parent.absolute()
     kconfig_model_file = this_dir / "data" / "KConfig"
@@ -413,3 +431,81 @@ def test_menu_config_uses_gui_or_terminal_editor(tmp_path: Path, monkeypatch: py
     kconfig.menu_config(gui=gui)
 
     assert captured["config"] is kconfig.config
+
+
+def test_set_element_value_updates_only_dependent_elements(tmp_path: Path) -> None:
+    feature_model_file = tmp_path / "kconfig.txt"
+    feature_model_file.write_text(
+        """
+    config BASE
+        bool "base"
+        select SELECTED
+        imply IMPLIED
+    config SELECTED
+        bool "selected"
+    config IMPLIED
+        bool "implied"
+    config DEPENDENT
+        int "dependent"
+        depends on BASE
+        default 5
+    config UNRELATED
+        string "unrelated"
+        default "x"
+    """
+    )
+    user_config = tmp_path / "user.txt"
+    user_config.write_text("# CONFIG_BASE is not set\n")
+    kconfig = KConfig(feature_model_file, user_config)
+    assert kconfig.find_element("DEPENDENT") is None
+
+    changed_values = kconfig.set_element_value("BASE", TriState.Y)
+
+    assert changed_values == {"BASE": TriState.Y, "SELECTED": TriState.Y, "IMPLIED": TriState.Y, "DEPENDENT": 5}
+    assert [element.name for element in kconfig.get_changed_elements()] == ["BASE"], "only the edited element shall be saved"
+
+    changed_values = kconfig.set_element_value("BASE", TriState.N)
+    assert changed_values == {"BASE": TriState.N, "SELECTED": TriState.N, "IMPLIED": TriState.N, "DEPENDENT": None}
+    assert kconfig.get_changed_elements() == []
+
+
+def test_set_element_value_keeps_edited_dependents(tmp_path: Path) -> None:
+    feature_model_file = tmp_path / "kconfig.txt"
+    feature_model_file.write_text(
+        """
+    config BASE
+        bool "base"
+    config LIMIT
+        int "limit"
+        default 10 if BASE
+        default 5
+    """
+    )
+    kconfig = KConfig(feature_model_file)
+    kconfig.set_element_value("LIMIT", 7)
+
+    assert kconfig.set_element_value("BASE", TriState.Y) == {"BASE": TriState.Y}
+    assert [(element.name, element.original_value, element.value) for element in kconfig.get_changed_elements()] == [
+        ("BASE", TriState.N, TriState.Y),
+        ("LIMIT", 5, 7),
+    ]
+
+
+def test_set_element_value_choice(tmp_path: Path) -> None:
+    feature_model_file = tmp_path / "kconfig.txt"
+    feature_model_file.write_text(
+        """
+    choice APP_VERSION
+        prompt "application version"
+        default APP_VERSION_1
+        config APP_VERSION_1
+            bool "app v1"
+        config APP_VERSION_2
+            bool "app v2"
+    endchoice
+    """
+    )
+    kconfig = KConfig(feature_model_file)
+    assert kconfig.set_element_value("APP_VERSION_2", TriState.Y) == {"APP_VERSION_1": TriState.N, "APP_VERSION_2": TriState.Y}
+    with pytest.raises(ValueError):
+        kconfig.set_element_value("UNKNOWN", TriState.Y)
@@ -0,0 +1,50 @@
+import textwrap
+from pathlib import Path
+
+from kspl.kconfig import ConfigElementType, EditableConfigElement, KConfig
+from kspl.search import SymbolSearchIndex
+
+
+def element(name: str, prompt: str = "", help_text: str = "") -> EditableConfigElement:
+    return EditableConfigElement(ConfigElementType.BOOL, name, False, False, prompt=prompt, help=help_text)
+
+
+def test_search_ranks_name_matches_first() -> None:
+    index = SymbolSearchIndex(
+        [
+            element("USE_UART", "Enable serial port", "Uses the uart driver."),
+            element("UART_BAUDRATE", "Baud rate"),
+            element("TIMER", "Timer", "Not related to uart at all."),
+            element("GPIO", "General purpose IO"),
+        ]
+    )
+    assert index.search("uart") == [1, 0, 2]
+    assert index.search("serial") == [0]
+    assert index.search("  ") == [0, 1, 2, 3]
+    assert index.search("missing") == []
+
+
+def test_short_queries_ignore_the_help_text() -> None:
+    index = SymbolSearchIndex([element("IO", "Inputs"), element("TIMER", "Timer", "io")])
+    assert index.search("io") == [0]
+    assert index.search("Ti") == [1]
+
+
+def test_search_over_model_elements(tmp_path: Path) -> None:
+    kconfig_file = tmp_path / "kconfig.txt"
+    kconfig_file.write_text(
+        textwrap.dedent(
+            """\
+            menu "Communication"
+            config UART
+                bool "Serial interface"
+                help
+                  Transmits data asynchronously.
+            endmenu
+            """
+        )
+    )
+    elements = KConfig(kconfig_file).elements
+    index = SymbolSearchIndex(elements)
+    assert [elements[position].name for position in index.search("asynchron")] == ["UART"]
+    assert [elements[position].name for position in index.search("communication")] == ["Communication"]
@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from kspl.serve import SnapshotStore, create_server
+
+
+@pytest.fixture
+def base_url(spl_project: Path) -> Iterator[str]:
+    server = create_server(SnapshotStore(spl_project), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url: str, etag: str = "") -> tuple[int, str, object]:
+    request = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})  # noqa: S310
+    try:
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            return response.status, response.headers["ETag"], json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers["ETag"], None
+
+
+def test_queries(base_url: str) -> None:
+    status, etag, body = get(f"{base_url}/elements/FOO")
+    assert status == 200
+    assert body == {"A": True, "B": False}
+    assert get(f"{base_url}/variants/B")[2] == {"FOO": False, "LEVEL": 5}
+    assert sorted(get(f"{base_url}/variants")[2]) == ["A", "B"]  # type: ignore[arg-type]
+    assert [element["name"] for element in get(f"{base_url}/elements")[2]] == ["FOO", "LEVEL"]  # type: ignore[union-attr, index]
+    assert get(f"{base_url}/elements/UNKNOWN")[0] == 404
+    assert get(f"{base_url}/elements/FOO", etag)[0] == 304
+
+
+def test_snapshot_is_swapped_on_changes(spl_project: Path) -> None:
+    store = SnapshotStore(spl_project)
+    snapshot = store.snapshot
+    assert store.reload_if_changed() is False
+
+    config_file = spl_project / "variants" / "A" / "config.txt"
+    config_file.write_text("CONFIG_FOO=y\nCONFIG_LEVEL=9\n")
+    os.utime(config_file, ns=(config_file.stat().st_atime_ns, config_file.stat().st_mtime_ns + 1_000_000_000))
+    assert store.reload_if_changed() is True
+    assert store.snapshot.element_values("LEVEL") == {"A": 9, "B": 5}
+    assert store.snapshot.etag != snapshot.etag
+    # Readers of the old snapshot are not affected
+    assert snapshot.variant_values["A"]["LEVEL"] == 3
+
+
+def test_new_variant_is_detected(spl_project: Path) -> None:
+    store = SnapshotStore(spl_project)
+    config_file = spl_project / "variants" / "C" / "config.txt"
+    config_file.parent.mkdir()
+    config_file.write_text("")
+    assert store.reload_if_changed() is True
+    assert "C" in store.snapshot.variant_names()
+
+
+def test_ignored_variants_are_not_served(spl_project: Path) -> None:
+    store = SnapshotStore(spl_project, ignore_patterns=["B"])
+    assert store.snapshot.variant_names() == ["A"]
+    config_file = spl_project / "variants" / "B" / "config.txt"
+    config_file.write_text("CONFIG_FOO=y\n")
+    os.utime(config_file, ns=(config_file.stat().st_atime_ns, config_file.stat().st_mtime_ns + 1_000_000_000))
+    assert store.reload_if_changed() is False
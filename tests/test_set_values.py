@@ -0,0 +1,84 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+from py_app_dev.core.exceptions import UserNotificationException
+
+from kspl.set_values import SetCommand, bulk_set, parse_assignment
+from tests.conftest import CreateSPLProject
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    return create_spl_project(
+        """\
+        config BAR
+            bool "bar"
+        config FOO_TIMEOUT
+            int "timeout"
+            range 0 500
+            default 100
+        config NAME
+            string "name"
+            depends on BAR
+        """,
+        {
+            "A": "CONFIG_BAR=y\r\nCONFIG_FOO_TIMEOUT=100\r\n",
+            "B": "# CONFIG_BAR is not set\n",
+            "Sleep/C": "# Keep this comment\nCONFIG_BAR=y\nCONFIG_FOO_TIMEOUT=200\n",
+        },
+    )
+
+
+def read_config(spl_project: Path, variant: str) -> str:
+    return (spl_project / "variants" / variant / "config.txt").read_bytes().decode()
+
+
+def test_parse_assignment() -> None:
+    assert parse_assignment("FOO=200") == ("FOO", "200")
+    assert parse_assignment('NAME="a \\"b\\""') == ("NAME", 'a "b"')
+    with pytest.raises(UserNotificationException):
+        parse_assignment("FOO")
+
+
+def test_set_in_variants_matching_a_condition(spl_project: Path) -> None:
+    results = {result.variant: result for result in bulk_set(spl_project, ["FOO_TIMEOUT=200"], conditions=["BAR=y"], jobs=1)}
+
+    assert not results["B"].selected
+    assert results["A"].changed
+    # Already has the value, the file is not written
+    assert results["Sleep/C"].selected and not results["Sleep/C"].changed
+    assert read_config(spl_project, "A") == "CONFIG_BAR=y\r\nCONFIG_FOO_TIMEOUT=200\r\n"
+    assert read_config(spl_project, "B") == "# CONFIG_BAR is not set\n"
+    assert read_config(spl_project, "Sleep/C") == "# Keep this comment\nCONFIG_BAR=y\nCONFIG_FOO_TIMEOUT=200\n"
+
+
+def test_rejected_and_overridden_assignments(spl_project: Path) -> None:
+    results = {result.variant: result for result in bulk_set(spl_project, ["FOO_TIMEOUT=abc", "UNKNOWN=y", 'NAME="x"'], variant_patterns=["B"], jobs=1)}
+
+    assert list(results) == ["B"]
+    assert results["B"].rejected == ["FOO_TIMEOUT=abc (invalid value for int)", "UNKNOWN=y (unknown symbol)"]
+    assert results["B"].overridden == ["NAME=x (value is '')"]
+    # The overridden assignment would have no effect, the file is not changed
+    assert not results["B"].changed
+    assert read_config(spl_project, "B") == "# CONFIG_BAR is not set\n"
+
+
+def test_relative_project_dir(spl_project: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(spl_project.parent)
+    results = bulk_set(Path(spl_project.name), ["BAR=y"], variant_patterns=["B"], jobs=1)
+    assert [result.variant for result in results if result.changed] == ["B"]
+    assert read_config(spl_project, "B") == "CONFIG_BAR=y\n"
+
+
+def test_parallel_workers(spl_project: Path) -> None:
+    results = bulk_set(spl_project, ["BAR=n"], jobs=2)
+    assert sorted(result.variant for result in results if result.changed) == ["A", "Sleep/C"]
+    assert read_config(spl_project, "Sleep/C") == "# Keep this comment\n# CONFIG_BAR is not set\nCONFIG_FOO_TIMEOUT=200\n"
+
+
+def test_set_command_dry_run(spl_project: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    SetCommand().run(Namespace(assignments=["FOO_TIMEOUT=300"], project_dir=spl_project, variants=["Sleep/*", "A"], where=[], jobs=1, dry_run=True))
+    output = capsys.readouterr().out
+    assert "Would update 2 of 2 selected variants" in output
+    assert read_config(spl_project, "A") == "CONFIG_BAR=y\r\nCONFIG_FOO_TIMEOUT=100\r\n"
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from kspl.generate import SnapshotWriter
+from kspl.kconfig import ConfigElement, ConfigElementType, ConfigurationData, TriState
+from kspl.snapshot import Snapshot, SnapshotValueType
+
+
+@pytest.fixture
+def configuration_data():
+    return ConfigurationData(
+        [
+            ConfigElement(ConfigElementType.STRING, "NAME", "John Smith"),
+            ConfigElement(ConfigElementType.BOOL, "STATUS_SET", TriState.Y),
+            ConfigElement(ConfigElementType.BOOL, "STATUS_NOT_SET", TriState.N),
+            ConfigElement(ConfigElementType.TRISTATE, "MODULE", TriState.M),
+            ConfigElement(ConfigElementType.INT, "MY_INT", -13),
+            ConfigElement(ConfigElementType.HEX, "MY_HEX", 0xFFFFFFFFFFFFFFFF),
+            ConfigElement(ConfigElementType.STRING, "ALIAS", "John Smith"),
+        ]
+    )
+
+
+def test_snapshot_round_trip(tmp_path: Path, configuration_data: ConfigurationData) -> None:
+    snapshot_file = tmp_path / "config.snap"
+    SnapshotWriter(snapshot_file).write(configuration_data)
+
+    with Snapshot.open(snapshot_file) as snapshot:
+        assert list(snapshot) == ["NAME", "STATUS_SET", "STATUS_NOT_SET", "MODULE", "MY_INT", "MY_HEX", "ALIAS"]
+        assert dict(snapshot) == {
+            "NAME": "John Smith",
+            "STATUS_SET": True,
+            "STATUS_NOT_SET": False,
+            "MODULE": "m",
+            "MY_INT": -13,
+            "MY_HEX": 0xFFFFFFFFFFFFFFFF,
+            "ALIAS": "John Smith",
+        }
+        assert snapshot.type_of("MY_HEX") == SnapshotValueType.HEX
+        assert "MY_INT" in snapshot
+        assert "UNKNOWN" not in snapshot
+        assert snapshot.get("UNKNOWN") is None
+        with pytest.raises(KeyError):
+            snapshot["UNKNOWN"]
+
+
+def test_snapshot_string_table_is_deduplicated(configuration_data: ConfigurationData) -> None:
+    content = SnapshotWriter(Path("config.snap")).generate_content(configuration_data)
+    assert isinstance(content, bytes)
+    assert content.count(b"John Smith") == 1
+
+
+def test_snapshot_rejects_other_files() -> None:
+    with pytest.raises(ValueError):
+        Snapshot(b"not a snapshot, definitely not")
+
+
+def test_snapshot_module_does_not_need_kconfiglib() -> None:
+    src_dir = Path(__file__).parent.parent / "src"
+    subprocess.run(
+        [sys.executable, "-c", "import sys, kspl.snapshot; assert 'kconfiglib' not in sys.modules"],
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(src_dir)},
+    )
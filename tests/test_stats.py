@@ -0,0 +1,66 @@
+import json
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from kspl.config_slurper import SPLKConfigData
+from kspl.stats import FeatureStatistics, StatsCommand
+from tests.conftest import CreateSPLProject
+
+
+@pytest.fixture
+def spl_project(create_spl_project: CreateSPLProject) -> Path:
+    return create_spl_project(
+        """\
+        menu "Features"
+        config BASE
+            bool "base"
+            default y
+        config FOO
+            bool "foo"
+        config DEAD
+            bool "dead"
+        config DEP
+            bool "dep"
+            depends on FOO
+        endmenu
+        config FOO_TIMEOUT
+            int "timeout"
+            default 100
+        config NAME
+            string "name"
+            depends on FOO
+        """,
+        {
+            "A": 'CONFIG_FOO=y\nCONFIG_DEP=y\nCONFIG_NAME="a"\n',
+            "B": "CONFIG_FOO_TIMEOUT=200\n",
+            # Shares the evaluated configuration with A
+            "C": '# Clone of A\nCONFIG_NAME="a"\nCONFIG_DEP=y\nCONFIG_FOO=y\n',
+        },
+    )
+
+
+def test_feature_statistics(spl_project: Path) -> None:
+    statistics = FeatureStatistics.from_variants(SPLKConfigData(spl_project).variant_configs)
+
+    assert statistics.variant_names == ["A", "B", "C"]
+    assert {symbol.name: symbol.enabled_count for symbol in statistics.features()} == {"BASE": 3, "FOO": 2, "DEAD": 0, "DEP": 2}
+    assert statistics.symbols["FOO"].enabled == 0b101
+    assert statistics.enabled_variants("DEP") == ["A", "C"]
+    assert statistics.always_enabled() == ["BASE"]
+    assert statistics.never_enabled() == ["DEAD"]
+    assert statistics.symbols["FOO_TIMEOUT"].histogram == {"100": 2, "200": 1}
+    # NAME has no value in B
+    assert statistics.symbols["NAME"].histogram == {"a": 2}
+    assert "Features" not in statistics.symbols
+
+
+def test_stats_command(spl_project: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    output_file = spl_project / "out/stats.json"
+    StatsCommand().run(Namespace(project_dir=spl_project, output_file=output_file, max_values=1))
+
+    output = capsys.readouterr().out
+    assert "Never enabled (1): DEAD" in output
+    assert "FOO_TIMEOUT  100 (2), ... (1 more)" in output
+    assert json.loads(output_file.read_text())["features"]["FOO"] == 2